@@ -1,14 +1,20 @@
+import os
 import sys
 import time
 import json
+import re
+import queue
 import string
+import collections
 import xml.etree.ElementTree as ET
+from datetime import datetime
 from functools import partial
 from pathlib import Path
 
 import serial
 import serial.tools.list_ports
 import threading
+from concurrent.futures import Future
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QComboBox,
@@ -20,10 +26,19 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import (
     QPalette, QColor, QLinearGradient, QBrush, QPen, QFont, QPainter
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QThread, QFileSystemWatcher, pyqtSignal
 
 # Settings file path
 SETTINGS_FILE = Path(__file__).parent / "kat_settings.json"
+# What we learned from each radio (memory index, menu dump); safe to delete
+CACHE_FILE = Path(__file__).parent / "kat_cache.json"
+TRACE_FILE = Path(__file__).parent / "traces" / "cat_trace.jsonl"
+
+# Preset XML files (menu dumps), parsed once by PresetCache
+PRESETS_DIR = Path(__file__).parent / "presets"
+
+# Operating-mode buttons: which preset, which memory/VFO, which mode (see load_operating_modes)
+OPERATING_MODES_FILE = PRESETS_DIR / "operating_modes.json"
 
 class LEDIndicator(QFrame):
     def __init__(self, diameter=16, color_on="#FF4D4D", color_off="#30343A",
@@ -237,6 +252,74 @@ MENU_DESCRIPTIONS = {
     "153": ("WIRES DG-ID", "0:AUTO, 1-99:DG-ID", "")
 }
 
+# EX value width (digits, sign included) for menus 001..153, as the rig reports them
+# (same widths as FT991A_Backup.xml)
+MENU_WIDTHS = dict(zip(MENU_DESCRIPTIONS, map(int,
+    "4441111213" "3112314111" "1111235111" "1111321131" "2121131132"
+    "1213114111" "1115521211" "1131311314" "4451115111" "1212111131"
+    "1212113111" "1321121123" "2232232232" "2322323333" "1134334311"
+    "813")))
+
+# Menus whose range text doesn't describe the value (kind, lo, hi)
+MENU_SCHEMA_OVERRIDES = {
+    "014": ("int", 25, 45),          # 2.5 - 4.5, sent in tenths
+    "015": ("int", 0, 240),          # 0 = OFF, else seconds
+    "027": ("signed", -1200, 1400),  # time zone, ±hhmm
+    "087": ("text", None, None),     # set at the radio; keep whatever it reports
+    "153": ("int", 0, 99),           # 0 = AUTO, else DG-ID
+}
+
+# One menu's compiled schema: kind is "int", "signed", "choice" or "text"
+MenuSpec = collections.namedtuple("MenuSpec", "num desc unit kind lo hi choices width")
+
+
+def _compile_menu_spec(num, desc, opt_range, unit, width):
+    """MenuSpec from a MENU_DESCRIPTIONS row, e.g. "20 - 4000" or "0:OFF, 1:ON"."""
+    if num in MENU_SCHEMA_OVERRIDES:
+        kind, lo, hi = MENU_SCHEMA_OVERRIDES[num]
+        return MenuSpec(num, desc, unit, kind, lo, hi, None, width)
+    signed = re.fullmatch(r"\s*-(\d+)\s*to\s*\+(\d+).*", opt_range)
+    if signed:
+        return MenuSpec(num, desc, unit, "signed", -int(signed.group(1)), int(signed.group(2)), None, width)
+    span = re.fullmatch(r"\s*(\d+)\s*-\s*(\d+)\D*", opt_range)
+    if span:
+        return MenuSpec(num, desc, unit, "int", int(span.group(1)), int(span.group(2)), None, width)
+    codes = [int(c) for c in re.findall(r"(?:^|,|-)\s*(\d+):", opt_range)]
+    if codes:
+        # "1:100Hz - 19:1000Hz" spans every code in between
+        choices = (frozenset(range(min(codes), max(codes) + 1)) if re.search(r"-\s*\d+:", opt_range)
+                   else frozenset(codes))
+        return MenuSpec(num, desc, unit, "choice", min(codes), max(codes), choices, width)
+    return MenuSpec(num, desc, unit, "text", None, None, None, width)
+
+
+MENU_SCHEMA = {num: _compile_menu_spec(num, desc, opt_range, unit, MENU_WIDTHS[num])
+               for num, (desc, opt_range, unit) in MENU_DESCRIPTIONS.items()}
+
+
+def encode_menu_value(num, value):
+    """Check value against menu num's schema and return it as the rig wants it
+    (fixed width, zero padded, signed where needed). Raises ValueError."""
+    spec = MENU_SCHEMA.get(str(num).zfill(3))
+    if spec is None:
+        raise ValueError(f"unknown menu {num}")
+    text = str(value).strip()
+    if spec.kind == "text":
+        if not text or len(text) > spec.width or ";" in text or not text.isascii():
+            raise ValueError(f"menu {spec.num}: bad text {text!r}")
+        return text
+    try:
+        n = int(text)
+    except ValueError:
+        raise ValueError(f"menu {spec.num} ({spec.desc}): {text!r} is not a number") from None
+    if spec.kind == "choice" and n not in spec.choices:
+        raise ValueError(f"menu {spec.num} ({spec.desc}): {n} is not one of {sorted(spec.choices)}")
+    if not spec.lo <= n <= spec.hi:
+        raise ValueError(f"menu {spec.num} ({spec.desc}): {n} outside {spec.lo}..{spec.hi}")
+    if spec.kind == "signed":
+        return f"{'-' if n < 0 else '+'}{abs(n):0{spec.width - 1}d}"
+    return f"{n:0{spec.width}d}"
+
 class FrequencyDisplayLabel(QLabel):
     def __init__(self, controller, parent_widget, adjust_callback):
         super().__init__(parent_widget)  # GUI inside main_tab
@@ -244,6 +327,17 @@ class FrequencyDisplayLabel(QLabel):
         self.adjust_callback = adjust_callback
         self.active_digit_index = None
 
+        # Wheel tuning state (see _send_tune)
+        self._tune_target = None     # predicted Hz, already on the display
+        self._tune_sent = None       # target carried by the FA write in flight
+        self._tune_rig_hz = None     # last FA readback
+        self._tune_busy = False      # an FA write job is queued or running
+        self._tune_in_vfo = False    # ensure_vfo done for this burst
+        self._tune_last = 0.0        # monotonic time of the last FA write
+        self._tune_timer = QTimer(self)
+        self._tune_timer.setSingleShot(True)
+        self._tune_timer.timeout.connect(self._send_tune)
+
         # Make sure we can receive wheel events right after click
         self.setFocusPolicy(Qt.StrongFocus)
         self.setCursor(Qt.PointingHandCursor)
@@ -287,7 +381,7 @@ class FrequencyDisplayLabel(QLabel):
             return
 
         # Need an open serial connection
-        if not self.controller.serial_conn or not self.controller.serial_conn.is_open:
+        if not self.controller._connected():
             return
 
         # Ignore zero-delta wheels (some touchpads send this)
@@ -296,62 +390,91 @@ class FrequencyDisplayLabel(QLabel):
             return
 
         direction = 1 if delta > 0 else -1
+        index = self.active_digit_index
+        ctl = self.controller
 
-        try:
-            ser = self.controller.serial_conn
-
-            # Ensure we're in VFO so FA writes stick
-            ok = self.controller._ensure_vfo()
-            if not ok:
-                ser.reset_input_buffer()
-                ser.write(b"VM0;")
-                time.sleep(0.20)
-                self.controller._ensure_vfo()
-
-            # Briefly inhibit poller so our display update isn't overwritten
-            self.controller._poll_inhibit_until = time.time() + 0.35
-
-            # Read current FA (Hz)
-            hz = self.controller._read_fa_hz()
-            if hz is None:
-                return
-
-            # Work with 11-digit string; we edit only the last 9 digits
-            s11 = f"{hz:011d}"
-            head2, tail9 = s11[:2], s11[2:]
-
-            # Guard against bad indices
-            if not (0 <= self.active_digit_index < len(tail9)):
-                return
-
-            new_tail9 = self.adjust_specific_digit(tail9, self.active_digit_index, direction)
-            new11 = head2 + new_tail9
-            new_hz = int(new11)
+        # Build on the predicted target while a burst is running, else on the rig
+        base = self._tune_target if self._tune_target is not None else ctl.rig_state.hz
+        if base is None:
+            return  # no frequency read yet
 
-            # Clamp to rig range, then reformat to 11 digits in case clamp changed width
-            new_hz = self.controller._clip_rig_range(new_hz)
-            cmd = f"FA{new_hz:011d};"
-            ser.write(cmd.encode('ascii'))
+        # Work with 11-digit string; we edit only the last 9 digits
+        s11 = f"{base:011d}"
+        head2, tail9 = s11[:2], s11[2:]
 
-            # Read back actual FA (rig may quantize to step size)
-            time.sleep(0.12)
-            ser.reset_input_buffer()
-            ser.write(b'FA;')
-            fa = self.controller.read_until_semicolon()
-            if fa.startswith('FA') and fa.endswith(';'):
-                digits = ''.join(ch for ch in fa[2:-1] if ch.isdigit())
-                if digits:
-                    new_hz = int(digits[-11:].rjust(11, '0'))
+        # Guard against bad indices
+        if not (0 <= index < len(tail9)):
+            return
 
-            # Update GUI
-            self.controller.freq_display.setText(self.controller._format_hz_for_display(new_hz))
-            event.accept()
+        new_tail9 = self.adjust_specific_digit(tail9, index, direction)
+        new_hz = ctl._clip_rig_range(int(head2 + new_tail9))
 
-        except Exception:
-            pass
+        # Show it right away; the rig catches up in _send_tune
+        self._tune_target = new_hz
+        ctl._show_frequency(new_hz)
+        ctl._hold_polls(0.35)
+        self._schedule_tune()
+        event.accept()
 
+    # --- coalesced tuning: one FA write in flight, always the latest target ---
+    def _tune_gap(self):
+        """Seconds between FA writes: a write + readback (~29 bytes) may use half the link."""
+        w = self.controller.cat_worker
+        return max(0.03, w.link.wire_time(29) * 2) if w else 0.05
 
+    def _schedule_tune(self):
+        if self._tune_busy or self._tune_timer.isActive():
+            return
+        wait = self._tune_gap() - (time.monotonic() - self._tune_last)
+        self._tune_timer.start(max(0, int(wait * 1000)))
 
+    def _send_tune(self):
+        ctl = self.controller
+        hz = self._tune_target
+        if hz is None:
+            return
+        check_vfo = not self._tune_in_vfo
+        before = self._tune_rig_hz
+
+        def job(link):
+            # Ensure we're in VFO so FA writes stick (once per burst); it already
+            # retries VM0; itself, so there's nothing more to try if it fails
+            if check_vfo and not link.ensure_vfo():
+                link.activity("⚠️ Could not confirm VFO; the tune may land on a memory.")
+            # Write, then read back actual FA as soon as the rig has it (may quantize)
+            return link.write_fa(hz, before=before)
+
+        self._tune_busy = True
+        self._tune_sent = hz
+        self._tune_last = time.monotonic()
+        if ctl._cat_submit(job, on_done=self._tune_done, on_error=self._tune_failed) is None:
+            self._tune_failed(None)
+
+    def _tune_done(self, rig_hz):
+        ctl = self.controller
+        self._tune_busy = False
+        self._tune_in_vfo = True
+        self._tune_rig_hz = rig_hz
+        if self._tune_target != self._tune_sent:
+            self._schedule_tune()   # more notches came in meanwhile
+            return
+        # Burst over: reconcile with the rig's (possibly quantized) readback
+        self._tune_target = None
+        self._tune_in_vfo = False
+        ctl.rig_state.hz = rig_hz
+        ctl._show_frequency(rig_hz)
+
+    def _tune_failed(self, _e):
+        self.reset_tune()
+
+    def reset_tune(self):
+        """Drop the burst in progress, e.g. when the worker that would have
+        finished it (and called _tune_done/_tune_failed) is stopped."""
+        self._tune_timer.stop()
+        self._tune_busy = False
+        self._tune_target = None
+        self._tune_sent = None
+        self._tune_in_vfo = False
 
     @staticmethod
     def adjust_specific_digit(freq_str, digit_index, direction):
@@ -445,1626 +568,3006 @@ class RetroBarMeter(QWidget):
 
 
 
+##############################################################################
+################################# CAT WORKER #################################
+##############################################################################
 
-class FT991AController(QWidget):
-    # Rig coverage clamps (used by _clip_rig_range)
-    RIG_MIN_HZ = 3_000_000
-    RIG_MAX_HZ = 470_000_000
+# Read forms: a command with exactly this many parameter characters is a query
+# and the rig answers it; anything longer is a set, which gets no reply.
+CAT_READ_FORMS = {
+    "AI": (0,), "CO": (2,), "EX": (3,), "FA": (0,), "FB": (0,), "ID": (0,),
+    "IF": (0,), "MC": (0,), "MD": (0, 1), "MR": (3,), "MT": (3,), "RM": (1,),
+    "TX": (0,),
+}
 
-    # Serial/CAT defaults
-    BAUD = 38400
-    SERIAL_TIMEOUT = 0.6         # read timeout (s)
-    SERIAL_WRITE_TIMEOUT = 0.6   # write timeout (s)
 
-    # Polling intervals (ms)
-    FREQ_POLL_MS = 500
-    METER_POLL_MS = 200
+# MD/IF/MT mode character → name (FT-991A CAT manual)
+CAT_MODE_NAMES = {
+    '1': 'LSB', '2': 'USB', '3': 'CW', '4': 'FM', '5': 'AM',
+    '6': 'RTTY-L', '7': 'CW-R', '8': 'DATA-L', '9': 'RTTY-U',
+    'A': 'DATA-FM', 'B': 'FM-N', 'C': 'DATA-U', 'D': 'AM-N', 'E': 'C4FM'
+}
 
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("FT-991A Preset Control Panel")
-        self.setFixedSize(1200, 1200)
 
-        # Serial
-        self.serial_conn = None
-        self._poll_inhibit_until = 0.0   # used to pause FA polling after writes
+# Memory channels: 001–099 plus the P1L..P9U band-edge pairs (100–117)
+MEMORY_CHANNELS = range(1, 118)
 
-        # Timers (explicit handles make cleanup easier)
-        self.meter_timer = None
-        self.freq_timer  = None
-        self._cat_lock = threading.RLock()   # serialize CAT transactions
+# One row of the memory index, decoded from MTnnn; (filled=False for blanks)
+MemoryEntry = collections.namedtuple("MemoryEntry", "hz mode tag filled")
 
-        # UI/State
-        self.current_memory = 1
+# One row of a menu dump (value "----" if the rig didn't answer)
+MenuValue = collections.namedtuple("MenuValue", "num desc value")
 
 
-# ➡ Tabs (fixed style and layout-safe)
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
+# transact()/run() reply for a set that may be the one a '?;' in its batch was for
+CAT_MAYBE_REJECTED = "?"
 
-        self.tabs = QTabWidget()
-        layout.addWidget(self.tabs)
 
-        self.tabs.setStyleSheet("""
-            QTabWidget::pane {
-                border: 1px solid #1e3a5f;
-                background: #0d2137;
-                border-radius: 6px;
-            }
-            QTabBar::tab {
-                background: #0d2137;
-                color: #607d8b;
-                padding: 8px 20px;
-                margin-right: 2px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-                font-weight: bold;
-            }
-            QTabBar::tab:selected {
-                background: #1a3a5c;
-                color: #64b5f6;
-                border-bottom: 2px solid #42a5f5;
-            }
-            QTabBar::tab:hover:!selected {
-                background: #152a40;
-                color: #90caf9;
-            }
-        """)
+def cat_expects_reply(cmd):
+    """True if cmd (e.g. "FA;" or "EX031;") is a read the rig will answer."""
+    body = cmd.rstrip(';')
+    return len(body[2:]) in CAT_READ_FORMS.get(body[:2], ())
 
 
+class RigState:
+    """
+    What the rig is doing, decoded from one IF; reply. The GUI keeps a single
+    instance and every widget (frequency, channel info, TX LED) reads from it.
 
-        self.main_tab = QWidget()
-        self.cat_tab = QWidget()
-        self.settings_tab = QWidget()
-        self.info_tab = QWidget()
-        self.tabs.addTab(self.main_tab, "📻 Menu Reader")
-        self.tabs.addTab(self.cat_tab, "🖥️ CAT Terminal")
-        self.tabs.addTab(self.settings_tab, "⚙️ Settings")
-        self.tabs.addTab(self.info_tab, "ℹ️ Info")
-        
-        # Build settings tab
-        self._build_settings_tab()
-        
-        # Build info tab
-        self._build_info_tab()
+    IF payload (25 chars): ch(3) freq(9) clar(+dddd) rx-clar tx-clar mode
+    vfo/mem ctcss 00 shift. IF; carries no TX flag; tx is kept by TX
+    replies/pushes and the PWR meter.
+    """
+    __slots__ = ("raw", "hz", "channel", "clar_hz", "rx_clar", "tx_clar",
+                 "mode_char", "vfo_mem", "tx", "tag", "stamp")
 
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
 
-##gradient
-        palette = QPalette()
-        gradient = QLinearGradient(0, 0, 0, self.height())
-        gradient.setColorAt(0.0, QColor(13, 33, 55))
-        gradient.setColorAt(1.0, QColor(5, 15, 30))
-        palette.setBrush(QPalette.Window, QBrush(gradient))
-        self.setAutoFillBackground(True)
-        self.setPalette(palette)
+    @classmethod
+    def from_if(cls, reply):
+        """RigState from an IF...; frame, or None if it doesn't decode."""
+        if not (reply and reply.startswith("IF") and reply.endswith(";")):
+            return None
+        p = reply[2:-1]
+        if len(p) < 25 or not p[:12].isdigit():
+            return None
+        st = cls()
+        st.raw = reply
+        st.channel = int(p[0:3])
+        st.hz = int(p[3:12])
+        try:
+            st.clar_hz = int(p[12:17])
+        except ValueError:
+            st.clar_hz = 0
+        st.rx_clar = p[17] == '1'
+        st.tx_clar = p[18] == '1'
+        st.mode_char = p[19]
+        st.vfo_mem = p[20]
+        st.stamp = time.monotonic()
+        return st
+
+    @property
+    def mode(self):
+        return CAT_MODE_NAMES.get(self.mode_char, '?') if self.mode_char else None
+
+    @property
+    def in_memory(self):
+        """Memory, memory tune, QMB or PMS (IF P7 != '0')."""
+        return self.vfo_mem is not None and self.vfo_mem != '0'
+
+    def channel_info(self):
+        """(channel, tag, mode) as shown in the channel info label."""
+        if self.vfo_mem is None:
+            return None, None, None
+        if not self.in_memory:
+            return None, "VFO Mode", self.mode
+        return self.channel, self.tag or f"CH {self.channel:03d}", self.mode
+
+
+class CatFrameReader:
+    """
+    Buffered ';'-frame reader. Each read drains everything waiting on the port
+    in one call and splits complete frames out of a reusable buffer; bytes after
+    the last ';' stay buffered for the next frame instead of being flushed.
+    """
+    MAX_FRAME = 64          # longest FT-991A reply (MT/MR with tag) is ~42 bytes
+    READ_SLICE = 0.02       # port timeout (s) for the blocking part of a read
+
+    def __init__(self, ser):
+        self.ser = ser
+        self._buf = bytearray()
+        self._frames = collections.deque()
+        self.bytes_in = 0
+        ser.timeout = self.READ_SLICE
+
+    def pending(self):
+        """Number of complete frames already buffered."""
+        return len(self._frames)
+
+    def feed(self, data):
+        """Add raw bytes; complete frames are queued, the remainder kept."""
+        self.bytes_in += len(data)
+        buf = self._buf
+        buf += data
+        start = 0
+        while True:
+            end = buf.find(b';', start)
+            if end < 0:
+                break
+            frame = self._clean(buf, start, end + 1)
+            if frame:
+                self._frames.append(frame)
+            start = end + 1
+        if start:
+            del buf[:start]
+        # No terminator within a frame's length: line noise, drop it and resync
+        if len(buf) > self.MAX_FRAME:
+            del buf[:]
 
-        self.main_tab.setGeometry(0, 0, 1200, 1000)
+    @staticmethod
+    def _clean(buf, start, end):
+        """Decode buf[start:end] as a frame, skipping any garbage in front of it."""
+        # A frame starts with an upper-case opcode letter ('?;' is the error reply)
+        while start < end - 1:
+            b = buf[start]
+            if 65 <= b <= 90 or b == 63:
+                break
+            start += 1
+        frame = buf[start:end]
+        if len(frame) < 2 or any(b < 32 or b > 126 for b in frame):
+            return ""
+        return frame.decode('ascii')
+
+    def read_frame(self, timeout_sec=0.5):
+        """Return the next complete frame, or "" on timeout."""
+        frames = self._frames
+        if frames:
+            return frames.popleft()
+        ser = self.ser
+        deadline = time.monotonic() + timeout_sec
+        while True:
+            chunk = ser.read(ser.in_waiting or 1)
+            if chunk:
+                self.feed(chunk)
+                if frames:
+                    return frames.popleft()
+            if time.monotonic() >= deadline or not ser.is_open:
+                return ""
 
-        # Common GroupBox style
-        groupbox_style = """
-            QGroupBox {
-                color: #a0c4ff;
-                font-weight: bold;
-                font-size: 13px;
-                border: 2px solid #1e3a5f;
-                border-radius: 10px;
-                margin-top: 12px;
-                padding-top: 10px;
-                background: #0d2137;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-                background: #0d2137;
-            }
-        """
 
-        # ========== CONNECTION GROUP (top left) ==========
-        conn_group = QGroupBox("🔌 Connection", self.main_tab)
-        conn_group.setGeometry(15, 10, 320, 90)
-        conn_group.setStyleSheet(groupbox_style)
-        
-        self.connect_btn = QPushButton("Connect", conn_group)
-        self.connect_btn.setGeometry(15, 35, 130, 40)
-        self.connect_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2e7d32; color: white; font-weight: bold;
-                border-radius: 8px; border: 2px solid #4caf50; font-size: 13px;
+class CatStats:
+    """
+    Per-opcode CAT counters: commands sent, replies and their latency
+    histogram, timeouts, '?;' rejections and bytes each way, plus bus
+    utilisation. The line is full duplex, so utilisation is worked out per
+    direction; utilisation_pct is the busier one. CatLink updates it on the
+    worker thread; the GUI reads snapshot(), hence the lock.
+    """
+    BUCKETS_MS = (5, 10, 20, 50, 100, 200, 500)    # plus one "> 500 ms" bucket
+    WINDOW_SEC = 5.0                                # "recent" utilisation window
+
+    def __init__(self, baud=38400):
+        self._lock = threading.Lock()
+        self.baud = baud
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.monotonic()
+            self._ops = {}
+            self._recent = collections.deque()     # (time, bytes out, bytes in) inside WINDOW_SEC
+
+    def _row(self, op):
+        row = self._ops.get(op)
+        if row is None:
+            row = self._ops[op] = {"sent": 0, "replies": 0, "timeouts": 0, "errors": 0,
+                                   "bytes_out": 0, "bytes_in": 0, "latency_ms_sum": 0.0,
+                                   "latency_ms_max": 0.0, "hist": [0] * (len(self.BUCKETS_MS) + 1)}
+        return row
+
+    def _traffic(self, out_bytes, in_bytes):
+        now = time.monotonic()
+        recent = self._recent
+        recent.append((now, out_bytes, in_bytes))
+        while recent and recent[0][0] < now - self.WINDOW_SEC:
+            recent.popleft()
+
+    def sent(self, op, nbytes):
+        with self._lock:
+            row = self._row(op)
+            row["sent"] += 1
+            row["bytes_out"] += nbytes
+            self._traffic(nbytes, 0)
+
+    def received(self, op, nbytes):
+        with self._lock:
+            self._row(op)["bytes_in"] += nbytes
+            self._traffic(0, nbytes)
+
+    def reply(self, op, seconds):
+        ms = seconds * 1000.0
+        with self._lock:
+            row = self._row(op)
+            row["replies"] += 1
+            row["latency_ms_sum"] += ms
+            row["latency_ms_max"] = max(row["latency_ms_max"], ms)
+            bucket = next((i for i, edge in enumerate(self.BUCKETS_MS) if ms <= edge), len(self.BUCKETS_MS))
+            row["hist"][bucket] += 1
+
+    def timeout(self, op):
+        with self._lock:
+            self._row(op)["timeouts"] += 1
+
+    def error(self, op):
+        with self._lock:
+            self._row(op)["errors"] += 1
+
+    def snapshot(self):
+        """Everything so far as a JSON-ready dict."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = max(1e-6, now - self.started)
+            wire = 10.0 / (self.baud or 38400)      # seconds per byte, 8N1
+            window = [(o, i) for t, o, i in self._recent if t >= now - self.WINDOW_SEC]
+            recent_out = sum(o for o, _ in window)
+            recent_in = sum(i for _, i in window)
+            labels = [f"<={edge}" for edge in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}"]
+            ops = {}
+            for op, row in sorted(self._ops.items()):
+                out = {k: v for k, v in row.items() if k not in ("hist", "latency_ms_sum")}
+                out["latency_ms_avg"] = round(row["latency_ms_sum"] / row["replies"], 2) if row["replies"] else None
+                out["latency_ms_max"] = round(row["latency_ms_max"], 2)
+                out["hist_ms"] = dict(zip(labels, row["hist"]))
+                ops[op] = out
+            bytes_out = sum(r["bytes_out"] for r in self._ops.values())
+            bytes_in = sum(r["bytes_in"] for r in self._ops.values())
+            span = min(elapsed, self.WINDOW_SEC)
+            util = {
+                "utilisation_out_pct": round(100.0 * bytes_out * wire / elapsed, 2),
+                "utilisation_in_pct": round(100.0 * bytes_in * wire / elapsed, 2),
+                "utilisation_recent_out_pct": round(100.0 * recent_out * wire / span, 2),
+                "utilisation_recent_in_pct": round(100.0 * recent_in * wire / span, 2),
             }
-            QPushButton:hover { background-color: #43a047; }
-        """)
-        self.connect_btn.clicked.connect(self.connect_to_radio)
-        
-        self.disconnect_btn = QPushButton("Disconnect", conn_group)
-        self.disconnect_btn.setGeometry(155, 35, 130, 40)
-        self.disconnect_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #c62828; color: white; font-weight: bold;
-                border-radius: 8px; border: 2px solid #ef5350; font-size: 13px;
+            return {
+                "baud": self.baud,
+                "elapsed_s": round(elapsed, 2),
+                "bytes_out": bytes_out,
+                "bytes_in": bytes_in,
+                "timeouts": sum(r["timeouts"] for r in self._ops.values()),
+                "errors": sum(r["errors"] for r in self._ops.values()),
+                "utilisation_pct": max(util["utilisation_out_pct"], util["utilisation_in_pct"]),
+                "utilisation_recent_pct": max(util["utilisation_recent_out_pct"],
+                                              util["utilisation_recent_in_pct"]),
+                **util,
+                "ops": ops,
             }
-            QPushButton:hover { background-color: #e53935; }
-        """)
-        self.disconnect_btn.clicked.connect(self.disconnect_from_radio)
 
-        # TX LED (next to connection group)
-        self.tx_led = LEDIndicator(diameter=20, label_text="TX")
-        self.tx_led.setParent(self.main_tab)
-        self.tx_led.setGeometry(345, 50, 80, 35)
 
-        # ========== METERS GROUP ==========
-        meters_group = QGroupBox("📊 Signal Meters", self.main_tab)
-        meters_group.setGeometry(620, 580, 570, 170)
-        meters_group.setStyleSheet(groupbox_style)
+class CatRecorder:
+    """
+    Append-only CAT trace, one JSON line per frame:
+
+        {"t": 1234.567891, "d": ">", "c": "poll:meters", "f": "RM1;"}
+
+    t is time.monotonic(), d is ">" (to the rig) or "<" (from it), c is what
+    caused it: "poll:<name>", the GUI method that queued the job (e.g.
+    "activate_preset", "send_cat_command"), or "push" for AI1 frames. Each
+    file starts with a {"t", "wall", ...} header line to anchor t to the clock.
+
+    record() only puts a tuple on a SimpleQueue; a writer thread formats,
+    writes and rotates (cat_trace.jsonl → .1 → ... → .BACKUPS), so it can
+    stay on during normal operation. If the file can't be opened or written,
+    the writer stops and leaves the reason in error for the GUI to report.
+    """
+    MAX_BYTES = 5 * 1024 * 1024
+    BACKUPS = 4
+
+    def __init__(self, path=TRACE_FILE, max_bytes=MAX_BYTES, backups=BACKUPS, **session):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.session = session
+        self.frames = 0
+        self.error = None
+        self._q = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._writer, name="CatRecorder", daemon=True)
+        self._thread.start()
+
+    def record(self, direction, cause, data):
+        """Hot path (CAT worker thread): hand the frame(s) off as-is."""
+        if self.error is None:
+            self._q.put((time.monotonic(), direction, cause, data))
+
+    def close(self, wait_sec=2.0):
+        self._q.put(None)
+        self._thread.join(wait_sec)
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(self.path, "a", encoding="ascii", newline="\n")
+        header = {"t": round(time.monotonic(), 6),
+                  "wall": datetime.now().isoformat(timespec="milliseconds")}
+        header.update(self.session)
+        f.write(json.dumps(header, separators=(",", ":")) + "\n")
+        return f
+
+    def _rotate(self, f):
+        f.close()
+        for n in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{n}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{n + 1}"))
+        if self.backups:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        return self._open()
 
-        s_meter_scale = [
-            (0, "1"), (10, "3"), (20, "5"), (30, "7"), (40, "9"),
-            (55, "+10"), (70, "+20"), (85, "+30"), (100, "+60")
-        ]
-        self.s_meter = RetroBarMeter("S-METER", s_meter_scale)
-        self.s_meter.setParent(meters_group)
-        self.s_meter.setGeometry(10, 30, 420, 28)
-        
-        self.s_meter_label = QLabel("S-METER", meters_group)
-        self.s_meter_label.setGeometry(520, 30, 50, 20)
-        self.s_meter_label.setStyleSheet("color: #64b5f6; font-weight: bold; font-size: 10px;")
+    def _writer(self):
+        try:
+            f = self._open()
+        except Exception as e:
+            self.error = f"can't open {self.path}: {e}"
+            return
+        dumps = json.JSONEncoder(separators=(",", ":")).encode
+        while True:
+            item = self._q.get()
+            batch = []
+            # Drain whatever queued up behind it: one write + flush per burst
+            while item is not None:
+                t, direction, cause, data = item
+                if isinstance(data, bytes):
+                    data = data.decode("ascii", "replace")
+                # A pipelined write carries several commands; log them one per line
+                for part in data.split(";")[:-1] if direction == ">" else (data,):
+                    frame = part + ";" if direction == ">" else part
+                    batch.append(dumps({"t": round(t, 6), "d": direction, "c": cause, "f": frame}))
+                try:
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self.frames += len(batch)
+                try:
+                    f.write("\n".join(batch) + "\n")
+                    f.flush()
+                    if f.tell() >= self.max_bytes:
+                        f = self._rotate(f)
+                except Exception as e:
+                    self.error = f"writing {self.path} failed: {e}"
+                    break
+            if item is None:
+                break
+        try:
+            f.close()
+        except OSError:
+            pass
 
-        pwr_meter_scale = [
-            (0, "0"), (17, "25"), (33, "50"), (50, "75"),
-            (67, "100"), (83, "125"), (100, "150")
-        ]
-        self.pwr_meter = RetroBarMeter("PWR METER", pwr_meter_scale)
-        self.pwr_meter.setParent(meters_group)
-        self.pwr_meter.setGeometry(10, 85, 420, 20)
-        
-        self.pwr_meter_label = QLabel("PWR", meters_group)
-        self.pwr_meter_label.setGeometry(520, 65, 70, 28)
-        self.pwr_meter_label.setStyleSheet("color: #64b5f6; font-weight: bold; font-size: 10px;")
 
-        # Start meter polling
-        self.start_meter_polling()
-        self.tx_timer = QTimer(self)
-        self.tx_timer.setInterval(250)
-        self.tx_timer.timeout.connect(self._poll_tx_status)
-        self.tx_timer.start()
+class CatLink:
+    """
+    Serial side of the CAT bus. Only the CatWorker thread ever touches this,
+    so nothing in here needs a lock. Worker jobs get it as their first arg.
+    """
+    VFO_FRESH_SEC = 2.0        # trust a cached VFO/memory mode this long...
+    VFO_FRESH_SEC_AI = 30.0    # ...or this long while AI1 reports front-panel changes
+    EX_WINDOW = 8              # EX reads in flight at once (48 bytes, well inside the rig's input buffer)
+    PROBE_IDLE_SEC = 1.5       # no reply for this long: the health poll sends its own ID;
+    DEAD_AFTER_MISSES = 3      # this many timed-out exchanges in a row and the rig is gone
+    # Sets of one value each, so a later one overrides an earlier one: opcode →
+    # length of the prefix naming the setting (EX031 is not EX032)
+    SINGLE_VALUE_SETS = {"VM": 2, "MC": 2, "FA": 2, "FB": 2, "MD": 3, "EX": 5}
+
+    def __init__(self, ser, worker):
+        self.ser = ser
+        self.reader = CatFrameReader(ser)
+        self._worker = worker
+        self.bytes_out = 0
+        # VFO/memory mode as last seen on the wire: True = VFO, False = memory
+        self.in_vfo = None
+        self.in_vfo_at = 0.0
+        # Memory channels whose contents may have changed (re-read by scan_memories)
+        self.mem_channel = None
+        self.dirty_memories = set()
+        self._scan_misses = collections.Counter()
+        # Menu snapshot (menu number → value as the rig reports it), kept current
+        # from EX replies and our own EX writes
+        self.menus = {}
+        # Round trips run() saved over sending each command as its own exchange
+        self.round_trips_saved = 0
+        # Per-opcode latency/timeout/byte counters (CAT Terminal → Bus statistics)
+        self.stats = CatStats(getattr(ser, "baudrate", 0) or 38400)
+        # Traffic trace (CatRecorder) when recording is on, and who is talking now
+        self.recorder = None
+        self.cause = "idle"
+        # Liveness from ordinary traffic: any reply resets it, every timeout counts
+        self.last_reply_at = time.monotonic()
+        self.missed = 0
+
+    @property
+    def is_open(self):
+        return bool(self.ser and self.ser.is_open)
+
+    @property
+    def traffic(self):
+        """Total bytes moved in both directions since the port was opened."""
+        return self.bytes_out + self.reader.bytes_in
+
+    def note(self, text):
+        """Append a line to the CAT terminal (delivered on the GUI thread)."""
+        self._worker.log_line.emit(text)
+
+    def activity(self, text):
+        """Append a line to the Activity Log (delivered on the GUI thread)."""
+        self._worker.activity_line.emit(text)
+
+    def progress(self, pct):
+        self._worker.progress.emit(int(pct))
+
+    def stray(self, frame):
+        """A frame nobody asked for. With AI1 on it is a rig push; pass it up."""
+        if self._worker.listen and frame != "?;":
+            self._worker.unsolicited.emit(frame)
+
+    def write(self, cmd):
+        if isinstance(cmd, str):
+            cmd = cmd.encode('ascii')
+        self.ser.write(cmd)
+        self.bytes_out += len(cmd)
+        if self.recorder is not None:
+            self.recorder.record(">", self.cause, cmd)
+        for part in cmd.split(b';'):
+            if part:
+                self.stats.sent(part[:2].decode('ascii', 'replace'), len(part) + 1)
+            # A mode switch may be refused (blank channel...): the cache waits
+            # for an IF;/MC; reply to say where the rig really is
+            if part in (b"VM0", b"VM1") or (part[:2] == b"MC" and len(part) == 5):
+                self.in_vfo = None
+            # Memory writes (MW/MT set) and VFO→memory (AM) invalidate index rows
+            if part[:2] in (b"MW", b"MT") and len(part) > 5 and part[2:5].isdigit():
+                self.dirty_memories.add(int(part[2:5]))
+            elif part == b"AM" and self.mem_channel:
+                self.dirty_memories.add(self.mem_channel)
+            elif part[:2] == b"EX" and len(part) > 5:
+                self.menus[part[2:5].decode('ascii')] = part[5:].decode('ascii')
+
+    def _note_vfo(self, in_vfo):
+        self.in_vfo = in_vfo
+        self.in_vfo_at = time.monotonic()
+
+    def _observe(self, frame):
+        """Keep the VFO/memory cache current from replies and AI1 pushes."""
+        if frame.startswith("IF") and len(frame) >= 28:
+            self._note_vfo(frame[22] == '0')       # IF P7: 0 = VFO
+            if frame[22] != '0' and frame[2:5].isdigit():
+                self.mem_channel = int(frame[2:5])
+        elif frame == "MC000;":
+            self._note_vfo(True)
+        elif frame.startswith("MC") and frame[2:5].isdigit():
+            self._note_vfo(False)
+            self.mem_channel = int(frame[2:5])
+        elif frame.startswith("EX") and len(frame) > 6:
+            self.menus[frame[2:5]] = frame[5:-1]
+
+    def vfo_fresh(self, in_vfo=True):
+        """True if we know, recently enough, that the rig is in VFO (or memory, in_vfo=False)."""
+        window = self.VFO_FRESH_SEC_AI if self._worker.listen else self.VFO_FRESH_SEC
+        return self.in_vfo is in_vfo and time.monotonic() - self.in_vfo_at < window
+
+    def read_frame(self, timeout_sec=0.5):
+        """Read one ';'-terminated frame, or "" on timeout."""
+        if not self.is_open:
+            return ""
+        frame = self.reader.read_frame(timeout_sec)
+        if frame:
+            self.last_reply_at = time.monotonic()
+            self.missed = 0
+            if self.recorder is not None:
+                self.recorder.record("<", self.cause, frame)
+            self.stats.received("?" if frame == "?;" else frame[:2], len(frame))
+            self._observe(frame)
+        return frame
+
+    def read_frames(self, window_sec):
+        """Collect every frame that arrives within window_sec."""
+        frames = []
+        deadline = time.monotonic() + window_sec
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return frames
+            frame = self.read_frame(remaining)
+            if frame:
+                frames.append(frame)
+
+    def query(self, cmd, timeout_sec=0.5):
+        """Send cmd, return the reply frame (e.g. "FA014250000;") or "" on timeout.
+
+        Read replies echo the command (FA; → FA..., EX031; → EX031...), so frames
+        that don't match are stale leftovers or AI pushes and go to stray().
+        """
+        if not self.is_open:
+            return ""
+        if isinstance(cmd, bytes):
+            cmd = cmd.decode('ascii')
+        want = cmd.rstrip(';')
+        op = want[:2]
+        try:
+            self.write(cmd)
+            sent_at = time.monotonic()
+            deadline = sent_at + timeout_sec
+            while True:
+                frame = self.read_frame(max(0.0, deadline - time.monotonic()))
+                if not frame:
+                    self.missed += 1
+                    self.stats.timeout(op)
+                    return frame
+                if frame == "?;":
+                    self.stats.error(op)
+                    return frame
+                if frame.startswith(want):
+                    self.stats.reply(op, time.monotonic() - sent_at)
+                    return frame
+                self.stray(frame)
+        except serial.SerialException:
+            raise
+        except Exception:
+            return ""
 
-        # ========== FREQUENCY DISPLAY GROUP (right side) ==========
-        freq_group = QGroupBox("📻 Frequency", self.main_tab)
-        freq_group.setGeometry(620, 10, 560, 160)
-        freq_group.setStyleSheet(groupbox_style)
-        
-        self.freq_display = FrequencyDisplayLabel(self, freq_group, self.adjust_frequency)
-        self.freq_display.setGeometry(15, 25, 460, 70)
-        freq_font = QFont("Digital-7 Mono", 38, QFont.Bold)
-        self.freq_display.setFont(freq_font)
-        self.freq_display.setStyleSheet("""
-            color: #64b5f6;
-            background-color: #0a1929;
-            border: 2px solid #1e3a5f;
-            border-radius: 10px;
-        """)
-        self.freq_display.setAlignment(Qt.AlignCenter)
+    def wire_time(self, nbytes):
+        """Seconds it takes nbytes to cross the link at the current baud (8N1)."""
+        return nbytes * 10.0 / (getattr(self.ser, "baudrate", 0) or 38400)
 
-        # Channel info label (shows memory channel number and tag/name)
-        self.channel_info_label = QLabel("", freq_group)
-        self.channel_info_label.setGeometry(15, 100, 460, 28)
-        self.channel_info_label.setStyleSheet("""
-            color: #ffd54f;
-            background-color: #0a1929;
-            border: 1px solid #1e3a5f;
-            border-radius: 5px;
-            padding-left: 8px;
-            font-size: 14px;
-            font-weight: bold;
-        """)
-        self.channel_info_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+    def transact(self, cmds, timeout_sec=0.5):
+        """Pipeline several commands in a single write and demultiplex the replies.
 
-        # +/- buttons inside freq group
-        self.mem_plus_btn = QPushButton("+", freq_group)
-        self.mem_plus_btn.setGeometry(490, 25, 50, 48)
-        self.mem_plus_btn.setStyleSheet("background-color: #1976d2; color: white; font-weight: bold; font-size: 24px; border-radius: 8px; border: 2px solid #42a5f5;")
-        self.mem_plus_btn.clicked.connect(lambda: self.change_memory_channel(1))
+        cmds is a list like ["FA;", "MD0;", "MC;"] or one string "FA;MD0;MC;".
+        Returns one entry per command, in order: the reply frame, "?;" if the rig
+        rejected it, "" if it timed out, None for a set command nothing was
+        reported against, or CAT_MAYBE_REJECTED for a set that may own a '?;'
+        which can't be pinned on one command (sets only answer when rejected,
+        so between two answered reads a '?;' could be any of the sets there;
+        put a read after a set whose rejection matters).
+        """
+        if isinstance(cmds, bytes):
+            cmds = cmds.decode('ascii')
+        if isinstance(cmds, str):
+            cmds = [c + ";" for c in cmds.split(";") if c]
+        replies = [None] * len(cmds)
+        if not cmds or not self.is_open:
+            return replies
+
+        pending = []       # (index, prefix) of reads still waiting, in send order
+        for i, c in enumerate(cmds):
+            if cat_expects_reply(c):
+                pending.append((i, c.rstrip(';')))
+                replies[i] = ""
+        rejects = collections.Counter()    # '?;' frames after each answered read (-1: before any)
+        last = -1                          # index of the last answered read
+
+        payload = "".join(cmds)
+        self.write(payload)
+        sent_at = time.monotonic()
+        deadline = sent_at + timeout_sec + self.wire_time(len(payload) + 16 * len(pending))
+
+        while pending:
+            wait = max(0.0, deadline - time.monotonic())
+            if rejects[last] >= len(pending):
+                # Enough '?;' for every read still out; if one was a set's,
+                # the real reply is right behind it
+                if rejects[last] >= len(pending) + sum(1 for j in range(last + 1, len(cmds))
+                                                       if replies[j] is None):
+                    break
+                wait = min(wait, 0.05 + self.wire_time(16))
+            frame = self.read_frame(wait)
+            if not frame:
+                break
+            if frame == "?;":
+                rejects[last] += 1
+                continue
+            for k, (i, want) in enumerate(pending):
+                if frame.startswith(want):
+                    replies[i] = frame
+                    self.stats.reply(want[:2], time.monotonic() - sent_at)
+                    # The rig answers in order: reads before this one are settled
+                    del pending[:k + 1]
+                    last = i
+                    break
+            else:
+                self.stray(frame)
+
+        self._attribute_rejects(cmds, replies, rejects)
+        lost = [i for i, r in enumerate(replies) if r == ""]
+        if lost:
+            self.missed += 1
+        for i in lost:
+            self.stats.timeout(cmds[i][:2])
+            self.note(f"[timeout] {cmds[i]}")
+        return replies
+
+    def _attribute_rejects(self, cmds, replies, rejects):
+        """Share out the '?;' frames counted after each answered read among the
+        unanswered commands up to the next answered read. Unanswered reads
+        take them first (a read always answers); the rest go to the sets
+        there: all of them, none, or (can't tell which) CAT_MAYBE_REJECTED."""
+        anchors = [-1] + [i for i, r in enumerate(replies) if r and r != "?;"] + [len(cmds)]
+        for lo, hi in zip(anchors, anchors[1:]):
+            count = rejects[lo]
+            reads = [i for i in range(lo + 1, hi) if replies[i] == ""]
+            sets = [i for i in range(lo + 1, hi) if replies[i] is None]
+            for i in reads[:count]:
+                replies[i] = "?;"
+                self.stats.error(cmds[i][:2])
+                self.note(f"[rejected] {cmds[i]}")
+            extra = count - len(reads)
+            if extra <= 0 or not sets:
+                continue
+            if extra >= len(sets):
+                for i in sets:
+                    replies[i] = "?;"
+                    self.stats.error(cmds[i][:2])
+                    self.note(f"[rejected] {cmds[i]}")
+            else:
+                for i in sets:
+                    replies[i] = CAT_MAYBE_REJECTED
+                for _ in range(extra):
+                    self.stats.error("?")
+                self.note(f"[rejected] {extra} of {''.join(cmds[i] for i in sets)} (can't tell which)")
+
+    def optimize(self, cmds):
+        """Plan a command list against what we know about the rig.
+
+        Drops sets that change nothing (VM1/VM0 while freshly in that mode, EX
+        writes matching the menu snapshot), sets overridden by a later set of
+        the same setting before any read (SINGLE_VALUE_SETS only: CO0x, MTnnn
+        and the like address different things and are always kept), and
+        repeated reads with no set between them. Returns (commands to send,
+        {original index: index in that list} for every command that is sent).
+        """
+        kept, slots = [], {}
+        read_at, set_at = {}, {}     # read body / set key → index in kept
+        in_vfo = self.in_vfo if self.vfo_fresh(self.in_vfo) else None
+        for i, cmd in enumerate(cmds):
+            body = cmd.rstrip(';')
+            if cat_expects_reply(cmd):
+                if body not in read_at:
+                    read_at[body] = len(kept)
+                    kept.append(cmd)
+                slots[i] = read_at[body]
+                set_at.clear()       # a read observes the sets before it: keep them
+                continue
+            if (body == "VM1" and in_vfo is False) or (body == "VM0" and in_vfo is True):
+                continue
+            if body[:2] == "EX" and len(body) > 5 and self.menus.get(body[2:5]) == body[5:]:
+                continue
+            width = self.SINGLE_VALUE_SETS.get(body[:2])
+            if width is not None:
+                key = body[:width]
+                if key in set_at:
+                    kept[set_at[key]] = None
+                set_at[key] = len(kept)
+            slots[i] = len(kept)
+            kept.append(cmd)
+            read_at.clear()          # state changed: later reads must go out again
+            if body == "VM0":
+                in_vfo = True
+            elif body == "VM1" or (body[:2] == "MC" and body[2:] != "000"):
+                in_vfo = False
+
+        # Compact out the overridden sets and remap the read slots
+        index, plan = {}, []
+        for j, cmd in enumerate(kept):
+            if cmd is not None:
+                index[j] = len(plan)
+                plan.append(cmd)
+        return plan, {i: index[j] for i, j in slots.items() if j in index}
+
+    def run(self, cmds, label=None, timeout_sec=0.5):
+        """Optimise cmds (see optimize) and send what's left as one pipelined batch.
+
+        Returns one entry per original command, like transact(): the reply for
+        reads; for sets None (accepted, or dropped as redundant), "?;" if the
+        rig rejected it, or CAT_MAYBE_REJECTED. Logs the round trips saved over
+        one exchange per command when label is given.
+        """
+        if isinstance(cmds, str):
+            cmds = [c + ";" for c in cmds.split(";") if c]
+        plan, slots = self.optimize(cmds)
+        replies = self.transact(plan, timeout_sec) if plan else []
+        saved = len(cmds) - (1 if plan else 0)
+        self.round_trips_saved += saved
+        if label:
+            self.note(f"[plan] {label}: {''.join(cmds)} → {''.join(plan) or '(nothing)'} "
+                      f"({saved} round trip{'s' if saved != 1 else ''} saved)")
+        return [replies[slots[i]] if i in slots else None for i in range(len(cmds))]
+
+    def wait_until(self, cmd, predicate, deadline=1.0, first=0.02, cap=0.16):
+        """Re-send read cmd until predicate(reply) holds or deadline (s) runs out.
+
+        The first check goes out at once and the gap between checks backs off
+        from first to cap, so a quick rig confirms in one round trip and a slow
+        one still gets the whole deadline. Returns (ok, last_reply).
+        """
+        end = time.monotonic() + deadline
+        delay = first
+        while True:
+            reply = self.query(cmd)
+            try:
+                if reply and reply != "?;" and predicate(reply):
+                    return True, reply
+            except Exception:
+                pass
+            left = end - time.monotonic()
+            if left <= 0:
+                return False, reply
+            time.sleep(min(delay, left))
+            delay = min(delay * 2, cap)
+
+    def wait_channel(self, ch, deadline=1.0):
+        """After MCnnn;: wait until MC; reports ch. Returns (ok, actual channel or None)."""
+        ok, resp = self.wait_until("MC;", lambda r: r[2:5] == f"{ch:03d}", deadline)
+        actual = int(resp[2:5]) if resp.startswith("MC") and resp[2:5].isdigit() else None
+        return ok, actual
+
+    def write_fa(self, hz, before=None, deadline=0.3):
+        """Write FA and return the rig's readback (it may quantize to the step).
+        Waits until the readback moves off `before` or reaches hz."""
+        self.write(f"FA{hz:011d};")
+
+        def moved(r):
+            got = int(r[2:-1])
+            return got == hz or (before is not None and got != before)
+
+        ok, fa = self.wait_until("FA;", moved, deadline)
+        digits = "".join(ch for ch in fa[2:-1] if ch.isdigit()) if fa.startswith("FA") else ""
+        return int(digits[-11:].rjust(11, "0")) if digits else hz
+
+    # --- FT-991A helpers (worker thread only) ---
+    def read_menus(self, nums, report=False):
+        """Pipelined EX reads for nums, EX_WINDOW at a time; the replies land in self.menus."""
+        nums = list(nums)
+        for i in range(0, len(nums), self.EX_WINDOW):
+            window = nums[i:i + self.EX_WINDOW]
+            for num, reply in zip(window, self.transact([f"EX{n};" for n in window])):
+                if not reply or reply == "?;":
+                    self.menus.pop(num, None)
+            if report:
+                self.progress((i + len(window)) / len(nums) * 100)
+
+    def dump_menus(self, nums=None):
+        """Read every menu (or just nums) and return a [MenuValue] snapshot."""
+        nums = list(nums or MENU_DESCRIPTIONS)
+        self.read_menus(nums, report=True)
+        return [MenuValue(num, MENU_DESCRIPTIONS.get(num, ("",))[0], self.menus.get(num, "----"))
+                for num in nums]
+
+    def apply_menus(self, items, commands=None, pace=0.02):
+        """Bring the rig's menus to items [(num, value)], writing only what differs.
+
+        Every menu in items is read first (pipelined), so a value changed on
+        the front panel since the snapshot was taken is not mistaken for one
+        already in place. The changed ones are written and then read back in
+        one go, which both confirms them and corrects the snapshot. commands,
+        if given, holds the pre-encoded EX write for each item. Returns the
+        items written.
+        """
+        if commands is None:
+            commands = [f"EX{num}{val};".encode("ascii") for num, val in items]
+        self.read_menus(num for num, _ in items)
+        changed = [(num, val, cmd) for (num, val), cmd in zip(items, commands) if self.menus.get(num) != val]
+        for idx, (num, val, cmd) in enumerate(changed):
+            self.write(cmd)
+            self.activity(f"⏩ Sent: {num} → {val}")
+            self.progress((idx + 1) / len(changed) * 100)
+            time.sleep(pace)
+        self.read_menus(num for num, _, _ in changed)
+        for num, val, _ in changed:
+            if self.menus.get(num) != val:
+                self.note(f"[mismatch] EX{num}: wrote {val}, rig has {self.menus.get(num, '?')}")
+        return [(num, val) for num, val, _ in changed]
+
+    def run_plan(self, plan):
+        """Run a PresetPlan: changed menus, then the landing, then one batch of checks.
+
+        Returns (menus written, channel or None for VFO, tag, MD0 reply).
+        """
+        changed = self.apply_menus(plan.menus, plan.commands) if plan.menus else []
+        channel, mt = None, None
+        if plan.memory:
+            # Landing and every check in one write; wait only if MC; isn't there yet
+            ch = f"{plan.memory:03d}"
+            _, mc_set, mc, md, mt = self.run(["VM1;", f"MC{ch};", "MC;", "MD0;", f"MT{ch};"], label=f"MC{ch}")
+            channel = plan.memory
+            if mc[2:5] != ch:
+                if mc_set in ("?;", CAT_MAYBE_REJECTED):
+                    # Refused (blank channel?): it isn't coming, report where we are
+                    self.activity(f"⚠️ The radio refused MC{ch}; is memory {ch} programmed?")
+                    channel = int(mc[2:5]) if mc[2:5].isdigit() else None
+                else:
+                    _, channel = self.wait_channel(plan.memory)
+                    channel = channel or plan.memory
+                if channel:
+                    md, mt = self.transact(["MD0;", f"MT{channel:03d};"])
+        else:
+            if not self.ensure_vfo():
+                self.activity("⚠️ Could not confirm VFO; continuing.")
+            md, = self.transact(["MD0;"])
+        if plan.mode and md[3:4] != plan.mode:
+            self.write(f"MD0{plan.mode};")
+            _, md = self.wait_until("MD0;", lambda r: r[3:4] == plan.mode, deadline=0.3)
+        return changed, channel, self._parse_memory_tag(mt), md
+
+    def read_fa_hz(self):
+        """Query FA; and return an int Hz. None if bad/timeout."""
+        resp = self.query("FA;")
+        if not (resp.startswith("FA") and resp.endswith(";")):
+            return None
+        digits = "".join(ch for ch in resp[2:-1] if ch.isdigit())
+        if not digits:
+            return None
+        return int(digits[-11:].rjust(11, "0"))
 
-        self.mem_minus_btn = QPushButton("-", freq_group)
-        self.mem_minus_btn.setGeometry(490, 80, 50, 48)
-        self.mem_minus_btn.setStyleSheet("background-color: #1976d2; color: white; font-weight: bold; font-size: 24px; border-radius: 8px; border: 2px solid #42a5f5;")
-        self.mem_minus_btn.clicked.connect(lambda: self.change_memory_channel(-1))
+    def ensure_vfo(self, attempts: int = 4, check_delay: float = 0.16) -> bool:
+        """
+        Force VFO (not Memory) and confirm with MC; (MC000; means VFO).
+        Retries a few times with small back-off. Returns True if confirmed.
+        A fresh cached VFO state (a recent IF;/MC; reply or AI1 push, never
+        just our own VM0;) answers without touching the bus.
+        """
+        if self.vfo_fresh():
+            return True
 
-        # ========== SIMPLEX FREQUENCIES GROUP ==========
-        simplex_group = QGroupBox("📡 Simplex Frequencies", self.main_tab)
-        simplex_group.setGeometry(15, 220, 490, 80)
-        simplex_group.setStyleSheet(groupbox_style)
+        def mc_is_vfo(s: str) -> bool:
+            return s.startswith("MC") and len(s) >= 5 and s[2:5].isdigit() and s[2:5] == "000"
 
-        btn_style_cyan = """
-            QPushButton {
-                background-color: #0277bd; color: white; font-weight: bold;
-                border-radius: 6px; font-size: 10px; border: 1px solid #0288d1;
-            }
-            QPushButton:hover { background-color: #0288d1; }
-        """
+        for i in range(attempts):
+            try:
+                # 1) Where are we now?
+                resp = self.query("MC;")
+                if resp:
+                    self.note(f">> MC;\n<< {resp}")
+                if mc_is_vfo(resp):
+                    return True  # already VFO
 
-        self.btn_mem_059 = QPushButton("144.420 M059", simplex_group)
-        self.btn_mem_059.setGeometry(10, 35, 110, 32)
-        self.btn_mem_059.setStyleSheet(btn_style_cyan)
-        self.btn_mem_059.clicked.connect(lambda: self.recall_memory_channel("059"))
+                # 2) Not VFO → force it, and check straight away in the same write
+                # (MT0; was sent here once as "memory tune off"; it is a tag read
+                # on the FT-991A and only ever earned a '?;')
+                _, resp2 = self.run(["VM0;", "MC;"], label="ensure_vfo")
+                ok = mc_is_vfo(resp2)
 
-        self.btn_mem_060 = QPushButton("446.000 M060", simplex_group)
-        self.btn_mem_060.setGeometry(125, 35, 110, 32)
-        self.btn_mem_060.setStyleSheet(btn_style_cyan)
-        self.btn_mem_060.clicked.connect(lambda: self.recall_memory_channel("060"))
+                # 3) Wait for the rig to confirm (a little longer each try)
+                if not ok:
+                    ok, resp2 = self.wait_until("MC;", mc_is_vfo, deadline=check_delay + 0.06 * i)
+                if resp2:
+                    self.note(f">> MC;\n<< {resp2}")
+                if ok:
+                    return True
 
-        self.btn_mem_061 = QPushButton("145.600 M061", simplex_group)
-        self.btn_mem_061.setGeometry(240, 35, 110, 32)
-        self.btn_mem_061.setStyleSheet(btn_style_cyan)
-        self.btn_mem_061.clicked.connect(lambda: self.recall_memory_channel("061"))
+            except serial.SerialException:
+                raise
+            except Exception as e:
+                self.note(f"[ensure_vfo error] {e}")
+                # loop and retry
 
-        self.btn_mem_062 = QPushButton("433.500 M062", simplex_group)
-        self.btn_mem_062.setGeometry(355, 35, 110, 32)
-        self.btn_mem_062.setStyleSheet(btn_style_cyan)
-        self.btn_mem_062.clicked.connect(lambda: self.recall_memory_channel("062"))
+        self.in_vfo = None   # our VM0; didn't take; don't trust the cache
+        return False
 
-        # ========== DARN MEMORIES GROUP ==========
-        darn_group = QGroupBox("🔖 DARN Memories", self.main_tab)
-        darn_group.setGeometry(15, 320, 180, 80)
-        darn_group.setStyleSheet(groupbox_style)
+    def read_memory_channel(self):
+        """Return current memory channel as int, or None if not in memory mode or parse fails."""
+        try:
+            resp = self.query("MC;")
+            self.note(f">> MC;\n<< {resp}")
 
-        self.btn_mem_darn3 = QPushButton("DARN 3", darn_group)
-        self.btn_mem_darn3.setGeometry(10, 35, 75, 32)
-        self.btn_mem_darn3.setStyleSheet(btn_style_cyan)
-        self.btn_mem_darn3.clicked.connect(lambda: self.recall_memory_channel("004"))
+            if not (resp.startswith("MC") and resp.endswith(";")):
+                return None
 
-        self.btn_mem_darn2 = QPushButton("DARN 2", darn_group)
-        self.btn_mem_darn2.setGeometry(90, 35, 75, 32)
-        self.btn_mem_darn2.setStyleSheet(btn_style_cyan)
-        self.btn_mem_darn2.clicked.connect(lambda: self.recall_memory_channel("003"))
+            payload = resp[2:-1]  # should be 'nnn'
+            # Be tolerant: extract the first 3 digits anywhere in payload
+            import re
+            m = re.search(r"(\d{3})", payload)
+            if not m:
+                return None
 
-        # ========== MODE PRESETS GROUP ==========
-        presets_group = QGroupBox("🎛️ Mode Presets", self.main_tab)
-        presets_group.setGeometry(15, 440, 590, 130)
-        presets_group.setStyleSheet(groupbox_style)
+            ch = int(m.group(1))
+            if ch == 0:
+                # Radio replies MC000 when in VFO (not memory) mode
+                return None
+            return ch
 
-        btn_style_blue = """
-            QPushButton {
-                background-color: #1565c0; color: white; font-weight: bold;
-                border-radius: 6px; font-size: 10px; border: 1px solid #1976d2;
-            }
-            QPushButton:hover { background-color: #1976d2; }
-        """
+        except serial.SerialException:
+            raise
+        except Exception as e:
+            self.note(f"[read_current_memory_channel error] {e}")
+            return None
 
-        # Row 1 of presets
-        self.preset_btn_default2 = QPushButton("Mic Simplex", presets_group)
-        self.preset_btn_default2.setGeometry(10, 32, 100, 32)
-        self.preset_btn_default2.setStyleSheet(btn_style_blue)
-        self.preset_btn_default2.clicked.connect(partial(self.activate_default2_memory, "presets/overrides_only.xml"))
-
-        self.preset_btn_mic_default_d3 = QPushButton("Mic DARN3", presets_group)
-        self.preset_btn_mic_default_d3.setGeometry(120, 32, 100, 32)
-        self.preset_btn_mic_default_d3.setStyleSheet(btn_style_blue)
-        self.preset_btn_mic_default_d3.clicked.connect(partial(self.activate_mic_default_d3, "presets/overrides_only.xml"))
-
-        self.preset_btn_aprs_m059 = QPushButton("APRS Simplex", presets_group)
-        self.preset_btn_aprs_m059.setGeometry(230, 32, 100, 32)
-        self.preset_btn_aprs_m059.setStyleSheet(btn_style_blue)
-        self.preset_btn_aprs_m059.clicked.connect(partial(self.activate_aprs_simplex59, "presets/aprs.xml"))
-
-
-
-        # Row 2 of presets
-        self.preset_btn_ft8 = QPushButton("FT8", presets_group)
-        self.preset_btn_ft8.setGeometry(10, 72, 70, 32)
-        self.preset_btn_ft8.setStyleSheet(btn_style_blue)
-        self.preset_btn_ft8.clicked.connect(partial(self.activate_ft8_memory, "presets/FT8settings.xml"))
-
-        self.preset_btn_winlink = QPushButton("Winlink", presets_group)
-        self.preset_btn_winlink.setGeometry(95, 72, 70, 32)
-        self.preset_btn_winlink.setStyleSheet(btn_style_blue)
-        self.preset_btn_winlink.clicked.connect(partial(self.activate_winlink_memory, "presets/WINLINK_APRS.xml"))
-
-        self.varafm_label = QLabel("← VARA FM", presets_group)
-        self.varafm_label.setGeometry(99, 104, 80, 18)
-        self.varafm_label.setStyleSheet("color: #90caf9; font-size: 10px;")
-
-        self.preset_btn_aprs = QPushButton("APRS Pin", presets_group)
-        self.preset_btn_aprs.setGeometry(180, 72, 80, 32)
-        self.preset_btn_aprs.setStyleSheet(btn_style_blue)
-        self.preset_btn_aprs.clicked.connect(partial(self.activate_aprs_memory, "presets/aprs.xml"))
-
-        self.preset_btn_ssb = QPushButton("SSB", presets_group)
-        self.preset_btn_ssb.setGeometry(275, 72, 70, 32)
-        self.preset_btn_ssb.setStyleSheet(btn_style_blue)
-        self.preset_btn_ssb.clicked.connect(partial(self.activate_ssb_memory, "presets/SSB_setting.xml"))
-
-        self.preset_btn_wiresx = QPushButton("WIRES-X", presets_group)
-        self.preset_btn_wiresx.setGeometry(360, 72, 80, 32)
-        self.preset_btn_wiresx.setStyleSheet(btn_style_blue)
-        self.preset_btn_wiresx.clicked.connect(partial(self.activate_wiresx_memory, "presets/wiresx.xml"))
-
-        self.preset_btn_default = QPushButton("⚙️ Default", presets_group)
-        self.preset_btn_default.setGeometry(455, 72, 90, 32)
-        self.preset_btn_default.setStyleSheet("""
-            QPushButton {
-                background-color: #455a64; color: white; font-weight: bold;
-                border-radius: 6px; font-size: 10px; border: 1px solid #607d8b;
-            }
-            QPushButton:hover { background-color: #546e7a; }
-        """)
-        self.preset_btn_default.clicked.connect(partial(self.activate_default_memory, "presets/defaultv002.xml"))
+    def read_memory_tag(self, channel: int):
+        """Return the memory TAG (name) for MTnnn; or None if unavailable/parse fails."""
+        try:
+            resp = self.query(f"MT{channel:03d};")
+            self.note(f">> MT{channel:03d};\n<< {resp}")
+            return self._parse_memory_tag(resp)
 
-        # ========== FILE OPERATIONS GROUP ==========
-        file_group = QGroupBox("📁 File Operations", self.main_tab)
-        file_group.setGeometry(15, 600, 490, 85)
-        file_group.setStyleSheet(groupbox_style)
+        except serial.SerialException:
+            raise
+        except Exception as e:
+            self.note(f"[read_memory_tag error] {e}")
+            return None
 
-        self.save_btn = QPushButton("📥 Download From Radio", file_group)
-        self.save_btn.setGeometry(15, 35, 220, 38)
-        self.save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2e7d32; color: white; font-weight: bold;
-                border-radius: 6px; font-size: 12px; border: 2px solid #4caf50;
-            }
-            QPushButton:hover { background-color: #43a047; }
-        """)
-        self.save_btn.clicked.connect(self.load_all_menus)
+    @staticmethod
+    def _parse_memory_tag(resp):
+        """Tag text from an MTnnn...; reply, or None."""
+        try:
+            if not (resp and resp.startswith("MT") and resp.endswith(";")):
+                return None
 
-        self.load_btn = QPushButton("📤 Load File to Radio", file_group)
-        self.load_btn.setGeometry(250, 35, 220, 38)
-        self.load_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #c62828; color: white; font-weight: bold;
-                border-radius: 6px; font-size: 12px; border: 2px solid #ef5350;
-            }
-            QPushButton:hover { background-color: #e53935; }
-        """)
-        self.load_btn.clicked.connect(self.select_and_load_file)
+            payload = resp[2:-1]  # strip 'MT' and trailing ';'
 
-        # ========== LOG DISPLAY GROUP (right side, aligned with Frequency) ==========
-        log_group = QGroupBox("📝 Activity Log", self.main_tab)
-        log_group.setGeometry(620, 180, 560, 370)
-        log_group.setStyleSheet(groupbox_style)
-        
-        self.text_display = QTextEdit(log_group)
-        self.text_display.setGeometry(15, 30, 530, 325)
-        self.text_display.setReadOnly(True)
-        self.text_display.setStyleSheet("background-color: #0a1628; color: #7fff7f; font-family: Consolas; font-size: 11px; border: 1px solid #1e3a5f; border-radius: 6px;")
+            # MT payload is the 26-char IF-style memory block, then up to 12 tag chars
+            if len(payload) >= 26 and payload[:12].isdigit():
+                payload = payload[26:]
 
-        # ========== STATUS & PROGRESS ==========
-        self.status_label = QLabel("Ready - Configure COM port in Settings tab", self.main_tab)
-        self.status_label.setGeometry(15, 735, 300, 28)
-        self.status_label.setStyleSheet("color: #ffd54f; font-weight: bold; font-size: 13px;")
+            # Clean to printable ASCII, strip padding
+            tag = "".join(ch for ch in payload if ch in string.printable).strip()
 
-        self.progress_bar = QProgressBar(self.main_tab)
-        self.progress_bar.setGeometry(15, 700, 490, 25)
-        self.progress_bar.setValue(0)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #1e3a5f; border-radius: 6px;
-                background: #0a1929; color: #a0c4ff; text-align: center; font-size: 11px;
-            }
-            QProgressBar::chunk {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #1976d2, stop:0.5 #42a5f5, stop:1 #1976d2);
-                border-radius: 4px;
-            }
-        """)
+            # Yaesu tags are typically up to 12 chars; trim if longer
+            if len(tag) > 12:
+                tag = tag[:12].rstrip()
 
-# ➡ Timer for live frequency polling
-        self.freq_timer = QTimer(self)
-        self.freq_timer.timeout.connect(self.update_frequency_display)
-        self.freq_timer.start(500)
+            # Guard against empty/placeholder returns
+            if not tag or tag == "---":
+                return None
 
-# ➡ Timer for channel info polling (slower - every 2 seconds)
-        self.channel_info_timer = QTimer(self)
-        self.channel_info_timer.timeout.connect(self.update_channel_info_display)
-        self.channel_info_timer.start(2000)
+            return tag
+        except Exception:
+            return None
 
+    @staticmethod
+    def parse_memory(reply):
+        """MemoryEntry from an MTnnn...; reply; a blank channel answers "?;"."""
+        if reply == "?;":
+            return MemoryEntry(None, None, "", False)
+        if not (reply.startswith("MT") and reply.endswith(";")):
+            return None
+        p = reply[2:-1]
+        if len(p) < 26 or not p[:12].isdigit():
+            return None
+        hz = int(p[3:12])
+        return MemoryEntry(hz, CAT_MODE_NAMES.get(p[19], '?'), p[26:].strip(), hz > 0)
+
+    def scan_memories(self, limit=8):
+        """Re-read up to `limit` dirty channels with one pipelined MT batch.
+        Returns {channel: MemoryEntry}; a channel that times out is retried twice."""
+        chs = sorted(self.dirty_memories)[:limit]
+        if not chs:
+            return {}
+        self.dirty_memories.difference_update(chs)
+        replies = self.transact([f"MT{ch:03d};" for ch in chs])
+        found = {}
+        for ch, reply in zip(chs, replies):
+            entry = self.parse_memory(reply) if reply else None
+            if entry is None:
+                self._scan_misses[ch] += 1
+                if self._scan_misses[ch] < 3:
+                    self.dirty_memories.add(ch)
+            else:
+                self._scan_misses.pop(ch, None)
+                found[ch] = entry
+        return found
 
+    def read_memory_summary(self, channel: int):
+        """Read memory details with MRnnn; and return the raw reply (or None on failure)."""
+        try:
+            resp = self.query(f"MR{channel:03d};")
+            if not resp:
+                return None
+            self.note(f">> MR{channel:03d};\n<< {resp}")
+            # We return raw so you can parse elsewhere; don't over-validate here.
+            return resp
+        except serial.SerialException:
+            raise
+        except Exception as e:
+            self.note(f"[read_memory_summary error] {e}")
+            return None
 
+    def is_memory_filled(self, ch: int) -> bool:
+        """Return True if memory channel has data (not blank) without changing state."""
+        try:
+            resp = self.query(f"MR{ch:03d};") or ""
+            if not (resp.startswith("MR") and resp.endswith(";")):
+                return False
 
+            # Strip header and optional echoed channel
+            payload = resp[2:-1]
+            if len(payload) >= 3 and payload[:3].isdigit():
+                payload = payload[3:]
 
+            # Heuristic: look for a long digit run (freq etc.) and ensure it's not all zeros
+            import re
+            m = re.search(r"(\d{6,})", payload)  # any long numeric field
+            return bool(m and any(c != "0" for c in m.group(1)))
+        except serial.SerialException:
+            raise
+        except Exception:
+            return False
 
+    def read_rig_state(self, tags=None):
+        """One IF; round trip → RigState (None on timeout/garbage).
 
+        In memory mode the tag isn't in IF;, so it costs one MTnnn; read unless
+        tags (a {channel: tag} cache) already has it.
+        """
+        st = RigState.from_if(self.query("IF;"))
+        if st is not None and st.in_memory:
+            if tags is not None and st.channel in tags:
+                st.tag = tags[st.channel]
+            else:
+                mt = self.query(f"MT{st.channel:03d};")
+                if mt.startswith("MT"):
+                    st.tag = self._parse_memory_tag(mt) or ""
+        return st
+
+
+class CatPoll:
+    """One periodic query owned by the CatScheduler."""
+    __slots__ = ("name", "job", "period", "priority", "cost", "on_done", "on_error",
+                 "when", "due", "effective", "background", "metered")
+
+    def __init__(self, name, job, period, priority, cost, on_done, on_error, when, background=False,
+                 metered=True):
+        self.name = name
+        self.job = job                # job(link) → result, like a worker job
+        self.period = period          # requested period (s)
+        self.effective = period       # period after the bus budget is applied
+        self.priority = priority      # higher runs first when several are due
+        self.cost = cost              # bytes on the wire per run (both directions)
+        self.on_done = on_done
+        self.on_error = on_error
+        self.when = when              # optional predicate; False skips this run
+        self.background = background  # only uses spare budget; not in the plan
+        self.metered = metered        # False: runs on time even with the bucket empty (health)
+        self.due = 0.0
+
+
+class CatScheduler:
+    """
+    Periodic polls, run by the CatWorker whenever no user job is waiting.
+
+    All traffic on the link (user jobs too) is charged to a token bucket that
+    refills at budget × baud/10 bytes/s, so polls back off while a preset upload
+    is busy. The debt a long job can run up is capped at one burst, so polls
+    resume within about a second of it finishing. If the polls alone would
+    exceed the budget (4800/9600 baud) their periods are stretched, lowest
+    priority first, up to MAX_STRETCH. Unmetered polls (the health check) are
+    charged like the rest but never wait for tokens.
+    """
+    MAX_STRETCH = 8.0
+    IDLE_WAIT = 0.25     # longest the worker sleeps before looking again (s)
+
+    def __init__(self, baud=38400, budget=0.5):
+        self._lock = threading.Lock()
+        self._polls = {}
+        self._hold_until = 0.0
+        self._seen = 0
+        self._stamp = time.monotonic()
+        self.configure(baud, budget)
+        self._tokens = self._burst
+
+    def configure(self, baud, budget):
+        """Set the link speed and the fraction of it polls may use."""
+        with self._lock:
+            self.baud = baud
+            self.budget = budget
+            self._rate = max(1.0, budget * baud / 10.0)    # bytes/s
+            self._replan()
+
+    def add(self, name, job, period, priority, cost, on_done=None, on_error=None, when=None,
+            background=False, metered=True):
+        """Register a poll. Background polls (bulk scans) don't count toward the
+        plan, so they never stretch the others; the token bucket still meters them."""
+        with self._lock:
+            self._polls[name] = CatPoll(name, job, period, priority, cost, on_done, on_error, when,
+                                        background, metered)
+            self._replan()
+
+    def set_period(self, name, period):
+        with self._lock:
+            if name in self._polls:
+                self._polls[name].period = period
+                self._replan()
+
+    def plan(self):
+        """[(name, requested_s, effective_s)] by priority, for display."""
+        with self._lock:
+            polls = sorted(self._polls.values(), key=lambda p: -p.priority)
+            return [(p.name, p.period, p.effective) for p in polls]
+
+    def hold(self, seconds):
+        """Keep polls off the bus for a while (e.g. while the rig settles)."""
+        self._hold_until = max(self._hold_until, time.monotonic() + seconds)
+
+    def account(self, total_bytes):
+        """Charge whatever the link moved since the last call."""
+        used = total_bytes - self._seen
+        self._seen = total_bytes
+        with self._lock:
+            self._refill(time.monotonic())
+            # A long user job can't starve the polls for longer than one burst
+            self._tokens = max(self._tokens - used, -self._burst)
+
+    def take_due(self):
+        """The highest-priority poll that is due and fits the budget, or None."""
+        now = time.monotonic()
+        if now < self._hold_until:
+            return None
+        with self._lock:
+            self._refill(now)
+            best = None
+            for p in self._polls.values():
+                if p.due > now:
+                    continue
+                if p.when is not None and not p.when():
+                    p.due = now + p.effective
+                    continue
+                if p.metered and self._tokens < p.cost:
+                    continue
+                if best is None or p.priority > best.priority:
+                    best = p
+            if best is None:
+                return None
+            best.due = now + best.effective
+            return best
+
+    def wait_time(self):
+        """Seconds until the next poll could run (capped at IDLE_WAIT)."""
+        now = time.monotonic()
+        with self._lock:
+            wait = self.IDLE_WAIT
+            metered = [p.due for p in self._polls.values() if p.metered]
+            if metered:
+                wait = min(wait, max(0.0, min(metered) - now))
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self._rate)
+            unmetered = [p.due for p in self._polls.values() if not p.metered]
+            if unmetered:
+                wait = min(wait, max(0.0, min(unmetered) - now))
+            wait = max(wait, self._hold_until - now)
+        return min(max(wait, 0.0), self.IDLE_WAIT)
+
+    def _refill(self, now):
+        self._tokens = min(self._burst, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+
+    def _replan(self):
+        for p in self._polls.values():
+            p.effective = p.period
+        # Burst must cover the biggest poll or it could never run
+        self._burst = max([self._rate * 0.25] + [p.cost for p in self._polls.values()])
+        polls = sorted((p for p in self._polls.values() if not p.background), key=lambda p: p.priority)
+        excess = sum(p.cost / p.period for p in polls) - self._rate
+        for p in polls:            # lowest priority gives way first
+            if excess <= 0:
+                break
+            share = p.cost / p.period
+            floor = share / self.MAX_STRETCH
+            cut = min(excess, share - floor)
+            p.effective = p.cost / (share - cut)
+            excess -= cut
+
+
+def job_cause(job):
+    """Trace label for a worker job: the function it was defined in
+    ("FT991AController.activate_preset.<locals>.<lambda>" → "activate_preset")."""
+    func = getattr(job, "func", job)            # functools.partial
+    name = getattr(func, "__qualname__", "") or type(func).__name__
+    outer = name.split(".<locals>")[0]
+    return outer.rsplit(".", 1)[-1] or "job"
+
+
+class CatWorker(QThread):
+    """
+    Owns the serial port. Everything that talks to the radio is queued here as
+    a job and runs on this thread in submit order, so the GUI never blocks on
+    serial I/O. Results come back on the GUI thread via on_done/on_error.
+    """
+    log_line = pyqtSignal(str)        # → CAT terminal
+    activity_line = pyqtSignal(str)   # → Activity Log
+    progress = pyqtSignal(int)        # → progress bar (0..100)
+    unsolicited = pyqtSignal(str)     # → AI1 pushes (FA/IF/MD/MC/TX frames)
+    _deliver = pyqtSignal(object, object)
+
+    def __init__(self, ser, parent=None):
+        super().__init__(parent)
+        self.listen = False   # AI1 on: read the port between jobs, emit pushes
+        self.link = CatLink(ser, self)
+        self.scheduler = CatScheduler(getattr(ser, "baudrate", 0) or 38400)
+        self._jobs = queue.Queue()
+        self._deliver.connect(self._run_callback)
+
+    def submit(self, job, *args, on_done=None, on_error=None, cause=None) -> Future:
+        """Queue job(link, *args). Returns a Future; callbacks run on the GUI thread.
+        cause labels its traffic in the trace; by default the function that built job."""
+        fut = Future()
+        self._jobs.put((fut, job, args, on_done, on_error, cause or job_cause(job)))
+        return fut
+
+    def is_open(self):
+        return self.isRunning() and self.link.is_open
+
+    STOP_GRACE_MS = 2000   # a job still running this long after stop() gets its port closed
+
+    def stop(self):
+        """Drop queued jobs and let the current one finish; returns at once.
+        The thread closes the port on its way out, then finished fires."""
+        while True:
+            try:
+                item = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        self._jobs.put(None)
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(self._unstick)
+        timer.start(self.STOP_GRACE_MS)
+
+    def join(self, wait_ms=STOP_GRACE_MS):
+        """Block until the thread is gone (only when the app is closing)."""
+        if not self.wait(wait_ms):
+            self._unstick()
+            self.wait(wait_ms)
+
+    def _unstick(self):
+        # Stuck in a long job or read; closing the port from here ends it
+        if self.isRunning():
+            try:
+                self.link.ser.close()
+            except Exception:
+                pass
 
-# ▶️ SSB FILTER CONTROLS (Expanded with 9 sliders + toggles)
-        self.ssb_sliders = {}
-        self.ssb_toggles = {}
+    def run(self):
+        link, sched = self.link, self.scheduler
+        while True:
+            sched.account(link.traffic)
+            try:
+                item = self._jobs.get_nowait()
+            except queue.Empty:
+                # Idle: periodic polls first, then AI1 pushes / wait for a job
+                poll = sched.take_due()
+                if poll is not None:
+                    self._execute(poll.job, (), None, poll.on_done, poll.on_error, "poll:" + poll.name)
+                    continue
+                if self.listen:
+                    self._read_push()
+                    continue
+                try:
+                    item = self._jobs.get(timeout=sched.wait_time())
+                except queue.Empty:
+                    continue
+            if item is None:
+                break
+            fut, job, args, on_done, on_error, cause = item
+            if fut.set_running_or_notify_cancel():
+                self._execute(job, args, fut, on_done, on_error, cause)
 
-        ssb_filter_group = QGroupBox("🎚️ SSB Filters", self.main_tab)
-        ssb_filter_group.setGeometry(20, 800, 1060, 320)
-        ssb_filter_group.setStyleSheet("""
-            QGroupBox {
-                color: #a0c4ff;
-                font-weight: bold;
-                font-size: 13px;
-                border: 2px solid #1e3a5f;
-                border-radius: 10px;
-                margin-top: 12px;
-                padding-top: 10px;
-                background: #0d2137;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px;
-                background: #0d2137;
-            }
-        """)
+        # Leave the rig quiet for whoever opens the port next
+        if self.listen:
+            try:
+                self.link.write("AI0;")
+            except Exception:
+                pass
+        try:
+            self.link.ser.close()
+        except Exception:
+            pass
 
-        grid = QGridLayout()
-        grid.setVerticalSpacing(20)
+    def _execute(self, job, args, fut, on_done, on_error, cause):
+        self.link.cause = cause
+        try:
+            result = job(self.link, *args)
+        except Exception as e:
+            if fut is not None:
+                fut.set_exception(e)
+            if on_error:
+                self._deliver.emit(on_error, e)
+        else:
+            if fut is not None:
+                fut.set_result(result)
+            if on_done:
+                self._deliver.emit(on_done, result)
+
+    def _read_push(self):
+        """Pick up whatever the rig pushed (blocks at most one read slice)."""
+        self.link.cause = "push"
+        frame = ""
+        try:
+            if self.link.is_open:
+                frame = self.link.read_frame(0)
+        except Exception:
+            frame = ""  # the health check reports a dead port
+            time.sleep(CatFrameReader.READ_SLICE)
+        if frame:
+            self.link.stray(frame)
+        elif not self.link.is_open:
+            time.sleep(CatFrameReader.READ_SLICE)
+
+    def _run_callback(self, callback, value):
+        callback(value)
+
+
+# CAT RATE choices (menu 031), fastest first, and the FT-991A's ID; answer
+CAT_BAUD_RATES = (38400, 19200, 9600, 4800)
+FT991A_ID = "0570"
+
+
+def line_level(mode):
+    """Idle DTR/RTS level for a settings mode ("Off", "On", "High=TX", "Low=TX")."""
+    return mode in ("On", "Low=TX")
+
+
+def probe_port(port, baud, dtr=False, rts=True, timeout_sec=0.15):
+    """Open port at baud, send ID; and return the ID reply (e.g. "ID0570;") or ""."""
+    ser = serial.Serial()
+    ser.port, ser.baudrate, ser.write_timeout = port, baud, 0.2
+    ser.dtr, ser.rts = dtr, rts     # set before open(), so probing never keys the rig
+    try:
+        ser.open()
+        ser.reset_input_buffer()
+        ser.write(b";ID;")          # the leading ';' ends any half-received command
+        reader = CatFrameReader(ser)
+        deadline = time.monotonic() + timeout_sec
+        while True:
+            frame = reader.read_frame(max(0.0, deadline - time.monotonic()))
+            if not frame or frame.startswith("ID"):
+                return frame
+    except Exception:
+        return ""
+    finally:
+        try:
+            ser.close()
+        except Exception:
+            pass
 
-        def make_slider_row(label, min_, max_, default, tooltip=None, show_toggle=False, unit=""):
-            row_widget = QWidget()
-            row_layout = QHBoxLayout(row_widget)
-            row_layout.setContentsMargins(0, 0, 0, 0)
-            row_layout.setSpacing(20)  ### Added more spacing between label/toggle and slider
 
-            toggle = None
-            if show_toggle:
-                toggle = QCheckBox("ON")
-                toggle.setChecked(True)
-                toggle.setStyleSheet("color: #64b5f6")
-                self.ssb_toggles[label] = toggle
+def discover_rig(ports=None, bauds=CAT_BAUD_RATES, dtr=False, rts=True, want=FT991A_ID):
+    """Probe every serial port at once (a thread per port, bauds in turn) with ID;.
 
-            lbl = QLabel(label)
-            lbl.setStyleSheet("color: #a0c4ff")
-            if tooltip:
-                lbl.setToolTip(tooltip)
+    Returns (port, baud, id_reply) for the first port answering want, else the
+    first that answered ID; at all, else None.
+    """
+    if ports is None:
+        ports = [p.device for p in serial.tools.list_ports.comports()]
+    found = []
+    lock = threading.Lock()
+    done = threading.Event()
 
-            slider = QSlider(Qt.Horizontal)
-            slider.setMinimum(min_ // 10)
-            slider.setMaximum(max_ // 10)
-            slider.setValue(default // 10)
-            slider.setFixedWidth(800)  ### Force full-width for all sliders
-            self.ssb_sliders[label] = slider
-
-            value_lbl = QLabel(str(default))
-            value_lbl.setStyleSheet("color: #ffd54f; min-width: 40px")
-
-            unit_lbl = QLabel(unit)
-            unit_lbl.setStyleSheet("color: #a0c4ff")
+    def probe(port):
+        for baud in bauds:
+            if done.is_set():
+                return
+            reply = probe_port(port, baud, dtr, rts)
+            if reply:
+                with lock:
+                    found.append((port, baud, reply))
+                if reply[2:6] == want:
+                    done.set()
+                return
 
-            def update_display_and_send(val):
-                freq = val * 10
-                value_lbl.setText(str(freq))
-                ### Send CAT only if toggle is ON
-                if label == "Contour Freq HZ":
-                    if self.ssb_toggles[label].isChecked():
-                        self.cat_input.setText(f"CO01{freq:04d};")
-                        self.send_cat_command()
-                    else:
-                        self.cat_input.setText("CO000000;")
-                        self.send_cat_command()
+    threads = [threading.Thread(target=probe, args=(port,), daemon=True) for port in ports]
+    for t in threads:
+        t.start()
+    while not done.is_set() and any(t.is_alive() for t in threads):
+        done.wait(0.01)
+    with lock:
+        hits = [f for f in found if f[2][2:6] == want] or found
+        return hits[0] if hits else None
+
+
+class RigFinder(QThread):
+    """Runs discover_rig off the GUI thread; found carries its result."""
+    found = pyqtSignal(object)
+
+    def __init__(self, bauds, dtr, rts, parent=None, ports=None):
+        super().__init__(parent)
+        self.bauds, self.dtr, self.rts, self.ports = bauds, dtr, rts, ports
+
+    def run(self):
+        self.found.emit(discover_rig(self.ports, self.bauds, self.dtr, self.rts))
+
+
+class RadioCache:
+    """
+    On-disk cache of what KAT read from a radio: the memory index and the last
+    menu dump, every row stamped with when it was read. Keyed by the rig's ID;
+    reply plus the port, so two radios never share rows. path=None keeps the
+    rows in memory only.
+    """
+    VERSION = 1
+    MAX_AGE = 7 * 24 * 3600     # rows older than this (s) get re-read
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = Path(path) if path is not None else None
+        self._radios = {}
+        self.load()
+
+    def load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self._radios = data.get("radios", {})
+        except Exception:
+            self._radios = {}   # missing or unreadable: start cold
 
-            if show_toggle and label == "Contour Freq HZ":
-                toggle.stateChanged.connect(lambda _: update_display_and_send(slider.value()))  ### Reapply CAT on toggle change
-                toggle.stateChanged.connect(lambda state: self.cat_input.setText("CO000001;" if state == Qt.Checked else "CO000000;"))  ### Toggle ON/OFF CAT
-                toggle.stateChanged.connect(lambda _: self.send_cat_command())  ### Send CAT immediately on toggle
+    def save(self):
+        if self.path is None:
+            return
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"version": self.VERSION, "radios": self._radios}, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
 
-            slider.valueChanged.connect(update_display_and_send)
+    @staticmethod
+    def key(id_reply, port):
+        return f"{id_reply.rstrip(';')}@{port}"
+
+    def memories(self, key):
+        """{channel: (MemoryEntry, read_at)} for this radio."""
+        rows = self._radios.get(key, {}).get("memories", {})
+        out = {}
+        for ch, (hz, mode, tag, filled, ts) in rows.items():
+            out[int(ch)] = (MemoryEntry(hz, mode, tag, filled), ts)
+        return out
+
+    def put_memories(self, key, entries, ts=None):
+        ts = ts or time.time()
+        rows = self._radios.setdefault(key, {}).setdefault("memories", {})
+        for ch, e in entries.items():
+            rows[f"{ch:03d}"] = [e.hz, e.mode, e.tag, e.filled, ts]
+
+    def menus(self, key):
+        """{menu_number: (value, read_at)} from the last dump or write."""
+        rows = self._radios.get(key, {}).get("menus", {})
+        return {num: (val, ts) for num, (val, ts) in rows.items()}
+
+    def put_menus(self, key, values, ts=None):
+        ts = ts or time.time()
+        rows = self._radios.setdefault(key, {}).setdefault("menus", {})
+        for num, val in values.items():
+            rows[num] = [val, ts]
+
+
+# A parsed menu preset: ordered (menu, value) pairs and their EX commands, pre-encoded
+Preset = collections.namedtuple("Preset", "path mtime items commands")
+
+
+class PresetCache:
+    """
+    Presets from presets/*.xml, parsed and validated once. An entry is reused
+    while the file's mtime is unchanged; a file watcher re-parses edited files
+    on a background thread as soon as they are saved and swaps the result in,
+    so neither the save nor a button click waits on ET.parse.
+    """
+
+    def __init__(self, directory=PRESETS_DIR):
+        self.directory = Path(directory)
+        self._presets = {}
+        self._errors = {}
+        self.watcher = QFileSystemWatcher()
+        self.watcher.fileChanged.connect(self._file_changed)
+        self.watcher.directoryChanged.connect(self._directory_changed)
+
+    def preload(self):
+        """Parse every preset in the directory (new or changed ones only) and watch them."""
+        if self.directory.is_dir() and str(self.directory) not in self.watcher.directories():
+            self.watcher.addPath(str(self.directory))
+        errors = {}
+        for path in sorted(self.directory.glob("*.xml")):
+            try:
+                self.get(path)
+            except Exception as e:
+                errors[path.name] = str(e)    # refused again (with a dialog) if used
+        return errors
+
+    def get(self, file):
+        """The Preset for file, parsing it only if new or modified. Raises ValueError."""
+        path = Path(file).resolve()
+        mtime = path.stat().st_mtime_ns
+        preset = self._presets.get(path)
+        if preset is None or preset.mtime != mtime:
+            try:
+                preset = self.parse(path, mtime)
+            except Exception as e:
+                self._presets.pop(path, None)
+                raise ValueError(f"{path.name}: {e}") from e
+            self._presets[path] = preset
+            if str(path) not in self.watcher.files():
+                self.watcher.addPath(str(path))
+        return preset
 
-            row_layout.addWidget(lbl)
-            if toggle:
-                row_layout.addWidget(toggle)
-            row_layout.addWidget(slider)
-            row_layout.addWidget(value_lbl)  ### Value right after slider
-            row_layout.addWidget(unit_lbl)   ### Then unit
+    @staticmethod
+    def parse(path, mtime):
+        """Lint every entry against MENU_SCHEMA; any bad one rejects the whole preset."""
+        items, problems = [], []
+        for item in ET.parse(path).getroot().findall("YaesuFT991A_MenuItems"):
+            num = (item.findtext("MENU_NUMBER") or "").strip().zfill(3)
+            try:
+                items.append((num, encode_menu_value(num, item.findtext("MENU_VALUE") or "")))
+            except ValueError as e:
+                problems.append(str(e))
+        if problems:
+            more = f" (+{len(problems) - 3} more)" if len(problems) > 3 else ""
+            raise ValueError("; ".join(problems[:3]) + more)
+        commands = tuple(f"EX{num}{val};".encode("ascii") for num, val in items)
+        return Preset(path, mtime, tuple(items), commands)
+
+    def _file_changed(self, path):
+        path = Path(path)
+        if not path.exists():
+            self._presets.pop(path, None)
+            return
+        # Editors that save by rename drop the file from the watch list: re-add it
+        if str(path) not in self.watcher.files():
+            self.watcher.addPath(str(path))
+        self._reload([path])
+
+    def _directory_changed(self, _):
+        paths = [p.resolve() for p in sorted(self.directory.glob("*.xml"))]
+        for path in paths:
+            if str(path) not in self.watcher.files():
+                self.watcher.addPath(str(path))
+        self._reload(paths)
+
+    def _reload(self, paths):
+        """Re-parse new or changed paths on a worker thread; each result replaces
+        its entry when ready. A bad file is dropped, so get() reports it if used."""
+        def run():
+            for path in paths:
+                try:
+                    mtime = path.stat().st_mtime_ns
+                    old = self._presets.get(path)
+                    if old is None or old.mtime != mtime:
+                        self._presets[path] = self.parse(path, mtime)
+                except Exception:
+                    self._presets.pop(path, None)
+
+        threading.Thread(target=run, name="PresetCache", daemon=True).start()
+
+
+# One operating-mode button from operating_modes.json (memory None = VFO)
+OperatingMode = collections.namedtuple(
+    "OperatingMode", "name label title icon menus memory mode row width style note")
+
+# What the worker runs for an OperatingMode: menu diff, landing, mode
+PresetPlan = collections.namedtuple("PresetPlan", "menus commands memory mode")
+
+
+def load_operating_modes(path=OPERATING_MODES_FILE):
+    """[OperatingMode] from operating_modes.json, in button order. Raises ValueError."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    mode_chars = {name: char for char, name in CAT_MODE_NAMES.items()}
+    modes = []
+    for entry in data.get("modes", []):
+        name = entry.get("name")
+        if not name or any(m.name == name for m in modes):
+            raise ValueError(f"missing or duplicate mode name {name!r}")
+        memory = entry.get("memory")
+        if entry.get("vfo"):
+            memory = None
+        elif memory not in MEMORY_CHANNELS:
+            raise ValueError(f"{name}: needs \"memory\" (1-{MEMORY_CHANNELS[-1]}) or \"vfo\": true")
+        mode = entry.get("mode")
+        if mode is not None and mode not in mode_chars:
+            raise ValueError(f"{name}: unknown mode {mode!r}")
+        modes.append(OperatingMode(
+            name, entry.get("label", name), entry.get("title", entry.get("label", name)),
+            entry.get("icon", "🎛️"), entry.get("menus"), memory, mode_chars.get(mode),
+            int(entry.get("row", 1)), int(entry.get("width", 80)),
+            entry.get("style", "blue"), entry.get("note")))
+    return modes
 
-            return row_widget
 
-        # Contour Freq slider (Full-length)
-        contour_row = make_slider_row("Contour Freq HZ", 10, 3200, 300, "Menu: CO (Contour)", show_toggle=True)
-        grid.addWidget(contour_row, 0, 0, 1, 3)
+class FT991AController(QWidget):
+    # Rig coverage clamps (used by _clip_rig_range)
+    RIG_MIN_HZ = 3_000_000
+    RIG_MAX_HZ = 470_000_000
 
-        # Contour Width slider (Full-length)
-        contour_width_row = make_slider_row("Contour Width", 10, 110, 50, "Menu: EX113", show_toggle=False, unit="")
-        contour_width_row.findChildren(QSlider)[0].setFixedWidth(800)  ### Match length
-        grid.addWidget(contour_width_row, 1, 0, 1, 3)
+    # Serial/CAT defaults
+    BAUD = 38400
+    SERIAL_TIMEOUT = 0.6         # read timeout (s)
+    SERIAL_WRITE_TIMEOUT = 0.6   # write timeout (s)
 
-        # Contour Level slider (Full-length)
-        contour_level_row = make_slider_row("Contour Level", -400, 200, 0, "Menu: EX112", show_toggle=False, unit="dB")
-        contour_level_row.findChildren(QSlider)[0].setFixedWidth(800)  ### Match length
-        grid.addWidget(contour_level_row, 2, 0, 1, 3)
+    # Polling intervals (ms) and the share of the link polls may use (%)
+    FREQ_POLL_MS = 500      # IF; → frequency, channel info
+    METER_POLL_MS = 400     # RM1; + RM5; together → S/PWR meters, TX LED
+    HEALTH_POLL_MS = 500    # liveness from poll replies; ID; only when the bus is idle
+    POLL_BUDGET_PCT = 50
 
-        # Placeholders for remaining sliders (basic, no scaling or toggles yet)
-        width_row = make_slider_row("Width", 0, 4, 2, "Menu: EX110", show_toggle=False, unit="")
-        shift_row = make_slider_row("Shift", -1200, 1200, 0, "Menu: IS", show_toggle=False, unit="Hz")
-        nb_row = make_slider_row("NB Width", 0, 10, 2, "Menu: NB/NL", show_toggle=True, unit="")
-        dnr_row = make_slider_row("DNR Level", 1, 15, 5, "Menu: NR/RL", show_toggle=True, unit="")
-        notch_row = make_slider_row("Notch Width", 0, 3200, 1500, "Menu: BP", show_toggle=True, unit="Hz")
-        apf_row = make_slider_row("APF Width", 0, 2, 1, "Menu: CO (APF)", show_toggle=True, unit="")
+    def __init__(self, persist=True):
+        """persist=False (cat_replay.py, cat_bench.py) leaves the user's files
+        alone: kat_settings.json isn't loaded, so "Record traffic" stays off,
+        and the radio cache is kept in memory only."""
+        super().__init__()
+        self.setWindowTitle("FT-991A Preset Control Panel")
+        self.setFixedSize(1200, 1200)
 
-        grid.addWidget(width_row, 3, 0, 1, 3)
-        grid.addWidget(shift_row, 4, 0, 1, 3)
-        grid.addWidget(nb_row, 5, 0, 1, 3)
-        grid.addWidget(dnr_row, 6, 0, 1, 3)
-        grid.addWidget(notch_row, 7, 0, 1, 3)
-        grid.addWidget(apf_row, 8, 0, 1, 3)
+        # Serial (the CatWorker thread owns the port; see connect_to_radio)
+        self.cat_worker = None
+        self._polls_in_flight = set()    # poll names queued but not answered yet
+        self.rig_state = RigState()      # last IF; decode; every display reads this
+        self._memory_tags = {}           # memory channel → tag ("" = none), from MTnnn;
+        self.memory_index = {}           # memory channel → MemoryEntry (background MT scan)
+        self._memory_index_ready = False
+        # kat_cache.json: memory index + menus per radio
+        self.radio_cache = RadioCache() if persist else RadioCache(None)
+        self._finder = None              # RigFinder while find_radio is probing
+        self._closing_workers = []       # stopped CatWorkers still closing their port
+        self._after_port_closed = []     # callbacks for when they have
+        self.cat_recorder = None         # CatRecorder while "Record traffic" is ticked
+        # Auto-reconnect: (port, baud) to reopen, attempt count, backoff timer
+        self._link_params = None
+        self._reconnect_target = None
+        self._reconnect_attempt = 0
+        self._reconnect_timer = QTimer(self)
+        self._reconnect_timer.setSingleShot(True)
+        self._reconnect_timer.timeout.connect(self._try_reconnect)
+        self.preset_cache = PresetCache()
+        QTimer.singleShot(0, self._lint_presets)
+        self._cache_key = None           # "ID0570@COM5" once the connected rig answered ID;
+        self._known_menus = {}           # menu → value: cache rows checked on connect, or read/written since
+        self._cache_save_timer = QTimer(self)
+        self._cache_save_timer.setSingleShot(True)
+        self._cache_save_timer.timeout.connect(lambda: self.radio_cache.save())
 
+        # UI/State
+        self.current_memory = 1
 
-        ssb_filter_group.setLayout(grid)
 
+# ➡ Tabs (fixed style and layout-safe)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
 
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
 
+        self.tabs.setStyleSheet("""
+            QTabWidget::pane {
+                border: 1px solid #1e3a5f;
+                background: #0d2137;
+                border-radius: 6px;
+            }
+            QTabBar::tab {
+                background: #0d2137;
+                color: #607d8b;
+                padding: 8px 20px;
+                margin-right: 2px;
+                border-top-left-radius: 6px;
+                border-top-right-radius: 6px;
+                font-weight: bold;
+            }
+            QTabBar::tab:selected {
+                background: #1a3a5c;
+                color: #64b5f6;
+                border-bottom: 2px solid #42a5f5;
+            }
+            QTabBar::tab:hover:!selected {
+                background: #152a40;
+                color: #90caf9;
+            }
+        """)
 
-# CAT tab
-        cat_layout = QVBoxLayout()
-        self.cat_input = QLineEdit()
-        self.cat_input.setPlaceholderText("Enter CAT command (e.g., FA;)")
-        cat_layout.addWidget(self.cat_input)
 
-        self.cat_send_btn = QPushButton("Send CAT Command")
-        self.cat_send_btn.clicked.connect(self.send_cat_command)
-        cat_layout.addWidget(self.cat_send_btn)
 
-        self.cat_response_display = QTextEdit()
-        self.cat_response_display.setReadOnly(True)
-        self.cat_response_display.setStyleSheet("background-color: #0a1628; color: #7fff7f; font-family: Consolas; border: 1px solid #1e3a5f; border-radius: 6px;")
-        cat_layout.addWidget(self.cat_response_display)
-        self.cat_tab.setLayout(cat_layout)
+        self.main_tab = QWidget()
+        self.cat_tab = QWidget()
+        self.settings_tab = QWidget()
+        self.info_tab = QWidget()
+        self.tabs.addTab(self.main_tab, "📻 Menu Reader")
+        self.tabs.addTab(self.cat_tab, "🖥️ CAT Terminal")
+        self.tabs.addTab(self.settings_tab, "⚙️ Settings")
+        self.tabs.addTab(self.info_tab, "ℹ️ Info")
         
-        # Load saved settings (now that all UI is built)
-        self.load_settings()
-
-##############################################################################
-################################# FUNCTIONS ##################################
-##############################################################################
-
+        # Build settings tab
+        self._build_settings_tab()
+        
+        # Build info tab
+        self._build_info_tab()
 
-# inside class FT991AController, after the CAT tab code and before other funcs
 
-    
+##gradient
+        palette = QPalette()
+        gradient = QLinearGradient(0, 0, 0, self.height())
+        gradient.setColorAt(0.0, QColor(13, 33, 55))
+        gradient.setColorAt(1.0, QColor(5, 15, 30))
+        palette.setBrush(QPalette.Window, QBrush(gradient))
+        self.setAutoFillBackground(True)
+        self.setPalette(palette)
 
+        self.main_tab.setGeometry(0, 0, 1200, 1000)
 
-    def _ensure_vfo(self, attempts: int = 4, check_delay: float = 0.16) -> bool:
-        """
-        Force VFO (not Memory) and confirm with MC; (MC000; means VFO).
-        Retries a few times with small back-off. Returns True if confirmed.
+        # Common GroupBox style
+        groupbox_style = """
+            QGroupBox {
+                color: #a0c4ff;
+                font-weight: bold;
+                font-size: 13px;
+                border: 2px solid #1e3a5f;
+                border-radius: 10px;
+                margin-top: 12px;
+                padding-top: 10px;
+                background: #0d2137;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                left: 15px;
+                padding: 0 10px;
+                background: #0d2137;
+            }
         """
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return False
-
-        ser = self.serial_conn
-
-        def mc_is_vfo(s: str) -> bool:
-            return s.startswith("MC") and len(s) >= 5 and s[2:5].isdigit() and s[2:5] == "000"
-
-        for i in range(attempts):
-            try:
-                # 1) Where are we now?
-                ser.reset_input_buffer(); ser.reset_output_buffer()
-                ser.write(b"MC;")
-                resp = self.read_until_semicolon()
-                if resp:
-                    self.cat_response_display.append(f">> MC;\n<< {resp}")
-                if mc_is_vfo(resp):
-                    return True  # already VFO
 
-                # 2) Not VFO → force it
-                ser.reset_input_buffer()
-                ser.write(b"VM0;")  # 0 = VFO, 1 = Memory
-                # Optional memory-tune off (ignored if unsupported)
-                try:
-                    ser.write(b"MT0;")
-                except Exception:
-                    pass
-
-                # 3) Re-check after a short delay (slightly longer each try)
-                time.sleep(check_delay + 0.06 * i)
-                ser.reset_input_buffer()
-                ser.write(b"MC;")
-                resp2 = self.read_until_semicolon()
-                if resp2:
-                    self.cat_response_display.append(f">> MC;\n<< {resp2}")
-                if mc_is_vfo(resp2):
-                    return True
-
-            except Exception as e:
-                self.cat_response_display.append(f"[ensure_vfo error] {e}")
-                # loop and retry
-
-        return False
-
-##Update meters:
-    def start_meter_polling(self, interval_ms: int = 200):
-        """Start (or restart) S-meter / PWR polling."""
-        t = getattr(self, "meter_timer", None)
-        if t is None:
-            self.meter_timer = QTimer(self)
-            self.meter_timer.setTimerType(Qt.CoarseTimer)
-            self.meter_timer.timeout.connect(self.update_meters)
-            self._meter_toggle = False  # False=S-meter, True=PWR
-
-        self.meter_timer.stop()
-        self.meter_timer.start(interval_ms)
-        QTimer.singleShot(0, self.update_meters)
-
-    def update_meters(self):
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return
-        # Avoid clobbering other CAT ops (e.g., right after FA writes)
-        if hasattr(self, "_poll_inhibit_until") and time.time() < getattr(self, "_poll_inhibit_until"):
-            return
-
-        try:
-            # Flip between S and PWR each tick
-            self._meter_toggle = not getattr(self, "_meter_toggle", False)
-
-            if self._meter_toggle:
-                # --- PWR meter (RM5)
-                resp = self._cat("RM5;")
-                # Response format: RM5NNN; where NNN is 000-255
-                if resp.startswith('RM5'):
-                    num_part = resp[3:].rstrip(';')
-                    if num_part.isdigit():
-                        raw = int(num_part)  # 0..255 from radio
-                        # PWR: direct percentage scaling
-                        val = max(0, min(100, int(round(raw * 100 / 255))))
-                        self.pwr_meter.set_value(val)
-            else:
-                # --- S meter (RM1)
-                resp = self._cat("RM1;")
-                # Response format: RM1NNN; where NNN is 000-255
-                if resp.startswith('RM1'):
-                    num_part = resp[3:].rstrip(';')
-                    if num_part.isdigit():
-                        raw = int(num_part)  # 0..255 from radio
-                        # FT-991A S-meter scaling:
-                        # Raw 0-128 = S0-S9 (0-50% of our display)
-                        # Raw 128-255 = S9 to S9+60dB (50-100% of our display)
-                        if raw <= 128:
-                            # S0 to S9 range - map to 0-50%
-                            val = int(round(raw * 50 / 128))
-                        else:
-                            # S9+ range - map to 50-100%
-                            val = 50 + int(round((raw - 128) * 50 / 127))
-                        val = max(0, min(100, val))
-                        self.s_meter.set_value(val)
-
-        except Exception:
-            pass
-
-    def stop_meter_polling(self):
-        t = getattr(self, "meter_timer", None)
-        if t and t.isActive():
-            t.stop()
-
-    ###memrecall:
-    def recall_memory_channel(self, channel) -> bool:
-        """Recall a memory channel (1..124). Returns True on confirm, else False."""
-        if not (self.serial_conn and self.serial_conn.is_open):
-            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
-            return False
+        # ========== CONNECTION GROUP (top left) ==========
+        conn_group = QGroupBox("🔌 Connection", self.main_tab)
+        conn_group.setGeometry(15, 10, 320, 90)
+        conn_group.setStyleSheet(groupbox_style)
+        
+        self.connect_btn = QPushButton("Connect", conn_group)
+        self.connect_btn.setGeometry(15, 35, 130, 40)
+        self.connect_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2e7d32; color: white; font-weight: bold;
+                border-radius: 8px; border: 2px solid #4caf50; font-size: 13px;
+            }
+            QPushButton:hover { background-color: #43a047; }
+        """)
+        self.connect_btn.clicked.connect(self.connect_to_radio)
+        
+        self.disconnect_btn = QPushButton("Disconnect", conn_group)
+        self.disconnect_btn.setGeometry(155, 35, 130, 40)
+        self.disconnect_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #c62828; color: white; font-weight: bold;
+                border-radius: 8px; border: 2px solid #ef5350; font-size: 13px;
+            }
+            QPushButton:hover { background-color: #e53935; }
+        """)
+        self.disconnect_btn.clicked.connect(self.disconnect_from_radio)
 
-        # Normalize & validate channel
-        try:
-            ch_int = int(str(channel).strip())
-        except Exception:
-            QMessageBox.warning(self, "Warning", f"Invalid memory '{channel}'.")
-            return False
-        if not (1 <= ch_int <= 124):     # <-- adjust hi to your actual max memories
-            QMessageBox.warning(self, "Warning", f"Memory {ch_int:03d} out of range.")
-            return False
-        ch = f"{ch_int:03d}"
+        # TX LED (next to connection group)
+        self.tx_led = LEDIndicator(diameter=20, label_text="TX")
+        self.tx_led.setParent(self.main_tab)
+        self.tx_led.setGeometry(345, 50, 80, 35)
 
-        try:
-            ser = self.serial_conn
+        # ========== METERS GROUP ==========
+        meters_group = QGroupBox("📊 Signal Meters", self.main_tab)
+        meters_group.setGeometry(620, 580, 570, 170)
+        meters_group.setStyleSheet(groupbox_style)
 
-            # Enter Memory mode (no toggle)
-            ser.reset_input_buffer()
-            ser.write(b'VM1;')
-            time.sleep(0.12)
+        s_meter_scale = [
+            (0, "1"), (10, "3"), (20, "5"), (30, "7"), (40, "9"),
+            (55, "+10"), (70, "+20"), (85, "+30"), (100, "+60")
+        ]
+        self.s_meter = RetroBarMeter("S-METER", s_meter_scale)
+        self.s_meter.setParent(meters_group)
+        self.s_meter.setGeometry(10, 30, 420, 28)
+        
+        self.s_meter_label = QLabel("S-METER", meters_group)
+        self.s_meter_label.setGeometry(520, 30, 50, 20)
+        self.s_meter_label.setStyleSheet("color: #64b5f6; font-weight: bold; font-size: 10px;")
 
-            # Avoid races with other polling for a moment
-            self._poll_inhibit_until = time.time() + 0.4
+        pwr_meter_scale = [
+            (0, "0"), (17, "25"), (33, "50"), (50, "75"),
+            (67, "100"), (83, "125"), (100, "150")
+        ]
+        self.pwr_meter = RetroBarMeter("PWR METER", pwr_meter_scale)
+        self.pwr_meter.setParent(meters_group)
+        self.pwr_meter.setGeometry(10, 85, 420, 20)
+        
+        self.pwr_meter_label = QLabel("PWR", meters_group)
+        self.pwr_meter_label.setGeometry(520, 65, 70, 28)
+        self.pwr_meter_label.setStyleSheet("color: #64b5f6; font-weight: bold; font-size: 10px;")
 
-            # Recall the requested memory
-            ser.reset_input_buffer()
-            ser.write(f'MC{ch};'.encode('ascii'))
-            self.cat_response_display.append(f">> MC{ch};")
 
-            time.sleep(0.15)
+        # ========== FREQUENCY DISPLAY GROUP (right side) ==========
+        freq_group = QGroupBox("📻 Frequency", self.main_tab)
+        freq_group.setGeometry(620, 10, 560, 160)
+        freq_group.setStyleSheet(groupbox_style)
+        
+        self.freq_display = FrequencyDisplayLabel(self, freq_group, self.adjust_frequency)
+        self.freq_display.setGeometry(15, 25, 460, 70)
+        freq_font = QFont("Digital-7 Mono", 38, QFont.Bold)
+        self.freq_display.setFont(freq_font)
+        self.freq_display.setStyleSheet("""
+            color: #64b5f6;
+            background-color: #0a1929;
+            border: 2px solid #1e3a5f;
+            border-radius: 10px;
+        """)
+        self.freq_display.setAlignment(Qt.AlignCenter)
 
-            # Confirm where we actually landed
-            ser.reset_input_buffer()
-            ser.write(b'MC;')
-            resp = self.read_until_semicolon()
-            self.cat_response_display.append(f">> MC;\n<< {resp}")
-
-            actual = ch
-            ok = False
-            if resp.startswith('MC') and len(resp) >= 5 and resp[2:5].isdigit():
-                actual = resp[2:5]
-                ok = (actual == ch)
-
-            # Try to show the tag (if your rig/CAT supports MTnnn;)
-            tag = None
-            try:
-                tag = self.read_memory_tag(int(actual))
-            except Exception:
-                pass
+        # Channel info label (shows memory channel number and tag/name)
+        self.channel_info_label = QLabel("", freq_group)
+        self.channel_info_label.setGeometry(15, 100, 460, 28)
+        self.channel_info_label.setStyleSheet("""
+            color: #ffd54f;
+            background-color: #0a1929;
+            border: 1px solid #1e3a5f;
+            border-radius: 5px;
+            padding-left: 8px;
+            font-size: 14px;
+            font-weight: bold;
+        """)
+        self.channel_info_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
 
-            nice = f"Memory {actual}" + (f" — {tag}" if tag else "")
-            self.text_display.append(f"🔁 Recalled {nice}")
-            self.status_label.setText(f"{nice} Active")
+        # +/- buttons inside freq group
+        self.mem_plus_btn = QPushButton("+", freq_group)
+        self.mem_plus_btn.setGeometry(490, 25, 50, 48)
+        self.mem_plus_btn.setStyleSheet("background-color: #1976d2; color: white; font-weight: bold; font-size: 24px; border-radius: 8px; border: 2px solid #42a5f5;")
+        self.mem_plus_btn.clicked.connect(lambda: self.change_memory_channel(1))
 
-            # Refresh the big frequency display after things settle
-            QTimer.singleShot(350, self.update_frequency_display)
+        self.mem_minus_btn = QPushButton("-", freq_group)
+        self.mem_minus_btn.setGeometry(490, 80, 50, 48)
+        self.mem_minus_btn.setStyleSheet("background-color: #1976d2; color: white; font-weight: bold; font-size: 24px; border-radius: 8px; border: 2px solid #42a5f5;")
+        self.mem_minus_btn.clicked.connect(lambda: self.change_memory_channel(-1))
 
-            return ok
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to recall memory channel {ch}:\n{e}")
-            return False
+        # ========== SIMPLEX FREQUENCIES GROUP ==========
+        simplex_group = QGroupBox("📡 Simplex Frequencies", self.main_tab)
+        simplex_group.setGeometry(15, 220, 490, 80)
+        simplex_group.setStyleSheet(groupbox_style)
 
+        btn_style_cyan = """
+            QPushButton {
+                background-color: #0277bd; color: white; font-weight: bold;
+                border-radius: 6px; font-size: 10px; border: 1px solid #0288d1;
+            }
+            QPushButton:hover { background-color: #0288d1; }
+        """
 
-#CAT RETURN mesg
-    def read_until_semicolon(self, timeout_sec=0.5):
-        """Read bytes from serial until ';' terminator or timeout."""
-        response = b""
-        timeout = time.time() + timeout_sec
-        while time.time() < timeout:
-            if not (self.serial_conn and self.serial_conn.is_open):
-                break
-            part = self.serial_conn.read(1)
-            if part:
-                response += part
-                if part == b';':
-                    break
-        return response.decode('ascii', errors='ignore').strip()
+        self.btn_mem_059 = QPushButton("144.420 M059", simplex_group)
+        self.btn_mem_059.setGeometry(10, 35, 110, 32)
+        self.btn_mem_059.setStyleSheet(btn_style_cyan)
+        self.btn_mem_059.clicked.connect(lambda: self.recall_memory_channel("059"))
 
-    def _cat(self, cmd, timeout_sec=0.5):
-        """Thread-safe CAT command helper. Send cmd, return response string.
-        
-        Args:
-            cmd: Command string (e.g. "FA;" or "MC059;") - semicolon required
-            timeout_sec: Read timeout in seconds
-            
-        Returns:
-            Response string (e.g. "FA014250000;") or "" on error/timeout
-        """
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return ""
-        
-        with self._cat_lock:
-            try:
-                self.serial_conn.reset_input_buffer()
-                if isinstance(cmd, str):
-                    cmd = cmd.encode('ascii')
-                self.serial_conn.write(cmd)
-                return self.read_until_semicolon(timeout_sec)
-            except Exception:
-                return ""
-    
-        # --- frequency helpers (needed by set_simplex, update_frequency_display, etc.) ---
-    def _clip_rig_range(self, hz):
-        """Clamp a frequency (Hz) to the rig's safe range."""
-        try:
-            hz = int(hz)
-        except Exception:
-            return None
-        return max(self.RIG_MIN_HZ, min(self.RIG_MAX_HZ, hz))
+        self.btn_mem_060 = QPushButton("446.000 M060", simplex_group)
+        self.btn_mem_060.setGeometry(125, 35, 110, 32)
+        self.btn_mem_060.setStyleSheet(btn_style_cyan)
+        self.btn_mem_060.clicked.connect(lambda: self.recall_memory_channel("060"))
 
-    def _format_hz_for_display(self, hz):
-        """Return 'MMM.KKK.HHH' display text from an integer Hz."""
-        if hz is None:
-            return "---.---.---"
-        mhz = hz // 1_000_000
-        khz = (hz // 1_000) % 1000
-        rhz = hz % 1000
-        return f"{mhz}.{khz:03d}.{rhz:03d}"
+        self.btn_mem_061 = QPushButton("145.600 M061", simplex_group)
+        self.btn_mem_061.setGeometry(240, 35, 110, 32)
+        self.btn_mem_061.setStyleSheet(btn_style_cyan)
+        self.btn_mem_061.clicked.connect(lambda: self.recall_memory_channel("061"))
 
-    def _read_fa_hz(self):
-        """Query FA; and return an int Hz (11 digits). None if bad/timeout."""
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return None
-        try:
-            resp = self._cat("FA;")
-            if not (resp.startswith("FA") and resp.endswith(";")):
-                return None
-            digits = "".join(ch for ch in resp[2:-1] if ch.isdigit())
-            if not digits:
-                return None
-            hz = int(digits[-11:].rjust(11, "0"))
-            return self._clip_rig_range(hz)
-        except Exception:
-            return None
+        self.btn_mem_062 = QPushButton("433.500 M062", simplex_group)
+        self.btn_mem_062.setGeometry(355, 35, 110, 32)
+        self.btn_mem_062.setStyleSheet(btn_style_cyan)
+        self.btn_mem_062.clicked.connect(lambda: self.recall_memory_channel("062"))
 
-    def _read_memory_channel_info(self):
-        """Query MC; to get current memory channel, then MT; to get the tag/name.
-        Returns tuple (channel_num, tag_string, mode_str) or (None, None, None)."""
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return None, None, None
-        try:
-            # Get current memory channel with MC;
-            mc_resp = self._cat("MC;")
-            
-            if not (mc_resp.startswith("MC") and len(mc_resp) >= 6):
-                return None, None, None
-            
-            # MC response: MC001; to MC117; (or MC000; for VFO)
-            channel_str = mc_resp[2:5]
-            
-            try:
-                channel_num = int(channel_str)
-            except ValueError:
-                return None, None, None
-            
-            # If channel 000, we're in VFO mode
-            if channel_num == 0:
-                # Get mode from MD;
-                md_resp = self._cat("MD0;")
-                mode_char = md_resp[3] if len(md_resp) >= 5 else '?'
-                mode_map = {
-                    '1': 'LSB', '2': 'USB', '3': 'CW', '4': 'FM', '5': 'AM',
-                    '6': 'RTTY-L', '7': 'CW-R', '8': 'DATA-L', '9': 'RTTY-U',
-                    'A': 'DATA-FM', 'B': 'FM-N', 'C': 'DATA-U', 'D': 'AM-N', 'E': 'C4FM'
-                }
-                mode_str = mode_map.get(mode_char, '?')
-                return None, "VFO Mode", mode_str
-            
-            # Now query MT{channel}; to get the tag and mode
-            time.sleep(0.05)
-            mt_resp = self._cat(f"MT{channel_num:03d};")
-            
-            if not (mt_resp.startswith("MT") and len(mt_resp) >= 30):
-                return channel_num, f"CH {channel_num:03d}", "?"
-            
-            # MT response format (after stripping MT and ;):
-            # Pos 0-2: channel (3 digits)
-            # Pos 3-11: frequency (9 digits)
-            # Pos 12-16: clarifier (5 chars with sign)
-            # Pos 17: RX CLAR
-            # Pos 18: TX CLAR
-            # Pos 19: Mode
-            # Pos 20: VFO/Memory
-            # Pos 21: CTCSS
-            # Pos 22-23: Fixed (00)
-            # Pos 24: Shift
-            # Pos 25: Fixed (0)
-            # Pos 26+: TAG (up to 12 chars)
-            mt_payload = mt_resp[2:-1]  # Strip "MT" and ";"
-            
-            # Get mode from position 19
-            mode_char = mt_payload[19] if len(mt_payload) > 19 else '?'
-            mode_map = {
-                '1': 'LSB', '2': 'USB', '3': 'CW', '4': 'FM', '5': 'AM',
-                '6': 'RTTY-L', '7': 'CW-R', '8': 'DATA-L', '9': 'RTTY-U',
-                'A': 'DATA-FM', 'B': 'FM-N', 'C': 'DATA-U', 'D': 'AM-N', 'E': 'C4FM'
-            }
-            mode_str = mode_map.get(mode_char, '?')
-            
-            # Get tag from position 26 onwards
-            tag = ""
-            if len(mt_payload) >= 27:
-                tag = mt_payload[26:].strip()
-            
-            if tag:
-                return channel_num, tag, mode_str
-            
-            return channel_num, f"CH {channel_num:03d}", mode_str
-            
-        except Exception as e:
-            return None, None, None
+        # ========== DARN MEMORIES GROUP ==========
+        darn_group = QGroupBox("🔖 DARN Memories", self.main_tab)
+        darn_group.setGeometry(15, 320, 180, 80)
+        darn_group.setStyleSheet(groupbox_style)
 
-    def update_channel_info_display(self):
-        """Update the channel info label with current memory channel and tag."""
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return
-        try:
-            # Skip if in poll inhibit window
-            if getattr(self, "_poll_inhibit_until", 0) > time.time():
-                return
-            
-            channel_num, tag, mode_str = self._read_memory_channel_info()
-            
-            if tag is None:
-                info_text = ""
-            elif channel_num is None:
-                # VFO mode
-                info_text = f"📻 {tag}  |  Mode: {mode_str}"
-            else:
-                # Memory mode - show channel number, tag, and mode
-                info_text = f"📍 M{channel_num:03d}: {tag}  |  Mode: {mode_str}"
-            
-            # Only update if changed
-            if getattr(self, "_last_channel_info", "") != info_text:
-                self._last_channel_info = info_text
-                self.channel_info_label.setText(info_text)
-                
-        except Exception as e:
-            pass
+        self.btn_mem_darn3 = QPushButton("DARN 3", darn_group)
+        self.btn_mem_darn3.setGeometry(10, 35, 75, 32)
+        self.btn_mem_darn3.setStyleSheet(btn_style_cyan)
+        self.btn_mem_darn3.clicked.connect(lambda: self.recall_memory_channel("004"))
 
-    # ### Frequency Display Live Polling
-    def update_frequency_display(self):
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return
-        try:
-            # Skip if we're in the brief "don't poll yet" window after big CAT writes
-            if getattr(self, "_poll_inhibit_until", 0) > time.time():
-                return
+        self.btn_mem_darn2 = QPushButton("DARN 2", darn_group)
+        self.btn_mem_darn2.setGeometry(90, 35, 75, 32)
+        self.btn_mem_darn2.setStyleSheet(btn_style_cyan)
+        self.btn_mem_darn2.clicked.connect(lambda: self.recall_memory_channel("003"))
 
-            hz = self._read_fa_hz()
-            if hz is None:
-                return  # bad/timeout parse; just try again next tick
+        # ========== MODE PRESETS GROUP ==========
+        presets_group = QGroupBox("🎛️ Mode Presets", self.main_tab)
+        presets_group.setGeometry(15, 440, 590, 130)
+        presets_group.setStyleSheet(groupbox_style)
 
-            # Avoid unnecessary repaints
-            if getattr(self, "_last_fa_hz", None) != hz:
-                self._last_fa_hz = hz
-                self.freq_display.setText(self._format_hz_for_display(hz))
+        btn_style_blue = """
+            QPushButton {
+                background-color: #1565c0; color: white; font-weight: bold;
+                border-radius: 6px; font-size: 10px; border: 1px solid #1976d2;
+            }
+            QPushButton:hover { background-color: #1976d2; }
+        """
 
-        except Exception:
-            pass
+        btn_style_grey = """
+            QPushButton {
+                background-color: #455a64; color: white; font-weight: bold;
+                border-radius: 6px; font-size: 10px; border: 1px solid #607d8b;
+            }
+            QPushButton:hover { background-color: #546e7a; }
+        """
 
+        # One button per operating mode in presets/operating_modes.json, laid out by row
+        self.preset_buttons = {}
+        try:
+            self.operating_modes = {m.name: m for m in load_operating_modes()}
+        except Exception as e:
+            self.operating_modes = {}
+            error_label = QLabel(f"⚠️ {OPERATING_MODES_FILE.name}: {e}", presets_group)
+            error_label.setGeometry(10, 32, 570, 40)
+            error_label.setWordWrap(True)
+            error_label.setStyleSheet("color: #ff8a80; font-size: 10px;")
+
+        next_x = {}
+        for mode in self.operating_modes.values():
+            x = next_x.get(mode.row, 10)
+            y = 32 + (mode.row - 1) * 40
+            btn = QPushButton(mode.label, presets_group)
+            btn.setGeometry(x, y, mode.width, 32)
+            btn.setStyleSheet(btn_style_grey if mode.style == "grey" else btn_style_blue)
+            btn.clicked.connect(partial(self.activate_preset, mode.name))
+            self.preset_buttons[mode.name] = btn
+            if mode.note:
+                note = QLabel(mode.note, presets_group)
+                note.setGeometry(x + 4, y + 32, 80, 18)
+                note.setStyleSheet("color: #90caf9; font-size: 10px;")
+            next_x[mode.row] = x + mode.width + 15
 
+        # ========== FILE OPERATIONS GROUP ==========
+        file_group = QGroupBox("📁 File Operations", self.main_tab)
+        file_group.setGeometry(15, 600, 490, 85)
+        file_group.setStyleSheet(groupbox_style)
 
+        self.save_btn = QPushButton("📥 Download From Radio", file_group)
+        self.save_btn.setGeometry(15, 35, 220, 38)
+        self.save_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2e7d32; color: white; font-weight: bold;
+                border-radius: 6px; font-size: 12px; border: 2px solid #4caf50;
+            }
+            QPushButton:hover { background-color: #43a047; }
+        """)
+        self.save_btn.clicked.connect(self.load_all_menus)
 
-### Digit Button Frequency Adjust
-    def adjust_frequency(self, step_hz):
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return
-        try:
-            # Make sure FA writes apply to VFO, not a memory
-            self._ensure_vfo()
+        self.load_btn = QPushButton("📤 Load File to Radio", file_group)
+        self.load_btn.setGeometry(250, 35, 220, 38)
+        self.load_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #c62828; color: white; font-weight: bold;
+                border-radius: 6px; font-size: 12px; border: 2px solid #ef5350;
+            }
+            QPushButton:hover { background-color: #e53935; }
+        """)
+        self.load_btn.clicked.connect(self.select_and_load_file)
 
-            step = int(step_hz)
-            cur = self._read_fa_hz()
-            if cur is None:
-                return
+        # ========== LOG DISPLAY GROUP (right side, aligned with Frequency) ==========
+        log_group = QGroupBox("📝 Activity Log", self.main_tab)
+        log_group.setGeometry(620, 180, 560, 370)
+        log_group.setStyleSheet(groupbox_style)
+        
+        self.text_display = QTextEdit(log_group)
+        self.text_display.setGeometry(15, 30, 530, 325)
+        self.text_display.setReadOnly(True)
+        self.text_display.setStyleSheet("background-color: #0a1628; color: #7fff7f; font-family: Consolas; font-size: 11px; border: 1px solid #1e3a5f; border-radius: 6px;")
 
-            new_hz = self._clip_rig_range(cur + step)
-            if new_hz == cur:
-                return  # nothing to do
+        # ========== STATUS & PROGRESS ==========
+        self.status_label = QLabel("Ready - Configure COM port in Settings tab", self.main_tab)
+        self.status_label.setGeometry(15, 735, 300, 28)
+        self.status_label.setStyleSheet("color: #ffd54f; font-weight: bold; font-size: 13px;")
 
-            # Avoid a race with the poller while we write & the rig settles
-            self._poll_inhibit_until = time.time() + 0.35
+        self.progress_bar = QProgressBar(self.main_tab)
+        self.progress_bar.setGeometry(15, 700, 490, 25)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                border: 2px solid #1e3a5f; border-radius: 6px;
+                background: #0a1929; color: #a0c4ff; text-align: center; font-size: 11px;
+            }
+            QProgressBar::chunk {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 #1976d2, stop:0.5 #42a5f5, stop:1 #1976d2);
+                border-radius: 4px;
+            }
+        """)
 
-            self.serial_conn.write(f"FA{new_hz:011d};".encode("ascii"))
 
-            # Small settle; then read back actual FA (rig may quantize)
-            time.sleep(0.12)
-            self.serial_conn.reset_input_buffer()
-            self.serial_conn.write(b"FA;")
-            fa = self.read_until_semicolon()
-            if fa.startswith("FA") and fa.endswith(";"):
-                digits = "".join(ch for ch in fa[2:-1] if ch.isdigit())
-                if digits:
-                    new_hz = int(digits[-11:].rjust(11, "0"))
 
-            self._last_fa_hz = new_hz
-            self.freq_display.setText(self._format_hz_for_display(new_hz))
 
-        except Exception:
-            pass
 
 
 
-    def activate_winlink_memory(self, file):
-        # (Optional) keep this if you like a clean log each time
-        self.text_display.clear()
 
-        if not (self.serial_conn and self.serial_conn.is_open):
-            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
-            return
 
-        try:
-            ser = self.serial_conn
+# ▶️ SSB FILTER CONTROLS (Expanded with 9 sliders + toggles)
+        self.ssb_sliders = {}
+        self.ssb_toggles = {}
 
-            # Avoid a race with the FA poller during the sequence
-            self._poll_inhibit_until = time.time() + 0.6
+        ssb_filter_group = QGroupBox("🎚️ SSB Filters", self.main_tab)
+        ssb_filter_group.setGeometry(20, 800, 1060, 320)
+        ssb_filter_group.setStyleSheet("""
+            QGroupBox {
+                color: #a0c4ff;
+                font-weight: bold;
+                font-size: 13px;
+                border: 2px solid #1e3a5f;
+                border-radius: 10px;
+                margin-top: 12px;
+                padding-top: 10px;
+                background: #0d2137;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                left: 15px;
+                padding: 0 10px;
+                background: #0d2137;
+            }
+        """)
 
-            # 1) Apply your preset file (EX... commands)
-            ser.reset_input_buffer()
-            self._apply_settings_from_file(file)
-            time.sleep(0.25)
+        grid = QGridLayout()
+        grid.setVerticalSpacing(20)
 
-            # 2) Enter Memory mode and recall MC053
-            ser.write(b'VM1;')              # 0 = VFO, 1 = Memory (explicit, not a toggle)
-            time.sleep(0.12)
-            ser.write(b'MC053;')            # recall memory 053
-            time.sleep(0.30)
+        def make_slider_row(label, min_, max_, default, tooltip=None, show_toggle=False, unit=""):
+            row_widget = QWidget()
+            row_layout = QHBoxLayout(row_widget)
+            row_layout.setContentsMargins(0, 0, 0, 0)
+            row_layout.setSpacing(20)  ### Added more spacing between label/toggle and slider
 
-            # 3) Sanity check where we landed
-            ser.reset_input_buffer()
-            ser.write(b"MC;")
-            resp = self.read_until_semicolon()
-            actual = None
-            if resp.startswith("MC") and len(resp) >= 5 and resp[2:5].isdigit():
-                actual = int(resp[2:5])
+            toggle = None
+            if show_toggle:
+                toggle = QCheckBox("ON")
+                toggle.setChecked(True)
+                toggle.setStyleSheet("color: #64b5f6")
+                self.ssb_toggles[label] = toggle
 
-            tag = self.read_memory_tag(actual) if actual else None
+            lbl = QLabel(label)
+            lbl.setStyleSheet("color: #a0c4ff")
+            if tooltip:
+                lbl.setToolTip(tooltip)
 
+            slider = QSlider(Qt.Horizontal)
+            slider.setMinimum(min_ // 10)
+            slider.setMaximum(max_ // 10)
+            slider.setValue(default // 10)
+            slider.setFixedWidth(800)  ### Force full-width for all sliders
+            self.ssb_sliders[label] = slider
 
+            value_lbl = QLabel(str(default))
+            value_lbl.setStyleSheet("color: #ffd54f; min-width: 40px")
 
-            # 5) UI updates
-            port = self.settings_cat_combo.currentText()
-            nice = f"📡 Winlink {(f'{actual:03d}' if actual else '???')}"
-            if tag:
-                nice += f" — {tag}"
+            unit_lbl = QLabel(unit)
+            unit_lbl.setStyleSheet("color: #a0c4ff")
 
-            self.status_label.setText(f"{nice} on {port}")
-            self.status_label.setStyleSheet("color: white; font-weight: bold; padding: 4px;")
-            self.text_display.append("✅ Winlink activated: preset applied, memory recalled\n")
+            def update_display_and_send(val):
+                freq = val * 10
+                value_lbl.setText(str(freq))
+                ### Send CAT only if toggle is ON
+                if label == "Contour Freq HZ":
+                    if self.ssb_toggles[label].isChecked():
+                        self.cat_input.setText(f"CO01{freq:04d};")
+                        self.send_cat_command()
+                    else:
+                        self.cat_input.setText("CO000000;")
+                        self.send_cat_command()
 
-            # Final refresh after the rig settles
-            QTimer.singleShot(400, self.update_frequency_display)
+            if show_toggle and label == "Contour Freq HZ":
+                toggle.stateChanged.connect(lambda _: update_display_and_send(slider.value()))  ### Reapply CAT on toggle change
+                toggle.stateChanged.connect(lambda state: self.cat_input.setText("CO000001;" if state == Qt.Checked else "CO000000;"))  ### Toggle ON/OFF CAT
+                toggle.stateChanged.connect(lambda _: self.send_cat_command())  ### Send CAT immediately on toggle
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to activate Winlink:\n{e}")
+            slider.valueChanged.connect(update_display_and_send)
 
+            row_layout.addWidget(lbl)
+            if toggle:
+                row_layout.addWidget(toggle)
+            row_layout.addWidget(slider)
+            row_layout.addWidget(value_lbl)  ### Value right after slider
+            row_layout.addWidget(unit_lbl)   ### Then unit
 
-# --- Helpers to query memory/channel info ---
-    def read_current_memory_channel(self):
-        """Return current memory channel as int, or None if not in memory mode or parse fails."""
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return None
-        try:
-            ser = self.serial_conn
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-            ser.write(b"MC;")
-            resp = self.read_until_semicolon()
+            return row_widget
 
-            # Optional: log to CAT terminal
-            try:
-                self.cat_response_display.append(f">> MC;\n<< {resp}")
-            except Exception:
-                pass
+        # Contour Freq slider (Full-length)
+        contour_row = make_slider_row("Contour Freq HZ", 10, 3200, 300, "Menu: CO (Contour)", show_toggle=True)
+        grid.addWidget(contour_row, 0, 0, 1, 3)
 
-            if not (resp.startswith("MC") and resp.endswith(";")):
-                return None
+        # Contour Width slider (Full-length)
+        contour_width_row = make_slider_row("Contour Width", 10, 110, 50, "Menu: EX113", show_toggle=False, unit="")
+        contour_width_row.findChildren(QSlider)[0].setFixedWidth(800)  ### Match length
+        grid.addWidget(contour_width_row, 1, 0, 1, 3)
 
-            payload = resp[2:-1]  # should be 'nnn'
-            # Be tolerant: extract the first 3 digits anywhere in payload
-            import re
-            m = re.search(r"(\d{3})", payload)
-            if not m:
-                return None
+        # Contour Level slider (Full-length)
+        contour_level_row = make_slider_row("Contour Level", -400, 200, 0, "Menu: EX112", show_toggle=False, unit="dB")
+        contour_level_row.findChildren(QSlider)[0].setFixedWidth(800)  ### Match length
+        grid.addWidget(contour_level_row, 2, 0, 1, 3)
 
-            ch = int(m.group(1))
-            if ch == 0:
-                # Radio replies MC000 when in VFO (not memory) mode
-                return None
+        # Placeholders for remaining sliders (basic, no scaling or toggles yet)
+        width_row = make_slider_row("Width", 0, 4, 2, "Menu: EX110", show_toggle=False, unit="")
+        shift_row = make_slider_row("Shift", -1200, 1200, 0, "Menu: IS", show_toggle=False, unit="Hz")
+        nb_row = make_slider_row("NB Width", 0, 10, 2, "Menu: NB/NL", show_toggle=True, unit="")
+        dnr_row = make_slider_row("DNR Level", 1, 15, 5, "Menu: NR/RL", show_toggle=True, unit="")
+        notch_row = make_slider_row("Notch Width", 0, 3200, 1500, "Menu: BP", show_toggle=True, unit="Hz")
+        apf_row = make_slider_row("APF Width", 0, 2, 1, "Menu: CO (APF)", show_toggle=True, unit="")
 
-            # (Optional) sanity range for FT-991A memories; adjust if you use more/less
-            if 1 <= ch <= 124:
-                return ch
-            return ch  # if your radio uses a wider range, just return it
+        grid.addWidget(width_row, 3, 0, 1, 3)
+        grid.addWidget(shift_row, 4, 0, 1, 3)
+        grid.addWidget(nb_row, 5, 0, 1, 3)
+        grid.addWidget(dnr_row, 6, 0, 1, 3)
+        grid.addWidget(notch_row, 7, 0, 1, 3)
+        grid.addWidget(apf_row, 8, 0, 1, 3)
 
-        except Exception as e:
-            try:
-                self.cat_response_display.append(f"[read_current_memory_channel error] {e}")
-            except Exception:
-                pass
-            return None
 
-    def activate_mic_default_d3(self, file):
-        """
-        Apply stripped defaults (overrides_only.xml), then recall DARN 3 (MC004).
-        """
-        self.text_display.clear()
-        if not (self.serial_conn and self.serial_conn.is_open):
-            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
-            return
-        try:
-            ser = self.serial_conn
-            # Pause pollers briefly during writes
-            self._poll_inhibit_until = time.time() + 0.7
-            ser.reset_input_buffer(); ser.reset_output_buffer()
+        ssb_filter_group.setLayout(grid)
 
-            # 1) Apply stripped defaults
-            self._apply_settings_from_file(file)
-            self.text_display.append(f"📤 Applied stripped defaults from: {file}\n")
 
-            # 2) Enter Memory mode (explicit, not a toggle)
-            ser.reset_input_buffer()
-            ser.write(b'VM1;')
-            _ = self.read_until_semicolon()
-            time.sleep(0.12)
 
-            # 3) Recall DARN 3 (MC004)
-            ser.reset_input_buffer()
-            ser.write(b'MC004;')
-            _ = self.read_until_semicolon()
-            time.sleep(0.25)
 
-            # 4) Verify actual memory and show tag
-            ser.reset_input_buffer(); ser.write(b"MC;")
-            state = self.read_until_semicolon() or ""
-            actual = 4
-            if state.startswith("MC") and len(state) >= 5 and state[2:5].isdigit():
-                ch = int(state[2:5]); 
-                if ch != 0: actual = ch
+# CAT tab
+        cat_layout = QVBoxLayout()
+        self.cat_input = QLineEdit()
+        self.cat_input.setPlaceholderText("Enter CAT command (e.g., FA;)")
+        cat_layout.addWidget(self.cat_input)
 
-            tag = self.read_memory_tag(actual)
-            nice = f"🎙️ Mic default D3 (MC{actual:03d}" + (f" — {tag}" if tag else "") + ")"
+        self.cat_send_btn = QPushButton("Send CAT Command")
+        self.cat_send_btn.clicked.connect(self.send_cat_command)
+        cat_layout.addWidget(self.cat_send_btn)
 
+        self.cat_response_display = QTextEdit()
+        self.cat_response_display.setReadOnly(True)
+        self.cat_response_display.setStyleSheet("background-color: #0a1628; color: #7fff7f; font-family: Consolas; border: 1px solid #1e3a5f; border-radius: 6px;")
+        cat_layout.addWidget(self.cat_response_display)
 
-            # UI
-            self.status_label.setText(nice)
-            self.status_label.setStyleSheet("color: white; font-weight: bold; padding: 4px;")
-            self.text_display.append("✅ Mic default D3 applied: stripped defaults + DARN 3 recalled\n")
+        # Bus statistics (CatStats of the live link), refreshed once a second
+        stats_group = QGroupBox("📊 Bus statistics")
+        stats_layout = QVBoxLayout(stats_group)
+        self.cat_stats_display = QTextEdit()
+        self.cat_stats_display.setReadOnly(True)
+        self.cat_stats_display.setLineWrapMode(QTextEdit.NoWrap)
+        self.cat_stats_display.setStyleSheet(self.cat_response_display.styleSheet())
+        self.cat_stats_display.setFixedHeight(180)
+        stats_layout.addWidget(self.cat_stats_display)
+        stats_btns = QHBoxLayout()
+        stats_reset_btn = QPushButton("Reset")
+        stats_reset_btn.clicked.connect(self.reset_cat_stats)
+        stats_btns.addWidget(stats_reset_btn)
+        stats_export_btn = QPushButton("Export JSON...")
+        stats_export_btn.clicked.connect(self.export_cat_stats)
+        stats_btns.addWidget(stats_export_btn)
+        self.cat_record_check = QCheckBox(f"⏺ Record traffic to {TRACE_FILE.parent.name}/{TRACE_FILE.name}")
+        self.cat_record_check.toggled.connect(self._set_recording)
+        stats_btns.addWidget(self.cat_record_check)
+        stats_layout.addLayout(stats_btns)
+        cat_layout.addWidget(stats_group)
 
-            QTimer.singleShot(350, self.update_frequency_display)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to activate Mic default D3:\n{e}")
+        self.cat_tab.setLayout(cat_layout)
 
+        self._stats_timer = QTimer(self)
+        self._stats_timer.timeout.connect(self._show_cat_stats)
+        self._stats_timer.timeout.connect(self._check_recorder)
+        self._stats_timer.start(1000)
+        
+        # Load saved settings (now that all UI is built)
+        if persist:
+            self.load_settings()
+
+##############################################################################
+################################# FUNCTIONS ##################################
+##############################################################################
 
-    def read_memory_tag(self, channel: int):
-        """Return the memory TAG (name) for MTnnn; or None if unavailable/parse fails."""
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return None
-        try:
-            ser = self.serial_conn
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-            ser.write(f"MT{channel:03d};".encode("ascii"))
-            resp = self.read_until_semicolon()
 
-            # Optional log
-            try:
-                self.cat_response_display.append(f">> MT{channel:03d};\n<< {resp}")
-            except Exception:
-                pass
+# inside class FT991AController, after the CAT tab code and before other funcs
 
-            if not (resp.startswith("MT") and resp.endswith(";")):
-                return None
+    def _connected(self) -> bool:
+        """True while the CAT worker is running with an open port."""
+        w = getattr(self, "cat_worker", None)
+        return bool(w and w.is_open())
 
-            payload = resp[2:-1]  # strip 'MT' and trailing ';'
+    def _cat_submit(self, job, *args, on_done=None, on_error=None):
+        """Queue job(link, *args) on the CAT worker. Returns its Future, or None if not connected."""
+        if not self._connected():
+            return None
+        return self.cat_worker.submit(job, *args, on_done=on_done, on_error=on_error)
 
-            # Some rigs echo channel digits first (e.g., 'nnnTAG.....')
-            if len(payload) >= 3 and payload[:3].isdigit():
-                payload = payload[3:]
+    def _poll(self, name, job, on_done, on_error=None):
+        """Queue a periodic query unless the previous one of the same name is still in flight."""
+        if name in self._polls_in_flight:
+            return
 
-            # Clean to printable ASCII, strip padding
-            import string
-            tag = "".join(ch for ch in payload if ch in string.printable).strip()
+        def finish(result):
+            self._polls_in_flight.discard(name)
+            on_done(result)
 
-            # Yaesu tags are typically up to 12 chars; trim if longer
-            if len(tag) > 12:
-                tag = tag[:12].rstrip()
+        def fail(e):
+            self._polls_in_flight.discard(name)
+            if on_error:
+                on_error(e)
 
-            # Guard against empty/placeholder returns
-            if not tag or tag == "---":
-                return None
+        self._polls_in_flight.add(name)
+        if self._cat_submit(job, on_done=finish, on_error=fail) is None:
+            self._polls_in_flight.discard(name)
 
-            return tag
+    def _append_cat_log(self, text):
+        self.cat_response_display.append(text)
+
+    def _cat_stats(self):
+        """Snapshot of the live link's CatStats, or None when not connected."""
+        return self.cat_worker.link.stats.snapshot() if self._connected() else None
 
+    def _show_cat_stats(self):
+        if self.tabs.currentWidget() is not self.cat_tab:
+            return
+        snap = self._cat_stats()
+        if snap is None:
+            self.cat_stats_display.setPlainText("Not connected")
+            return
+        edges = list(next(iter(snap["ops"].values()))["hist_ms"]) if snap["ops"] else []
+        lines = [f"Bus {snap['utilisation_recent_pct']:5.1f}% (last {CatStats.WINDOW_SEC:.0f} s: "
+                 f"out {snap['utilisation_recent_out_pct']:.1f}%, in {snap['utilisation_recent_in_pct']:.1f}%), "
+                 f"{snap['utilisation_pct']:.1f}% overall @ {snap['baud']} · out {snap['bytes_out']} B · "
+                 f"in {snap['bytes_in']} B · {snap['timeouts']} timeouts · {snap['errors']} ?; in {snap['elapsed_s']:.0f} s",
+                 "",
+                 "op   sent  rply  t/o   ?;   out B   in B  avg ms  max ms  " + " ".join(f"{e:>5}" for e in edges)]
+        for op, row in snap["ops"].items():
+            avg = f"{row['latency_ms_avg']:6.1f}" if row["latency_ms_avg"] is not None else "     -"
+            lines.append(f"{op:<3} {row['sent']:5} {row['replies']:5} {row['timeouts']:4} {row['errors']:4} "
+                         f"{row['bytes_out']:7} {row['bytes_in']:6}  {avg}  {row['latency_ms_max']:6.1f}  "
+                         + " ".join(f"{n:5}" for n in row["hist_ms"].values()))
+        self.cat_stats_display.setPlainText("\n".join(lines))
+
+    def _set_recording(self, on):
+        """Start/stop the CAT trace; the live link picks it up immediately."""
+        if on and self.cat_recorder is None:
+            self.cat_recorder = CatRecorder()
+            if self._connected():
+                self._note_trace_session(self.cat_worker.link)
+        elif not on and self.cat_recorder is not None:
+            recorder, self.cat_recorder = self.cat_recorder, None
+            if self.cat_worker is not None:
+                self.cat_worker.link.recorder = None
+            recorder.close()
+            self.text_display.append(f"⏺ CAT trace: {recorder.frames} frames in {recorder.path}")
+
+    def _check_recorder(self):
+        """If the trace writer gave up, say why and untick "Record traffic"."""
+        recorder = self.cat_recorder
+        if recorder is not None and recorder.error:
+            msg = f"⚠️ CAT trace stopped: {recorder.error}"
+            self.text_display.append(msg)
+            self.cat_response_display.append(msg)
+            self.cat_record_check.setChecked(False)
+
+    def _note_trace_session(self, link):
+        """Attach the recorder to a new link and mark the port/baud in the trace."""
+        ser = link.ser
+        self.cat_recorder.record("#", "connect", f"{getattr(ser, 'port', '?')} @ {getattr(ser, 'baudrate', '?')}")
+        link.recorder = self.cat_recorder
+
+    def reset_cat_stats(self):
+        if self._connected():
+            self.cat_worker.link.stats.reset()
+            self._show_cat_stats()
+
+    def export_cat_stats(self):
+        snap = self._cat_stats()
+        if snap is None:
+            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
+            return
+        filename, _ = QFileDialog.getSaveFileName(self, "Export CAT Statistics", "cat_stats.json", "JSON Files (*.json)")
+        if not filename:
+            return
+        try:
+            with open(filename, "w") as f:
+                json.dump(snap, f, indent=2)
+            self.text_display.append(f"📊 CAT statistics saved to: {filename}")
         except Exception as e:
-            try:
-                self.cat_response_display.append(f"[read_memory_tag error] {e}")
-            except Exception:
-                pass
+            QMessageBox.critical(self, "Error", f"Failed to save statistics:\n{e}")
+
+##Update meters:
+    def _show_meters(self, replies):
+        s_resp, pwr_resp = replies
+        self._show_s_meter(s_resp or "")
+        self._show_pwr_meter(pwr_resp or "")
+
+    def _show_pwr_meter(self, resp):
+        # Response format: RM5NNN; where NNN is 000-255
+        if resp.startswith('RM5'):
+            num_part = resp[3:].rstrip(';')
+            if num_part.isdigit():
+                raw = int(num_part)  # 0..255 from radio
+                # PWR: direct percentage scaling
+                val = max(0, min(100, int(round(raw * 100 / 255))))
+                self.pwr_meter.set_value(val)
+                # Output power above the noise floor means we're keyed
+                self.rig_state.tx = raw >= 10
+                self.tx_led.set_on(self.rig_state.tx)
+
+    def _show_s_meter(self, resp):
+        # Response format: RM1NNN; where NNN is 000-255
+        if resp.startswith('RM1'):
+            num_part = resp[3:].rstrip(';')
+            if num_part.isdigit():
+                raw = int(num_part)  # 0..255 from radio
+                # FT-991A S-meter scaling:
+                # Raw 0-128 = S0-S9 (0-50% of our display)
+                # Raw 128-255 = S9 to S9+60dB (50-100% of our display)
+                if raw <= 128:
+                    # S0 to S9 range - map to 0-50%
+                    val = int(round(raw * 50 / 128))
+                else:
+                    # S9+ range - map to 50-100%
+                    val = 50 + int(round((raw - 128) * 50 / 127))
+                val = max(0, min(100, val))
+                self.s_meter.set_value(val)
+
+    ###memrecall:
+    def recall_memory_channel(self, channel):
+        """Recall a memory channel (1..124). Returns the queued Future, or None if refused."""
+        if not self._connected():
+            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
             return None
 
+        # Normalize & validate channel
+        try:
+            ch_int = int(str(channel).strip())
+        except Exception:
+            QMessageBox.warning(self, "Warning", f"Invalid memory '{channel}'.")
+            return None
+        if not (1 <= ch_int <= 124):     # <-- adjust hi to your actual max memories
+            QMessageBox.warning(self, "Warning", f"Memory {ch_int:03d} out of range.")
+            return None
+        ch = f"{ch_int:03d}"
 
+        def job(link):
+            # Memory mode, recall, and the MC;/MT checks all in one write
+            _, mc_set, mc, mt = link.run(["VM1;", f"MC{ch};", "MC;", f"MT{ch};"], label=f"recall MC{ch}")
+            if mc[2:5] == ch:
+                return ch, True, link._parse_memory_tag(mt)
+            if mc_set in ("?;", CAT_MAYBE_REJECTED) and mc[2:5].isdigit():
+                # Refused (blank channel?): no point waiting for it
+                return mc[2:5], False, link.read_memory_tag(int(mc[2:5]))
 
+            # Not there yet: confirm where we actually landed (as soon as the rig reports it)
+            ok, landed = link.wait_channel(ch_int)
+            link.note(f">> MC;\n<< {'MC%03d;' % landed if landed is not None else '[No Response]'}")
 
+            actual = f"{landed:03d}" if landed is not None else ch
+            return actual, ok, link.read_memory_tag(int(actual))
 
-    def read_memory_summary(self, channel: int):
-        """Read memory details with MRnnn; and return the raw reply (or None on failure)."""
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return None
-        try:
-            ser = self.serial_conn
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-            ser.write(f"MR{channel:03d};".encode("ascii"))
-            resp = self.read_until_semicolon()  # already decodes to str
+        def done(result):
+            actual, ok, tag = result
+            if not ok:
+                self.text_display.append(f"⚠️ Memory {ch} not recalled; the radio stayed on {actual}")
+            nice = f"Memory {actual}" + (f" — {tag}" if tag else "")
+            self.text_display.append(f"🔁 Recalled {nice}")
+            self.status_label.setText(f"{nice} Active")
 
-            if not resp:
-                return None
+            # Refresh the big frequency display after things settle
+            QTimer.singleShot(350, self.update_frequency_display)
 
-            # Optional: log to CAT console for debugging
-            try:
-                self.cat_response_display.append(f">> MR{channel:03d};\n<< {resp}")
-            except Exception:
-                pass
+        def failed(e):
+            QMessageBox.critical(self, "Error", f"Failed to recall memory channel {ch}:\n{e}")
 
-            # We return raw so you can parse elsewhere; don't over-validate here.
-            return resp
-        except Exception as e:
-            try:
-                self.cat_response_display.append(f"[read_memory_summary error] {e}")
-            except Exception:
-                pass
-            return None
+        # Avoid races with other polling for a moment
+        self._hold_polls(0.4)
+        return self._cat_submit(job, on_done=done, on_error=failed)
 
-    
-    def fetch_current_freq_mode(self):
-        if not (self.serial_conn and self.serial_conn.is_open):
-            return None, None
-
-        # Frequency (reuse your helpers)
-        freq_str = None
-        hz = self._read_fa_hz()
-        if isinstance(hz, int):
-            freq_str = f"{self._format_hz_for_display(hz)} MHz"
-
-        # Mode map
-        mode_map = {
-            '00': 'LSB', '01': 'USB', '02': 'CW',   '03': 'CWR',
-            '04': 'AM',  '05': 'FM',  '06': 'RTTY-L','07': 'RTTY-U',
-            '08': 'PKT-L','09': 'PKT-U','0A': 'FM-N','0B': 'DATA-L',
-            '0C': 'DATA-U','0D': 'AM-N','0E': 'FM (DN/VW?)'
-        }
 
-        mode_h = None
+        # --- frequency helpers (needed by set_simplex, update_frequency_display, etc.) ---
+    def _clip_rig_range(self, hz):
+        """Clamp a frequency (Hz) to the rig's safe range."""
         try:
-            ser = self.serial_conn
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-            ser.write(b"MD;")
-            md = self.read_until_semicolon()
+            hz = int(hz)
+        except Exception:
+            return None
+        return max(self.RIG_MIN_HZ, min(self.RIG_MAX_HZ, hz))
 
-            # optional logging for debugging
-            try:
-                self.cat_response_display.append(f">> MD;\n<< {md or '[No Response]'}")
-            except Exception:
-                pass
+    def _format_hz_for_display(self, hz):
+        """Return 'MMM.KKK.HHH' display text from an integer Hz."""
+        if hz is None:
+            return "---.---.---"
+        mhz = hz // 1_000_000
+        khz = (hz // 1_000) % 1000
+        rhz = hz % 1000
+        return f"{mhz}.{khz:03d}.{rhz:03d}"
 
-            if md and md.startswith('MD') and len(md) >= 4:
-                code = md[2:4]
-                mode_h = mode_map.get(code, f"Unknown (MD{code})")
-        except Exception as e:
-            try:
-                self.cat_response_display.append(f"[fetch_current_freq_mode error] {e}")
-            except Exception:
-                pass
+    def _show_channel_info(self, info):
+        channel_num, tag, mode_str = info
 
-        return freq_str, mode_h
-    def is_memory_filled(self, ch: int) -> bool:
-        """Return True if memory channel has data (not blank) without changing state."""
-        try:
-            self.serial_conn.reset_input_buffer()
-            self.serial_conn.reset_output_buffer()
-            self.serial_conn.write(f"MR{ch:03d};".encode("ascii"))
-            resp = self.read_until_semicolon() or ""
-            if not (resp.startswith("MR") and resp.endswith(";")):
-                return False
+        if tag is None:
+            info_text = ""
+        elif channel_num is None:
+            # VFO mode
+            info_text = f"📻 {tag}  |  Mode: {mode_str}"
+        else:
+            # Memory mode - show channel number, tag, and mode
+            info_text = f"📍 M{channel_num:03d}: {tag}  |  Mode: {mode_str}"
+
+        # Only update if changed
+        if getattr(self, "_last_channel_info", "") != info_text:
+            self._last_channel_info = info_text
+            self.channel_info_label.setText(info_text)
+
+    # --- AI1 push mode: the rig reports FA/IF/MD changes on its own ---
+    def _ai_push_on(self):
+        """True while AI1 is active and the FA/IF/MC pollers can stand down."""
+        w = self.cat_worker
+        return bool(w and w.listen)
+
+    def _apply_ai_mode(self, *_):
+        """Switch the rig's Auto-Information on/off to match the Settings checkbox."""
+        w = self.cat_worker
+        if not self._connected():
+            return
+        on = self.settings_ai_check.isChecked()
+
+        def job(link):
+            link.write("AI1;" if on else "AI0;")
+            w.listen = on
+            # One IF; snapshot so the display is right before the first push
+            return link.query("IF;") if on else ""
+
+        def done(if_reply):
+            self.text_display.append("📡 AI1 push mode on" if on else "📡 AI1 push mode off (polling)")
+            if if_reply:
+                self._on_unsolicited(if_reply)
+
+        self._cat_submit(job, on_done=done)
+
+    def _on_unsolicited(self, frame):
+        """Apply a frame the rig pushed (AI1) to rig_state and redraw."""
+        op, payload = frame[:2], frame[2:-1]
+        st = self.rig_state
+        if op == "IF":
+            new = RigState.from_if(frame)
+            if new is None:
+                return
+            self._take_rig_state(new)
+            if new.in_memory and new.channel not in self._memory_tags:
+                self._refresh_rig_state()   # tag needs one MTnnn; read
+            return
+        if op == "FA" and payload.isdigit():
+            st.hz = int(payload)
+        elif op == "MD" and len(payload) >= 2:
+            st.mode_char = payload[1]
+        elif op == "MC" and payload[:3].isdigit():
+            if not st.in_memory or int(payload[:3]) != st.channel:
+                self._refresh_rig_state()
+            return
+        elif op == "TX" and payload:
+            st.tx = payload != "0"
+        else:
+            return
+        self._render_rig_state()
 
-            # Strip header and optional echoed channel
-            payload = resp[2:-1]
-            if len(payload) >= 3 and payload[:3].isdigit():
-                payload = payload[3:]
+    # ### Frequency Display Live Polling
+    def update_frequency_display(self):
+        """Refresh rig_state now, unless AI1 pushes are keeping it current."""
+        if not self._connected() or self._ai_push_on():
+            return
+        self._refresh_rig_state()
+
+    def _refresh_rig_state(self):
+        """One IF; round trip (plus MTnnn; for an unseen memory) → rig_state."""
+        tags = self._memory_tags
+        self._poll("rig_state", lambda link: link.read_rig_state(tags), self._take_rig_state)
+
+    def _take_rig_state(self, st):
+        """Adopt a freshly decoded RigState and redraw everything that shows it."""
+        if st is None:
+            return  # bad/timeout parse; just try again next tick
+        # IF; has no TX flag; TX; pushes and the PWR meter keep tx current instead
+        if st.tx is None:
+            st.tx = self.rig_state.tx
+        if st.in_memory:
+            if st.tag is not None:
+                self._memory_tags[st.channel] = st.tag
+            else:
+                st.tag = self._memory_tags.get(st.channel)
+        self.rig_state = st
+        self._render_rig_state()
+
+    def _render_rig_state(self):
+        st = self.rig_state
+        # Mid wheel-burst the display shows the predicted target, not the rig
+        if self.freq_display._tune_target is None:
+            self._show_frequency(self._clip_rig_range(st.hz) if st.hz is not None else None)
+        self._show_channel_info(st.channel_info())
+        if hasattr(self, "tx_led"):
+            self.tx_led.set_on(bool(st.tx))
+
+    def _show_frequency(self, hz):
+        if hz is None:
+            return  # bad/timeout parse; just try again next tick
 
-            # Heuristic: look for a long digit run (freq etc.) and ensure it's not all zeros
-            import re
-            m = re.search(r"(\d{6,})", payload)  # any long numeric field
-            return bool(m and any(c != "0" for c in m.group(1)))
-        except Exception:
-            return False
+        # Avoid unnecessary repaints
+        if getattr(self, "_last_fa_hz", None) != hz:
+            self._last_fa_hz = hz
+            self.freq_display.setText(self._format_hz_for_display(hz))
 
 
 
 
-    def change_memory_channel(self, step):
-        if not (self.serial_conn and self.serial_conn.is_open):
-            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
+### Digit Button Frequency Adjust
+    def adjust_frequency(self, step_hz):
+        if not self._connected():
             return
 
-        try:
-            ser = self.serial_conn
-            cur = self.read_current_memory_channel()
+        def job(link):
+            # Make sure FA writes apply to VFO, not a memory
+            link.ensure_vfo()
+
+            step = int(step_hz)
+            cur = self._clip_rig_range(link.read_fa_hz())
             if cur is None:
-                cur = max(1, int(getattr(self, "current_memory", 1)))
+                return None
 
-            lo, hi = 1, 124
-            direction = 1 if int(step) >= 0 else -1
+            new_hz = self._clip_rig_range(cur + step)
+            if new_hz == cur:
+                return None  # nothing to do
 
-            self._poll_inhibit_until = time.time() + 0.4
+            # Write, then read back actual FA as soon as the rig has it (may quantize)
+            return link.write_fa(new_hz, before=cur)
 
-            tries = 0
-            candidate = cur
-            found = None
+        def done(new_hz):
+            if new_hz is None:
+                return
+            self.rig_state.hz = new_hz
+            self._show_frequency(new_hz)
 
-            while tries < (hi - lo + 1):
-                candidate += direction
-                if candidate < lo: candidate = hi
-                if candidate > hi: candidate = lo
+        # Avoid a race with the poller while we write & the rig settles
+        self._hold_polls(0.35)
+        self._cat_submit(job, on_done=done)
 
-                # Force Memory mode
-                ser.reset_input_buffer(); ser.reset_output_buffer()
-                ser.write(b"VM1;"); _ = self.read_until_semicolon()
-                time.sleep(0.06)
-
-                # Try recall candidate
-                ser.reset_input_buffer()
-                cmd = f"MC{candidate:03d};"
-                ser.write(cmd.encode("ascii"))
-                _ = self.read_until_semicolon()
-                time.sleep(0.10)
-
-                # Verify where we actually are
-                actual = self.read_current_memory_channel()
-                if actual == candidate:
-                    found = candidate
-                    break
 
-                tries += 1
 
+    def change_memory_channel(self, step):
+        if not self._connected():
+            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
+            return
+
+        fallback = max(1, int(getattr(self, "current_memory", 1)))
+
+        def done(result):
+            found, tag = result
             if found is None:
                 self.text_display.append("⚠️ No additional programmed memories found.")
                 return
 
-            tag = self.read_memory_tag(found)
             self.current_memory = found
             nice = f"Memory {found:03d}" + (f" — {tag}" if tag else "")
             self.status_label.setText(nice)
             self.text_display.append(f"🔁 {nice}")
 
             QTimer.singleShot(350, self.update_frequency_display)
-            QTimer.singleShot(400, self.update_channel_info_display)
-            return found
 
-        except Exception as e:
+        def failed(e):
             QMessageBox.critical(self, "Error", f"Failed to change/read memory channel:\n{e}")
 
+        # With the memory index built, jump straight to the next programmed channel
+        if self._memory_index_ready:
+            cur = self.rig_state.channel if self.rig_state.in_memory else fallback
+            target = self._next_filled_memory(cur, 1 if int(step) >= 0 else -1)
+            if target is None:
+                done((None, None))
+                return None
+            tag = self.memory_index[target].tag
+
+            def jump(link):
+                _, mc_set, mc = link.run(["VM1;", f"MC{target:03d};", "MC;"], label=f"jump MC{target:03d}")
+                if mc[2:5] == f"{target:03d}":
+                    return target, tag
+                if mc_set in ("?;", CAT_MAYBE_REJECTED):
+                    return (int(mc[2:5]) if mc[2:5].isdigit() else None), None
+                ok, actual = link.wait_channel(target, deadline=0.4)
+                return (target, tag) if ok else (actual or None, None)
+
+            self._hold_polls(0.4)
+            return self._cat_submit(jump, on_done=done, on_error=failed)
+
+        def job(link):
+            cur = link.read_memory_channel()
+            if cur is None:
+                cur = fallback
 
+            lo, hi = 1, 124
+            direction = 1 if int(step) >= 0 else -1
 
-###APRS BUTTON
-
-    def activate_aprs_memory(self, file):
-        """Apply APRS preset and recall memory 052."""
-        self.text_display.clear()
-
-        if not (self.serial_conn and self.serial_conn.is_open):
-            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
-            return
-
-        try:
-            ser = self.serial_conn
-            # Avoid poller-vs-CAT races for a moment
-            self._poll_inhibit_until = time.time() + 0.6
+            tries = 0
+            candidate = cur
+            found = None
 
-            # Apply menu/preset from XML
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-            self._apply_settings_from_file(file)
-            self.text_display.append(f"📤 Preset applied from: {file}\n")
-            time.sleep(0.25)
+            while tries < (hi - lo + 1):
+                candidate += direction
+                if candidate < lo: candidate = hi
+                if candidate > hi: candidate = lo
 
-            # Enter Memory mode
-            ser.reset_input_buffer()
-            ser.write(b'VM1;')
-            vm_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> VM1;\n<< {vm_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.10)
+                # Memory mode + recall candidate + check, in one write
+                mc, = link.run(["VM1;", f"MC{candidate:03d};", "MC;"])[2:]
 
-            # Recall APRS memory channel 052
-            ser.reset_input_buffer()
-            cmd = b'MC052;'
-            ser.write(cmd)
-            mc_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> {cmd.decode('ascii')}\n<< {mc_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.20)
+                # Verify where we actually are (blank memories never confirm)
+                ok = mc[2:5] == f"{candidate:03d}" or link.wait_channel(candidate, deadline=0.1)[0]
+                if ok:
+                    found = candidate
+                    break
 
-            # (Optional) Force FM wide/narrow if you need it for your APRS setup:
-            # ser.write(b'MD05;')  # FM (wide) on FT-991A, or use MD0A for FM-N
-            # md_ack = self.read_until_semicolon()
-            # self.cat_response_display.append(f">> MD05;\n<< {md_ack or '[No Response]'}")
+                tries += 1
 
-            # UI
-            self.status_label.setText("📡 APRS memory 052 loaded + preset")
-            self.status_label.setStyleSheet("color: white; font-weight: bold; padding: 4px;")
-            self.text_display.append("✅ APRS activated: MC052 recalled and preset applied\n")
+            if found is None:
+                return None, None
+            return found, link.read_memory_tag(found)
 
-            # Refresh freq display after the rig settles
-            QTimer.singleShot(350, self.update_frequency_display)
+        self._hold_polls(0.4)
+        return self._cat_submit(job, on_done=done, on_error=failed)
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to activate APRS:\n{e}")
 
 
-    def activate_aprs_simplex59(self, file):
-        """Apply APRS preset from XML, switch to Memory mode, recall MC059 (simplex), and verify."""
-        self.text_display.clear()
 
-        if not (self.serial_conn and self.serial_conn.is_open):
-            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
+    def connect_to_radio(self):
+        if self._connected():
+            return
+        self._cancel_reconnect()
+        if self._closing_workers:
+            # The last connection still has the port; connect once it lets go
+            self._when_port_closed(self.connect_to_radio)
             return
 
-        try:
-            ser = self.serial_conn
-
-            # Avoid poller vs CAT races during the sequence
-            self._poll_inhibit_until = time.time() + 0.7
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-
-            # 1) Apply APRS menu preset
-            self._apply_settings_from_file(file)
-            self.text_display.append(f"📤 Preset applied from: {file}\n")
-            time.sleep(0.25)
-
-            # 2) Enter Memory mode (explicit)
-            ser.reset_input_buffer()
-            ser.write(b'VM1;')
-            vm_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> VM1;\n<< {vm_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.12)
-
-            # 3) Recall Simplex Memory 059
-            ser.reset_input_buffer()
-            ser.write(b'MC059;')
-            mc_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> MC059;\n<< {mc_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.25)
-
-            # 4) Verify active memory and fetch tag (if present)
-            ser.reset_input_buffer()
-            ser.write(b"MC;")
-            state = self.read_until_semicolon()
-
-            actual = 59
-            if state.startswith("MC") and len(state) >= 5 and state[2:5].isdigit():
-                ch = int(state[2:5])
-                if ch != 0:
-                    actual = ch
-
-            tag = self.read_memory_tag(actual)
-            nice = f"📡 APRS preset → MC{actual:03d}" + (f" — {tag}" if tag else "")
-
-            # 5) UI updates
-            self.status_label.setText(nice)
-            self.status_label.setStyleSheet("color: white; font-weight: bold; padding: 4px;")
-            self.text_display.append("✅ APRS (simplex) activated: preset applied + memory 059 recalled\n")
-
-            # 6) Refresh big frequency readout after rig settles
-            QTimer.singleShot(350, self.update_frequency_display)
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to activate APRS → M059:\n{e}")
-
-
-
+        # Discovery mode: whichever port/baud answers ID0570 wins
+        if self.settings_autodetect_check.isChecked():
+            self.find_radio(connect=True)
+            return
 
-    def connect_to_radio(self):
         port = self.settings_cat_combo.currentText()
-        
         if not port:
             QMessageBox.warning(self, "Warning", "No COM port selected. Go to Settings tab to configure.")
             return
-        
+
         # Get baud rate from settings
         try:
             baud = int(self.settings_baud_combo.currentText())
         except:
             baud = 38400
-        
+        self._open_radio(port, baud)
+
+    def _open_radio(self, port, baud, warm=False):
+        """Open port at baud with the configured DTR/RTS and start the CAT worker.
+        warm=True (a reconnect) keeps the memory index and rig state from before."""
         # Get RTS/DTR modes from settings
         rts_mode = self.settings_rts_combo.currentText() if hasattr(self, 'settings_rts_combo') else "On"
         dtr_mode = self.settings_dtr_combo.currentText() if hasattr(self, 'settings_dtr_combo') else "Off"
-        
-        try:
-            self.serial_conn = serial.Serial(
-                port=port,
-                baudrate=baud,
-                timeout=1,
-                rtscts=False,
-                dsrdtr=False,
-                write_timeout=1
-            )
 
-            # Set DTR based on settings
-            if dtr_mode == "Off":
-                self.serial_conn.setDTR(False)
-            elif dtr_mode == "On":
-                self.serial_conn.setDTR(True)
-            elif dtr_mode == "High=TX":
-                self.serial_conn.setDTR(False)  # Low when not TX
-            elif dtr_mode == "Low=TX":
-                self.serial_conn.setDTR(True)   # High when not TX
-            
-            # Set RTS based on settings
-            if rts_mode == "Off":
-                self.serial_conn.setRTS(False)
-            elif rts_mode == "On":
-                self.serial_conn.setRTS(True)
-            elif rts_mode == "High=TX":
-                self.serial_conn.setRTS(False)  # Low when not TX
-            elif rts_mode == "Low=TX":
-                self.serial_conn.setRTS(True)   # High when not TX
+        try:
+            ser = serial.Serial()
+            ser.port = port
+            ser.baudrate = baud
+            ser.timeout = 1
+            ser.rtscts = False
+            ser.dsrdtr = False
+            ser.write_timeout = 1
+
+            # DTR/RTS idle levels from settings (High=TX idles low, Low=TX idles high),
+            # set before open() so the lines don't glitch
+            ser.dtr = line_level(dtr_mode)
+            ser.rts = line_level(rts_mode)
+            ser.open()
 
             # Flush buffers after line-state change
-            self.serial_conn.reset_input_buffer()
-            self.serial_conn.reset_output_buffer()
+            ser.reset_input_buffer()
+            ser.reset_output_buffer()
             
-            dtr_state = "ON" if self.serial_conn.dtr else "OFF"
-            rts_state = "ON" if self.serial_conn.rts else "OFF"
+            dtr_state = "ON" if ser.dtr else "OFF"
+            rts_state = "ON" if ser.rts else "OFF"
+
+            # From here on only the worker thread touches the port
+            self._start_cat_worker(ser, warm=warm)
+            self._link_params = (port, baud)
 
             self.status_label.setText(f"Connected to {port} (DTR={dtr_state}, RTS={rts_state})")
             self.status_label.setStyleSheet("color: #7fff7f; font-weight: bold; padding: 4px;")
             self.text_display.append(f"✅ Connected to {port} @ {baud} baud (DTR={dtr_state}, RTS={rts_state})")
             
-            # Start connection health monitor
-            self._start_connection_monitor()
-            
-            # Reset failed response counter
+            # Memory index from kat_cache.json where it still checks out
+            self._warm_from_cache(port)
+
+            # Let the rig push FA/IF/MD changes instead of polling for them
+            if self.settings_ai_check.isChecked():
+                self._apply_ai_mode()
+
+            # Reset failed response counter (the health poll runs in the scheduler)
             self._conn_fail_count = 0
             
         except Exception as e:
+            if warm:
+                raise
             QMessageBox.critical(self, "Error", f"Unable to open {port}: {e}")
 
-    def _start_connection_monitor(self):
-        """Start a timer to monitor connection health."""
-        if not hasattr(self, '_conn_monitor_timer'):
-            self._conn_monitor_timer = QTimer(self)
-            self._conn_monitor_timer.timeout.connect(self._check_connection_health)
-        self._conn_monitor_timer.start(2000)  # Check every 2 seconds
-        self._conn_fail_count = 0
-
-    def _stop_connection_monitor(self):
-        """Stop the connection health monitor."""
-        if hasattr(self, '_conn_monitor_timer') and self._conn_monitor_timer.isActive():
-            self._conn_monitor_timer.stop()
-
-    def _check_connection_health(self):
-        """Check if the radio connection is still alive."""
-        if not self.serial_conn:
-            self._handle_connection_lost("No serial connection")
+    def find_radio(self, connect=False):
+        """Probe every serial port and baud rate with ID; in parallel; select the
+        FT-991A's port/baud in Settings and, with connect=True, open it."""
+        if self._finder is not None or self._connected():
+            return
+        if self._closing_workers:
+            self._when_port_closed(lambda: self.find_radio(connect))
+            return
+        try:
+            preferred = int(self.settings_baud_combo.currentText())
+        except ValueError:
+            preferred = 38400
+        bauds = [preferred] + [b for b in CAT_BAUD_RATES if b != preferred]
+        self._finder = RigFinder(bauds, line_level(self.settings_dtr_combo.currentText()),
+                                 line_level(self.settings_rts_combo.currentText()), self)
+        started = time.monotonic()
+        self.status_label.setText("🔍 Looking for the FT-991A on every port...")
+
+        def found(result):
+            self._finder.wait()
+            self._finder = None
+            if result is None:
+                self.status_label.setText("🔍 No radio answered ID;")
+                self.status_label.setStyleSheet("color: red; font-weight: bold; padding: 4px;")
+                QMessageBox.warning(self, "Warning", "No radio answered ID; on any serial port.\n"
+                                    "Check the cable, power and menu 031 (CAT RATE).")
+                return
+            port, baud, ident = result
+            if self.settings_cat_combo.findText(port) < 0:
+                self.settings_cat_combo.addItem(port)
+            self.settings_cat_combo.setCurrentText(port)
+            self.settings_baud_combo.setCurrentText(str(baud))
+            self.text_display.append(f"🔍 {ident} answered on {port} @ {baud} baud "
+                                     f"({time.monotonic() - started:.2f} s)")
+            if ident[2:6] != FT991A_ID:
+                self.text_display.append(f"⚠️ {ident} is not an FT-991A ({FT991A_ID}); using it anyway")
+            if connect:
+                self._open_radio(port, baud)
+
+        self._finder.found.connect(found)
+        self._finder.start()
+
+    def _start_cat_worker(self, ser, warm=False):
+        """Hand an open serial port to a fresh CatWorker thread. warm=True keeps
+        the memory index; _warm_from_cache re-checks it against the rig."""
+        self._stop_cat_worker()
+        self._polls_in_flight.clear()
+        self._known_menus = {}
+        if not warm:
+            self.memory_index.clear()
+            self._memory_tags.clear()
+            self._memory_index_ready = False
+        self._cache_key = None
+        self.cat_worker = CatWorker(ser, self)
+        if self.cat_recorder is not None:
+            self._note_trace_session(self.cat_worker.link)
+        self.cat_worker.log_line.connect(self._append_cat_log)
+        self.cat_worker.activity_line.connect(self.text_display.append)
+        self.cat_worker.progress.connect(self.progress_bar.setValue)
+        self.cat_worker.unsolicited.connect(self._on_unsolicited)
+        self._register_polls(self.cat_worker)
+        self.cat_worker.start()
+
+    def _register_polls(self, worker):
+        """Set up the periodic polls; the worker's scheduler runs them by priority."""
+        sched = worker.scheduler
+        tags = self._memory_tags
+        # cost = bytes out + bytes back for one run
+        sched.add("rig_state", lambda link: link.read_rig_state(tags),
+                  period=self.FREQ_POLL_MS / 1000, priority=3, cost=3 + 28,
+                  on_done=self._take_rig_state, when=lambda: not worker.listen)
+        sched.add("meters", lambda link: link.transact(["RM1;", "RM5;"]),
+                  period=self.METER_POLL_MS / 1000, priority=2, cost=8 + 14,
+                  on_done=self._show_meters)
+        # Top priority and outside the byte budget: it is free (see _health_job)
+        # and must not starve behind a long job or polls timing out against a dead rig
+        sched.add("health", self._health_job,
+                  period=self.HEALTH_POLL_MS / 1000, priority=4, cost=3 + 7,
+                  on_done=self._on_health_reply, on_error=self._on_health_error, metered=False)
+        # Memory index: what _warm_from_cache can't vouch for, then whatever
+        # MW/MT/AM writes touch
+        link = worker.link
+        self._memory_scan_started = time.monotonic()
+        sched.add("memory_index", lambda link: link.scan_memories(),
+                  period=0.05, priority=0, cost=8 * (6 + 41),
+                  on_done=self._take_memory_entries,
+                  when=lambda: bool(link.dirty_memories), background=True)
+        self._apply_poll_settings()
+
+    def _apply_poll_settings(self, *_):
+        """Push the Settings tab poll periods / bus budget into the live scheduler."""
+        w = self.cat_worker
+        if w is None or not hasattr(self, "settings_poll_spins"):
+            return
+        sched = w.scheduler
+        sched.configure(getattr(w.link.ser, "baudrate", 0) or self.BAUD,
+                        self.settings_budget_spin.value() / 100.0)
+        for name, spin in self.settings_poll_spins.items():
+            sched.set_period(name, spin.value() / 1000.0)
+        stretched = [f"{name} {eff * 1000:.0f} ms" for name, req, eff in sched.plan() if eff > req * 1.01]
+        if stretched:
+            self.text_display.append(f"⏱️ Slow link @ {sched.baud} baud — polls stretched: " + ", ".join(stretched))
+
+    def _warm_from_cache(self, port):
+        """Identify the rig, load its rows from kat_cache.json and spot-check a few
+        against the radio. Only stale or unverified channels are queued for a scan;
+        cached menu values that pass their own spot check become _known_menus,
+        which Download From Radio shows while it reads the radio."""
+        cache = self.radio_cache
+
+        def job(link):
+            ident = link.query("ID;")
+            key = cache.key(ident, port) if ident.startswith("ID") else None
+            rows = cache.memories(key) if key else {}
+            now = time.time()
+            fresh = {ch: e for ch, (e, ts) in rows.items()
+                     if ch in MEMORY_CHANNELS and now - ts < cache.MAX_AGE}
+
+            # Spot check: three programmed and two blank channels must still match
+            filled = [ch for ch, e in fresh.items() if e.filled]
+            blank = [ch for ch, e in fresh.items() if not e.filled]
+            sample = filled[::max(1, len(filled) // 3)][:3] + blank[:2]
+            replies = link.transact([f"MT{ch:03d};" for ch in sample]) if sample else []
+            if any(CatLink.parse_memory(r) != fresh[ch] for ch, r in zip(sample, replies) if r):
+                fresh = {}    # the memories changed under us: distrust the lot
+
+            link.dirty_memories.update(ch for ch in MEMORY_CHANNELS if ch not in fresh)
+
+            # Menus: trusted only if three of them still read back the same
+            menus = {num: val for num, (val, ts) in (cache.menus(key) if key else {}).items()
+                     if num in MENU_DESCRIPTIONS and now - ts < cache.MAX_AGE}
+            probe = list(menus)[::max(1, len(menus) // 3)][:3]
+            link.read_menus(probe)
+            if any(link.menus.get(num) != menus[num] for num in probe):
+                menus = {}
+            return key, fresh, menus
+
+        def done(result):
+            key, fresh, menus = result
+            self._cache_key = key
+            if key is None:
+                self.text_display.append(f"⚠️ {port} didn't answer ID; — wrong port or baud? "
+                                         "Try 🔍 Find Radio in Settings.")
+            if fresh:
+                self.text_display.append(f"🗄️ {len(fresh)} memories from {CACHE_FILE.name}; "
+                                         f"{len(MEMORY_CHANNELS) - len(fresh)} to re-read")
+                self._take_memory_entries(fresh, store=False)
+            if menus:
+                self._known_menus = menus
+                self.text_display.append(f"🗄️ {len(menus)} menu values from {CACHE_FILE.name}")
+
+        self._cat_submit(job, on_done=done)
+
+    def _take_memory_entries(self, entries, store=True):
+        """Merge a batch of scanned memories into memory_index (and the tag cache)."""
+        for ch, entry in entries.items():
+            self.memory_index[ch] = entry
+            self._memory_tags[ch] = entry.tag
+        if store and entries and self._cache_key:
+            self.radio_cache.put_memories(self._cache_key, entries)
+            self._cache_save_timer.start(1000)
+        if not self._memory_index_ready and all(ch in self.memory_index for ch in MEMORY_CHANNELS):
+            self._memory_index_ready = True
+            filled = sum(1 for e in self.memory_index.values() if e.filled)
+            took = time.monotonic() - getattr(self, "_memory_scan_started", time.monotonic())
+            self.text_display.append(f"🗂️ Memory index ready: {filled} of {len(MEMORY_CHANNELS)} "
+                                     f"channels programmed ({took:.1f} s)")
+
+    def _cache_menus(self, values):
+        """Remember menu values ({num: value}) read from or written to this radio,
+        in _known_menus and kat_cache.json."""
+        good = {num: val.rstrip(';') for num, val in values.items() if val and val != "----"}
+        self._known_menus.update(good)
+        if self._cache_key and good:
+            self.radio_cache.put_menus(self._cache_key, good)
+            self._cache_save_timer.start(1000)
+
+    def _next_filled_memory(self, cur, direction):
+        """Next programmed channel after cur (wrapping), from memory_index; None if none."""
+        chans = list(MEMORY_CHANNELS)
+        start = chans.index(cur) if cur in chans else (-1 if direction > 0 else 0)
+        for k in range(1, len(chans) + 1):
+            ch = chans[(start + k * direction) % len(chans)]
+            entry = self.memory_index.get(ch)
+            if entry and entry.filled and ch != cur:
+                return ch
+        return None
+
+    def _hold_polls(self, seconds):
+        """Keep periodic polls off the bus while the rig settles after a write."""
+        w = self.cat_worker
+        if w is not None:
+            w.scheduler.hold(seconds)
+
+    def _stop_cat_worker(self):
+        """Stop the CatWorker (if any) without waiting for it; it closes the port
+        on its way out. _when_port_closed runs whatever needs the port next."""
+        w = self.cat_worker
+        self.cat_worker = None
+        # Its queued jobs are dropped without callbacks: free the wheel
+        self.freq_display.reset_tune()
+        if w is None:
+            return
+        self._closing_workers.append(w)
+
+        def finished():
+            if w not in self._closing_workers:
+                return
+            self._closing_workers.remove(w)
+            w.deleteLater()
+            if not self._closing_workers:
+                pending, self._after_port_closed = self._after_port_closed, []
+                for callback in pending:
+                    callback()
+
+        w.finished.connect(finished)
+        w.stop()
+        if w.isFinished():
+            finished()    # it was already gone (e.g. the port died under it)
+
+    def _when_port_closed(self, callback):
+        """Run callback once every stopping worker has let go of its port (now if none)."""
+        if self._closing_workers:
+            self._after_port_closed.append(callback)
+        else:
+            callback()
+
+    def closeEvent(self, event):
+        self._cancel_reconnect()
+        if self._finder is not None:
+            self._finder.wait()
+        self._stop_cat_worker()
+        for w in list(self._closing_workers):
+            w.join()    # leave the rig quiet (AI0;) and the port closed before exiting
+        if self.cat_recorder is not None:
+            self.cat_recorder.close()
+        if self._cache_save_timer.isActive():
+            self._cache_save_timer.stop()
+            self.radio_cache.save()
+        super().closeEvent(event)
+
+    @staticmethod
+    def _health_job(link):
+        """Is the radio still there? (scheduler poll)
+
+        Judged from the replies ordinary traffic (IF, RM, FA...) already gets:
+        DEAD_AFTER_MISSES timed-out exchanges in a row means gone. Only when
+        nothing has come back for PROBE_IDLE_SEC does it spend an ID; itself.
+        """
+        if not link.is_open:
+            raise serial.SerialException("Serial port closed")
+        if link.missed < link.DEAD_AFTER_MISSES and time.monotonic() - link.last_reply_at > link.PROBE_IDLE_SEC:
+            link.query("ID;", timeout_sec=0.3)
+        return link.missed < link.DEAD_AFTER_MISSES
+
+    def _on_health_reply(self, alive):
+        if self.cat_worker is None:
+            return  # already handled
+        if alive:
+            self._conn_fail_count = 0
+        else:
+            self._handle_connection_lost("Radio not responding")
+
+    def _on_health_error(self, e):
+        if self.cat_worker is None:
             return
-        
-        try:
-            # Check if port is still open
-            if not self.serial_conn.is_open:
-                self._handle_connection_lost("Serial port closed")
-                return
-            
-            # Try a simple ID query to verify radio is responding
-            # Only do this if we're not in the middle of another operation
-            if time.time() > getattr(self, '_poll_inhibit_until', 0):
-                response = self._cat("ID;", timeout_sec=0.3)
-                
-                if response and response.startswith('ID'):
-                    # Connection is good, reset fail counter
-                    self._conn_fail_count = 0
-                else:
-                    # No response, increment fail counter
-                    self._conn_fail_count = getattr(self, '_conn_fail_count', 0) + 1
-                    
-                    if self._conn_fail_count >= 3:  # 3 consecutive failures
-                        self._handle_connection_lost("Radio not responding")
-                        
-        except serial.SerialException as e:
+        if isinstance(e, serial.SerialException):
             self._handle_connection_lost(f"Serial error: {e}")
-        except Exception as e:
-            self._conn_fail_count = getattr(self, '_conn_fail_count', 0) + 1
-            if self._conn_fail_count >= 3:
-                self._handle_connection_lost(f"Connection error: {e}")
+            return
+        self._conn_fail_count = getattr(self, '_conn_fail_count', 0) + 1
+        if self._conn_fail_count >= 3:
+            self._handle_connection_lost(f"Connection error: {e}")
 
     def _handle_connection_lost(self, reason="Unknown"):
-        """Handle lost connection to radio."""
-        # Stop the monitor to prevent repeated warnings
-        self._stop_connection_monitor()
-        
-        # Stop other pollers
-        self.stop_meter_polling()
-        if hasattr(self, 'freq_timer') and self.freq_timer.isActive():
-            self.freq_timer.stop()
-        if hasattr(self, 'tx_timer') and self.tx_timer.isActive():
-            self.tx_timer.stop()
-        if hasattr(self, 'channel_info_timer') and self.channel_info_timer.isActive():
-            self.channel_info_timer.stop()
-        
-        # Close the serial connection if it exists
-        if self.serial_conn:
-            try:
-                self.serial_conn.close()
-            except:
-                pass
-            self.serial_conn = None
-        
+        """Handle lost connection to radio: reconnect in the background, or tell the user."""
+        # Stop the worker (and with it every poll); it closes the serial connection
+        self._stop_cat_worker()
+
+        # Turn off TX LED
+        if hasattr(self, 'tx_led'):
+            self.tx_led.set_on(False)
+
+        if self.settings_reconnect_check.isChecked() and getattr(self, "_link_params", None):
+            # Keep rig_state, the memory index and the display: they are
+            # re-checked, not rebuilt, once the port is back
+            self.text_display.append(f"\n🚨 CONNECTION LOST: {reason} — reconnecting...\n")
+            self._reconnect_target = self._link_params
+            self._reconnect_attempt = 0
+            self._schedule_reconnect()
+            return
+
         # Update UI
         self.status_label.setText(f"⚠️ CONNECTION LOST: {reason}")
         self.status_label.setStyleSheet("color: #ff6b6b; font-weight: bold; padding: 4px;")
@@ -2085,14 +3588,11 @@ class FT991AController(QWidget):
             }
         """)
         
-        # Turn off TX LED
-        if hasattr(self, 'tx_led'):
-            self.tx_led.set_on(False)
-        
         # Clear channel info display
         if hasattr(self, 'channel_info_label'):
             self.channel_info_label.setText("")
             self._last_channel_info = ""
+        self.rig_state = RigState()
         
         # Show warning popup
         QMessageBox.warning(
@@ -2101,385 +3601,141 @@ class FT991AController(QWidget):
             f"Lost connection to radio!\n\nReason: {reason}\n\nPlease check:\n• Radio is powered on\n• USB cable is connected\n• Correct COM port selected"
         )
 
+    # Reconnect backoff: RECONNECT_FIRST_SEC, doubling up to RECONNECT_MAX_SEC
+    RECONNECT_FIRST_SEC = 0.5
+    RECONNECT_MAX_SEC = 30.0
 
-    def activate_ft8_memory(self, file):
-        """Apply FT8 preset and (optionally) put the rig in DATA-U."""
-        self.text_display.clear()
-
-        if not (self.serial_conn and self.serial_conn.is_open):
-            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
-            return
-
-        try:
-            ser = self.serial_conn
-
-            # Avoid FA poll/update races while we push a bunch of CAT
-            self._poll_inhibit_until = time.time() + 0.6
-
-            # Apply your XML preset
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-            self._apply_settings_from_file(file)
-            self.text_display.append(f"📤 Preset applied from: {file}\n")
-
-            # Many folks run FT8 from VFO — confirm (harmless if already VFO)
-            ok = self._ensure_vfo()
-            self.text_display.append("✅ VFO confirmed.\n" if ok else "⚠️ Could not confirm VFO; continuing.\n")
-
-            # Put the rig into DATA-U for FT8 (comment this out if your XML already sets mode)
-            ser.reset_input_buffer()
-            ser.write(b"MD0C;")  # 0C = DATA-U on FT-991A
-            md_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> MD0C;\n<< {md_ack or '[No Response]'}")
-            except Exception:
-                pass
-
-            # UI
-            self.status_label.setText("🎛️ FT8 preset loaded (DATA-U)")
-            self.status_label.setStyleSheet("color: white; font-weight: bold; padding: 4px;")
-            self.text_display.append("✅ FT8 activated: preset applied + DATA-U set\n")
-
-            # Refresh freq display after things settle
-            QTimer.singleShot(350, self.update_frequency_display)
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to activate FT8:\n{e}")
-
+    def _schedule_reconnect(self):
+        delay = min(self.RECONNECT_MAX_SEC, self.RECONNECT_FIRST_SEC * 2 ** self._reconnect_attempt)
+        port, _ = self._reconnect_target
+        self.status_label.setText(f"🔄 Lost {port}; retry {self._reconnect_attempt + 1} in {delay:.1f} s")
+        self.status_label.setStyleSheet("color: #ffd54f; font-weight: bold; padding: 4px;")
+        self._reconnect_timer.start(int(delay * 1000))
 
-#Default BUTTON
-    def activate_default_memory(self, file):
-        """Load default preset from XML, switch to Memory mode, recall MC004, and verify."""
-        self.text_display.clear()
-        if not (self.serial_conn and self.serial_conn.is_open):
-            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
+    def _try_reconnect(self):
+        """One attempt: ID; on the same port and baud (off the GUI thread), reopen if it answers."""
+        if self._reconnect_target is None or self._connected() or self._finder is not None:
             return
-
-        try:
-            ser = self.serial_conn
-
-            # Avoid poller races while pushing CAT
-            self._poll_inhibit_until = time.time() + 0.7
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-
-            # 1) Apply menu preset from file
-            self._apply_settings_from_file(file)
-            self.text_display.append(f"📤 Preset applied from: {file}\n")
-
-            # 2) Enter Memory mode (no toggle)
-            ser.reset_input_buffer()
-            ser.write(b'VM1;')
-            vm_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> VM1;\n<< {vm_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.12)
-
-            # 3) Recall Memory Channel 004
-            ser.reset_input_buffer()
-            ser.write(b'MC004;')
-            mc_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> MC004;\n<< {mc_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.25)
-
-            # 4) Verify which memory is active and show tag if present
-            ser.reset_input_buffer()
-            ser.write(b"MC;")
-            state = self.read_until_semicolon()
-
-            actual = 4
-            if state.startswith("MC") and len(state) >= 5 and state[2:5].isdigit():
-                ch = int(state[2:5])
-                if ch != 0:
-                    actual = ch
-
-            tag = self.read_memory_tag(actual)
-            nice = f"🎛️ Default preset loaded (MC{actual:03d}" + (f" — {tag})" if tag else ")")
-
-            # 5) UI updates
-            self.status_label.setText(nice)
-            self.status_label.setStyleSheet("color: white; font-weight: bold; padding: 4px;")
-            self.text_display.append("✅ Default activated: preset applied and memory recalled\n")
-
-            # 6) Refresh freq display once things settle
-            QTimer.singleShot(350, self.update_frequency_display)
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to activate Default:\n{e}")
-
-    def activate_default2_memory(self, file):
-        """Load default preset from XML, switch to Memory mode, recall MC059, and verify."""
-        self.text_display.clear()
-        if not (self.serial_conn and self.serial_conn.is_open):
-            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
+        if self._closing_workers:
+            self._when_port_closed(self._try_reconnect)
             return
+        port, baud = self._reconnect_target
+        self._finder = RigFinder([baud], line_level(self.settings_dtr_combo.currentText()),
+                                 line_level(self.settings_rts_combo.currentText()), self, ports=[port])
+
+        def found(result):
+            self._finder.wait()
+            self._finder = None
+            if self._reconnect_target is None:
+                return    # cancelled meanwhile
+            if result is not None:
+                try:
+                    self._open_radio(port, baud, warm=True)
+                except Exception:
+                    result = None
+            if result is None:
+                self._reconnect_attempt += 1
+                self._schedule_reconnect()
+                return
+            self.text_display.append(f"🔌 Reconnected to {port} after {self._reconnect_attempt + 1} "
+                                     f"attempt{'s' if self._reconnect_attempt else ''}")
+            self._reconnect_target = None
 
-        try:
-            ser = self.serial_conn
-
-            # Avoid poller races while pushing CAT
-            self._poll_inhibit_until = time.time() + 0.7
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-
-            # 1) Apply menu preset from file
-            self._apply_settings_from_file(file)
-            self.text_display.append(f"📤 Preset applied from: {file}\n")
-
-            # 2) Enter Memory mode (no toggle)
-            ser.reset_input_buffer()
-            ser.write(b'VM1;')
-            vm_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> VM1;\n<< {vm_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.12)
-
-            # 3) Recall Memory Channel 058
-            ser.reset_input_buffer()
-            ser.write(b'MC059;')
-            mc_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> MC058;\n<< {mc_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.25)
-
-            # 4) Verify which memory is active and show tag if present
-            ser.reset_input_buffer()
-            ser.write(b"MC;")
-            state = self.read_until_semicolon()
-
-            actual = 58
-            if state.startswith("MC") and len(state) >= 5 and state[2:5].isdigit():
-                ch = int(state[2:5])
-                if ch != 0:
-                    actual = ch
-
-            tag = self.read_memory_tag(actual)
-            nice = f"🎛️ Default 2 preset loaded (MC{actual:03d}" + (f" — {tag})" if tag else ")")
-
-            # 5) UI updates
-            self.status_label.setText(nice)
-            self.status_label.setStyleSheet("color: white; font-weight: bold; padding: 4px;")
-            self.text_display.append("✅ Default 2 activated: preset applied and memory 058 recalled\n")
-
-            # 6) Refresh freq display after the rig settles
-            QTimer.singleShot(350, self.update_frequency_display)
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to activate Default 2:\n{e}")
-
+        self._finder.found.connect(found)
+        self._finder.start()
 
+    def _cancel_reconnect(self):
+        self._reconnect_target = None
+        self._reconnect_timer.stop()
 
 
-    def _poll_tx_status(self):
-        """Update the TX LED based on CAT status."""
-        # No CAT? ensure LED is off.
-        if not (self.serial_conn and self.serial_conn.is_open):
-            if hasattr(self, "tx_led"):
-                self.tx_led.set_on(False)
-            return
 
-        # Skip if we're in poll inhibit window
-        if time.time() < getattr(self, '_poll_inhibit_until', 0):
-            return
+### OPERATING MODE PRESETS (presets/operating_modes.json)
 
-        try:
-            # Method 1: Use IF; command - TX status is at position 28 (0-indexed) in FT-991A
-            if_reply = self._cat("IF;")
-            
-            is_tx = None
-            
-            # FT-991A IF response format: IF[freq 11][clar +/-][clar offset 4][rit][xit][0][mem ch][ctcss][00][mode][vfo][ctcss][00][pwr]
-            # Position 28 (after IF prefix) is typically TX status: 0=RX, 1=TX
-            if if_reply and if_reply.startswith("IF") and len(if_reply) >= 32:
-                payload = if_reply[2:-1]  # Strip "IF" and ";"
-                # TX status is at position 28 in the payload for FT-991A
-                if len(payload) > 28:
-                    tx_char = payload[28]
-                    if tx_char == '1':
-                        is_tx = True
-                    elif tx_char == '0':
-                        is_tx = False
-
-            # Method 2: Fallback - check power meter
-            if is_tx is None:
-                rm = self._cat("RM5;")
-                raw = 0
-                if rm.startswith("RM5") and len(rm) >= 6 and rm[3:6].isdigit():
-                    raw = int(rm[3:6])  # 0..255
-                is_tx = (raw >= 10)  # If power output > threshold, we're transmitting
-
-            # Update LED
-            self.tx_led.set_on(bool(is_tx))
+    def _lint_presets(self):
+        """Parse and check every preset up front; list the ones that won't be sent."""
+        for error in self.preset_cache.preload().values():
+            self.text_display.append(f"⚠️ Preset rejected: {error}")
 
-        except Exception:
-            # On any error, just show not transmitting
-            self.tx_led.set_on(False)
+    def _compile_operating_mode(self, mode):
+        """PresetPlan for an OperatingMode; the menu part comes from the PresetCache."""
+        preset = self.preset_cache.get(PRESETS_DIR / mode.menus) if mode.menus else None
+        return PresetPlan(preset.items if preset else (), preset.commands if preset else (),
+                          mode.memory, mode.mode)
 
-### WIRES-X BUTTON
+    def activate_preset(self, name):
+        """Apply an operating mode: changed menus, memory recall (or VFO), mode, checks.
 
-    def activate_wiresx_memory(self, file):
-        """Apply WIRES-X preset from XML, switch to Memory mode, recall MC001, and verify."""
+        The whole plan is one worker job, so pollers can't interleave with it.
+        Returns the worker Future, or None.
+        """
+        mode = self.operating_modes[name]
         self.text_display.clear()
-        if not (self.serial_conn and self.serial_conn.is_open):
+        if not self._connected():
             QMessageBox.warning(self, "Warning", "Connect to the radio first.")
-            return
-
+            return None
         try:
-            ser = self.serial_conn
-#Avoid poller races while pushing CAT
-            self._poll_inhibit_until = time.time() + 0.7
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-
-            # 1) Apply menu preset from file
-            self._apply_settings_from_file(file)
-            self.text_display.append(f"📤 Preset applied from: {file}\n")
-
-            # 2) Enter Memory mode (no toggle)
-            ser.reset_input_buffer()
-            ser.write(b'VM1;')
-            vm_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> VM1;\n<< {vm_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.12)
-
-            # 3) Recall WIRES-X memory channel 001
-            ser.reset_input_buffer()
-            ser.write(b'MC001;')
-            mc_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> MC001;\n<< {mc_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.25)
-
-            # 5) Verify which memory is actually active and show tag if present
-            ser.reset_input_buffer()
-            ser.write(b"MC;")
-            state = self.read_until_semicolon()
-
-            actual = 1
-            if state.startswith("MC") and len(state) >= 5 and state[2:5].isdigit():
-                ch = int(state[2:5])
-                if ch != 0:
-                    actual = ch
-
-            tag = self.read_memory_tag(actual)
-            nice = f"📡 WIRES-X memory MC{actual:03d}" + (f" — {tag}" if tag else "")
-
-            # 6) UI updates
-            self.status_label.setText(nice)
-            self.status_label.setStyleSheet("color: white; font-weight: bold; padding: 4px;")
-            self.text_display.append("✅ WIRES-X activated: memory recalled and preset applied\n")
-
-            # 7) Refresh freq display once things settle
-            QTimer.singleShot(350, self.update_frequency_display)
-
+            plan = self._compile_operating_mode(mode)
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to activate WIRES-X:\n{e}")
-
-
-
-### SSB 40 meter band 
-    def activate_ssb_memory(self, file):
-        """Apply SSB preset from XML, switch to Memory mode, recall MC060 (40m SSB) and verify."""
-        self.text_display.clear()
-        if not (self.serial_conn and self.serial_conn.is_open):
-            QMessageBox.warning(self, "Warning", "Connect to the radio first.")
-            return
-        try:
-            ser = self.serial_conn
-
-# Avoid poller races while pushing CAT
-            self._poll_inhibit_until = time.time() + 0.8
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
-
-            # 1) Apply menu preset from file
-            self._apply_settings_from_file(file)
-            self.text_display.append(f"📤 Preset applied from: {file}\n")
-
-            # 2) Enter Memory mode (no toggle)
-            ser.reset_input_buffer()
-            ser.write(b'VM1;')
-            vm_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> VM1;\n<< {vm_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.12)
-
-            # 3) Recall memory channel 060 (40m SSB)
-            ser.reset_input_buffer()
-            ser.write(b'MC060;')
-            mc_ack = self.read_until_semicolon()
-            try:
-                self.cat_response_display.append(f">> MC060;\n<< {mc_ack or '[No Response]'}")
-            except Exception:
-                pass
-            time.sleep(0.25)
+            QMessageBox.critical(self, "Error", f"Failed to load preset: {e}")
+            self.status_label.setText("Error loading preset")
+            self.status_label.setStyleSheet("color: red; font-weight: bold; padding: 4px;")
+            return None
 
-            # 4) If mode didn't come from memory/preset, ensure 40m SSB = LSB (MD00)
-            ser.reset_input_buffer()
-            ser.write(b"MD;")
-            md = self.read_until_semicolon()
-            if not (md.startswith("MD") and len(md) >= 4 and md[2:4] == "00"):
-                ser.reset_input_buffer()
-                ser.write(b"MD00;")  # LSB
-                md_ack = self.read_until_semicolon()
-                try:
-                    self.cat_response_display.append(f">> MD00;\n<< {md_ack or '[No Response]'}")
-                except Exception:
-                    pass
-                time.sleep(0.12)
+        self.progress_bar.setValue(0)
+        if plan.menus:
+            self.text_display.append(f"📤 Applying {len(plan.menus)} menu settings from {mode.menus}...\n")
 
-            # 5) Verify actual memory and show tag
-            ser.reset_input_buffer()
-            ser.write(b"MC;")
-            state = self.read_until_semicolon()
-            actual = 60
-            if state.startswith("MC") and len(state) >= 5 and state[2:5].isdigit():
-                ch = int(state[2:5])
-                if ch != 0:
-                    actual = ch
-
-            tag = self.read_memory_tag(actual)
-            nice = f"🎙️ SSB preset loaded (MC{actual:03d})" + (f" — {tag}" if tag else "")
+        def done(result):
+            changed, channel, tag, md = result
+            self.progress_bar.setValue(100)
+            self._cache_menus(dict(changed))
+            mode_name = CAT_MODE_NAMES.get(md[3:4], "?") if md else "?"
+            if channel:
+                nice = f"{mode.icon} {mode.title} → MC{channel:03d}" + (f" — {tag}" if tag else "")
+                if channel != plan.memory:
+                    self.text_display.append(f"⚠️ Asked for MC{plan.memory:03d}, rig is on MC{channel:03d}")
+            else:
+                nice = f"{mode.icon} {mode.title} (VFO, {mode_name})"
             self.status_label.setText(nice)
             self.status_label.setStyleSheet("color: white; font-weight: bold; padding: 4px;")
-            self.text_display.append("✅ SSB activated: preset applied and memory recalled\n")
+            self.text_display.append(f"✅ {mode.title} activated: {len(changed)} of {len(plan.menus)} "
+                                     f"menus changed, {'memory recalled' if channel else 'VFO'}, {mode_name}\n")
+            self.update_frequency_display()
 
-            # 6) Refresh frequency after things settle
-            QTimer.singleShot(350, self.update_frequency_display)
+        return self._cat_submit(lambda link: link.run_plan(plan), on_done=done,
+                                on_error=lambda e: QMessageBox.critical(self, "Error", f"Failed to activate {mode.title}:\n{e}"))
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to activate SSB:\n{e}")
 
 
 
 
 ######################################################CAT
     def send_cat_command(self):
-        if not self.serial_conn:
+        if not self._connected():
             return
         cmd = self.cat_input.text().strip()
         if not cmd.endswith(";"):
             cmd += ";"
-        self.serial_conn.write(cmd.encode())
-        time.sleep(0.2)
-        resp = self.serial_conn.read_all().decode(errors="ignore")
-        self.cat_response_display.append(f">> {cmd}\n<< {resp if resp else '[No Response]'}")
+
+        # Known sets (e.g. one CO write per contour-slider tick) are only answered
+        # to reject them: listen just long enough for a '?;'. Anything else,
+        # unknown opcodes and several commands at once included, gets the full window
+        cmds = [c + ";" for c in cmd.split(";") if c]
+        sets_only = all(c[:2] in CAT_READ_FORMS and not cat_expects_reply(c) for c in cmds)
+
+        def job(link):
+            link.write(cmd.encode())
+            frames = link.read_frames(link.wire_time(len(cmd) + 2) + 0.05 if sets_only else 0.2)
+            # Whatever is still buffered answers this command, not the next query
+            frame = link.read_frame(0)
+            while frame:
+                frames.append(frame)
+                frame = link.read_frame(0)
+            return "".join(frames)
+
+        self._cat_submit(job, on_done=lambda resp: self.cat_response_display.append(
+            f">> {cmd}\n<< {resp if resp else '[No Response]'}"))
 
 
     def connect_cat_send(self):
@@ -2497,86 +3753,75 @@ class FT991AController(QWidget):
 
 #load all menus
     def load_all_menus(self):
-        if not (self.serial_conn and self.serial_conn.is_open):
+        if not self._connected():
             QMessageBox.warning(self, "Warning", "Connect to the radio first.")
             return
 
-        # Pause pollers so RM*/FA; don't collide with EX; responses
-        was_meter_running = hasattr(self, "meter_timer") and self.meter_timer.isActive()
-        was_freq_running  = hasattr(self, "freq_timer") and self.freq_timer.isActive()
-        try:
-            if was_meter_running:
-                self.meter_timer.stop()
-            if was_freq_running:
-                self.freq_timer.stop()
-
-            total = len(MENU_DESCRIPTIONS)
-            self.progress_bar.setValue(0)
+        self.progress_bar.setValue(0)
+        self.text_display.clear()
+        # The values checked on connect (or read/written since) right away; the dump replaces them
+        known = self._known_menus
+        if known:
+            self.text_display.append(f"🗄️ Last known values ({len(known)} of {len(MENU_DESCRIPTIONS)}), "
+                                     "reading the radio...\n")
+            self._show_menu_values([MenuValue(num, desc, known.get(num, "----"))
+                                    for num, (desc, _, _) in MENU_DESCRIPTIONS.items()])
+
+        def done(values):
             self.text_display.clear()
-
-            # Root tag should be a name, not a filename
-            root = ET.Element("YaesuMenuItems")
-
-            for idx, (num, (desc, opt_range, unit)) in enumerate(MENU_DESCRIPTIONS.items()):
-                cmd = f"EX{num};"
-
-                # Send query & read a single CAT frame
-                self.serial_conn.reset_input_buffer()
-                self.serial_conn.write(cmd.encode("ascii"))
-                decoded = self.read_until_semicolon()  # returns a str like "EXnnnvvvv;"
-
-                # Build XML node
-                menu = ET.SubElement(root, "YaesuFT991A_MenuItems")
-                ET.SubElement(menu, "MENU_NUMBER").text = num
-                ET.SubElement(menu, "DESCRIPTION").text = desc
-
-                # Parse value safely: "EX" (2) + number (3) = 5 chars header
-                val = "----"
-                if decoded.startswith(f"EX{num}") and decoded.endswith(";") and len(decoded) >= 6:
-                    val = decoded[5:-1] or "----"   # strip "EXnnn" and trailing ';'
-
-                ET.SubElement(menu, "MENU_VALUE").text = val
-
-                # UI line
-                unit_str = f" {unit}" if unit else ""
-                line = f"{num}\t{val}{unit_str}  {desc}    ({opt_range})"
-                self.text_display.append(line)
-
-                # Progress
-                pct = int((idx + 1) / total * 100)
-                self.progress_bar.setValue(pct)
-                QApplication.processEvents()
+            self._show_menu_values(values)
+            root = self._menu_dump_xml(values)
 
             # Optionally stash the XML tree on self for later save
             self._last_menu_dump = root
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed while reading menus:\n{e}")
-        finally:
-            # Resume pollers
-            if was_meter_running:
-                self.meter_timer.start(200)
-            if was_freq_running:
-                self.freq_timer.start(500)
+# Ask the user if they want to save the settings
+            choice = QMessageBox.question(
+                self,
+                "Save Settings",
+                "Do you want to save these settings to a file?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.Yes
+            )
 
+            if choice == QMessageBox.Yes:
+                filename, _ = QFileDialog.getSaveFileName(
+                    self, "Save Settings to File", "FT991A_Backup.xml", "XML Files (*.xml)"
+                )
+                if filename:
+                    tree = ET.ElementTree(root)
+                    tree.write(filename, encoding="utf-8", xml_declaration=True)
+                    self.text_display.append(f"\n📁 Settings saved to: {filename}")
+
+        self._dump_menus(done)
+
+    def _show_menu_values(self, values):
+        """List [MenuValue] in the Activity Log, one menu per line."""
+        for num, desc, val in values:
+            _, opt_range, unit = MENU_DESCRIPTIONS[num]
+            unit_str = f" {unit}" if unit else ""
+            self.text_display.append(f"{num}\t{val}{unit_str}  {desc}    ({opt_range})")
+
+    def _dump_menus(self, on_done):
+        """Run one pipelined menu dump on the worker; on_done gets the [MenuValue] list."""
+        def done(values):
+            self.progress_bar.setValue(100)
+            self._cache_menus({v.num: v.value for v in values})
+            on_done(values)
 
-# Ask the user if they want to save the settings
-        choice = QMessageBox.question(
-            self,
-            "Save Settings",
-            "Do you want to save these settings to a file?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.Yes
-        )
+        self._cat_submit(lambda link: link.dump_menus(), on_done=done,
+                         on_error=lambda e: QMessageBox.critical(self, "Error", f"Failed while reading menus:\n{e}"))
 
-        if choice == QMessageBox.Yes:
-            filename, _ = QFileDialog.getSaveFileName(
-                self, "Save Settings to File", "FT991A_Backup.xml", "XML Files (*.xml)"
-            )
-            if filename:
-                tree = ET.ElementTree(root)
-                tree.write(filename, encoding="utf-8", xml_declaration=True)
-                self.text_display.append(f"\n📁 Settings saved to: {filename}")
+    @staticmethod
+    def _menu_dump_xml(values):
+        """Build the preset XML tree (same layout as presets/*.xml) from a menu dump."""
+        root = ET.Element("YaesuMenuItems.xml")
+        for num, desc, val in values:
+            menu = ET.SubElement(root, "YaesuFT991A_MenuItems")
+            ET.SubElement(menu, "MENU_NUMBER").text = num
+            ET.SubElement(menu, "DESCRIPTION").text = desc
+            ET.SubElement(menu, "MENU_VALUE").text = val
+        return root
 
 
 
@@ -2587,16 +3832,12 @@ class FT991AController(QWidget):
 
     #DISCONNECT BTN
     def disconnect_from_radio(self):
-        # Stop connection monitor first
-        self._stop_connection_monitor()
-        
-        # Stop channel info timer
-        if hasattr(self, 'channel_info_timer') and self.channel_info_timer.isActive():
-            self.channel_info_timer.stop()
-        
-        if self.serial_conn and self.serial_conn.is_open:
-            self.serial_conn.close()
-            self.serial_conn = None
+        if self._reconnect_target is not None:
+            self._cancel_reconnect()
+            self.status_label.setText("Disconnected")
+            self.text_display.append("🔌 Stopped reconnecting")
+        if self._connected():
+            self._stop_cat_worker()
             # Reset connect button to default green style
             self.connect_btn.setStyleSheet("""
                 QPushButton {
@@ -2623,41 +3864,35 @@ class FT991AController(QWidget):
             if hasattr(self, 'channel_info_label'):
                 self.channel_info_label.setText("")
                 self._last_channel_info = ""
+            self.rig_state = RigState()
 
     
     ### V/M mode      
 
     def set_vm_mode(self):
         """Toggle between VFO and Memory, verifying with MC; afterwards."""
-        if not (self.serial_conn and self.serial_conn.is_open):
+        if not self._connected():
             QMessageBox.warning(self, "Warning", "Connect to the radio first.")
             return
 
-        # Pause pollers so replies don't collide
-        was_meter_running = hasattr(self, "meter_timer") and self.meter_timer.isActive()
-        was_freq_running  = hasattr(self, "freq_timer") and self.freq_timer.isActive()
-        try:
-            if was_meter_running: self.meter_timer.stop()
-            if was_freq_running:  self.freq_timer.stop()
-
-            ser = self.serial_conn
-            ser.reset_input_buffer()
-
+        # One worker job, so poller replies can't collide with ours
+        def job(link):
             # 1) Check current state
-            ser.write(b"MC;")
-            before = self.read_until_semicolon() or ""
+            before = link.query(b"MC;") or ""
             in_vfo = before.startswith("MC") and len(before) >= 5 and before[2:5] == "000"
 
-            # 2) Send the opposite mode (toggle)
+            # 2) Send the opposite mode (toggle) and check it in the same write
             target_cmd = b"VM1;" if in_vfo else b"VM0;"   # VM1 = Memory, VM0 = VFO
-            ser.reset_input_buffer()
-            ser.write(target_cmd)
-            time.sleep(0.12)
+            switched = lambda r: r.startswith("MC") and (r[2:5] == "000") != in_vfo
+            after = link.transact([target_cmd.decode('ascii'), "MC;"])[1]
 
-            # 3) Verify
-            ser.reset_input_buffer()
-            ser.write(b"MC;")
-            after = self.read_until_semicolon() or ""
+            # 3) Verify (as soon as MC; reflects the switch)
+            if not switched(after):
+                _, after = link.wait_until("MC;", switched, deadline=0.4)
+            return before, in_vfo, target_cmd, after
+
+        def done(result):
+            before, in_vfo, target_cmd, after = result
             now_vfo = after.startswith("MC") and len(after) >= 5 and after[2:5] == "000"
 
             # 4) UI/log updates
@@ -2679,34 +3914,20 @@ class FT991AController(QWidget):
             if in_vfo == now_vfo:
                 self.text_display.append("⚠️ Could not confirm a mode change (state unchanged).")
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to switch VFO/MEM: {e}")
-        finally:
-            if was_meter_running: self.meter_timer.start(200)
-            if was_freq_running:  self.freq_timer.start(500)
+        self._cat_submit(job, on_done=done,
+                         on_error=lambda e: QMessageBox.critical(self, "Error", f"Failed to switch VFO/MEM: {e}"))
 
     def test_radio_response(self):
-        """Send ID; and report the radio's response. Returns True on valid reply."""
-        if not (self.serial_conn and self.serial_conn.is_open):
+        """Send ID; and report the radio's response. Returns the queued Future, or None."""
+        if not self._connected():
             QMessageBox.warning(self, "Warning", "Connect to the radio first.")
-            return False
-
-        # Pause pollers to avoid interleaved CAT frames
-        was_meter_running = hasattr(self, "meter_timer") and self.meter_timer.isActive()
-        was_freq_running  = hasattr(self, "freq_timer") and self.freq_timer.isActive()
-
-        try:
-            if was_meter_running: self.meter_timer.stop()
-            if was_freq_running:  self.freq_timer.stop()
-
-            ser = self.serial_conn
-            ser.reset_input_buffer()
-            ser.reset_output_buffer()
+            return None
 
+        def job(link):
             # Send and read one full CAT frame (terminated by ';')
-            ser.write(b'ID;')
-            resp = self.read_until_semicolon()
+            return link.query(b'ID;')
 
+        def done(resp):
             # Log TX/RX to the CAT terminal
             self.cat_response_display.append(f">> ID;\n<< {resp if resp else '[No Response]'}")
 
@@ -2715,19 +3936,13 @@ class FT991AController(QWidget):
                 self.text_display.append(f"✅ Test response from radio: {resp} (ID={ident})")
                 self.status_label.setText("Radio responded to test command")
                 self.status_label.setStyleSheet("color: darkgreen; font-weight: bold; padding: 4px;")
-                return True
             else:
                 self.text_display.append("⚠️ No valid response to ID;")
                 self.status_label.setText("No response to test")
                 self.status_label.setStyleSheet("color: red; font-weight: bold; padding: 4px;")
-                return False
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Test failed: {e}")
-            return False
-        finally:
-            if was_meter_running: self.meter_timer.start(200)
-            if was_freq_running:  self.freq_timer.start(500)
+        return self._cat_submit(job, on_done=done,
+                                on_error=lambda e: QMessageBox.critical(self, "Error", f"Test failed: {e}"))
 
 
 ##  Load from XML file
@@ -2740,38 +3955,41 @@ class FT991AController(QWidget):
             self._apply_settings_from_file(filename)
 
     def _apply_settings_from_file(self, file):
-        if not self.serial_conn or not self.serial_conn.is_open:
+        """Queue the EX writes from an XML preset. Returns the worker Future, or None."""
+        if not self._connected():
             QMessageBox.warning(self, "Warning", "Connect to the radio first.")
-            return
+            return None
         try:
-            tree = ET.parse(file)
-            root = tree.getroot()
-            items = root.findall("YaesuFT991A_MenuItems")
-            total = len(items)
-            self.progress_bar.setValue(0)
-            self.text_display.append(f"\n📤 Uploading {total} menu settings from {file}...\n")
-
-            for idx, item in enumerate(items):
-                num = item.find("MENU_NUMBER").text.strip().zfill(3)
-                val = item.find("MENU_VALUE").text.strip()
-                cmd = f"EX{num}{val};"
-                self.serial_conn.write(cmd.encode())
-                self.text_display.append(f"⏩ Sent: {num} → {val}")
-                self.progress_bar.setValue(int((idx + 1) / total * 100))
-                self.progress_bar.repaint()
-                QApplication.processEvents()      
-                time.sleep(0.02)
+            preset = self.preset_cache.get(file)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load preset: {e}")
+            self.status_label.setText("Error loading preset")
+            self.status_label.setStyleSheet("color: red; font-weight: bold; padding: 4px;")
+            return None
+
+        total = len(preset.items)
+        self.progress_bar.setValue(0)
+        self.text_display.append(f"\n📤 Applying {total} menu settings from {file}...\n")
 
+        def job(link):
+            return link.apply_menus(preset.items, preset.commands)
+
+        def done(changed):
             self.progress_bar.setValue(100)
+            self._cache_menus(dict(changed))
+            self.text_display.append(f"📤 {len(changed)} of {total} menus differed and were sent\n")
             self.status_label.setText(f"✅ Preset loaded from {file.split('/')[-1]}")
             self.status_label.setStyleSheet("color: black; font-weight: bold; padding: 4px;")
-        except Exception as e:
+
+        def failed(e):
             QMessageBox.critical(self, "Error", f"Failed to load preset: {e}")
             self.status_label.setText("Error loading preset")
             self.status_label.setStyleSheet("color: red; font-weight: bold; padding: 4px;")
+
+        return self._cat_submit(job, on_done=done, on_error=failed)
     
     def save_radio_to_file(self):
-        if not self.serial_conn or not self.serial_conn.is_open:
+        if not self._connected():
             QMessageBox.warning(self, "Warning", "Connect to the radio before saving.")
             self.status_label.setStyleSheet("color: red; font-weight: bold; padding: 4px;")
             self.status_label.setText("Not connected")
@@ -2781,40 +3999,16 @@ class FT991AController(QWidget):
         if not filename:
             return
 
-        root = ET.Element("YaesuMenuItems.xml")
-        total = len(MENU_DESCRIPTIONS)
-
-        for idx, (num, (desc, _, _)) in enumerate(MENU_DESCRIPTIONS.items()):
-            menu = ET.SubElement(root, "YaesuFT991A_MenuItems")
-            ET.SubElement(menu, "MENU_NUMBER").text = num
-            ET.SubElement(menu, "DESCRIPTION").text = desc
+        self.progress_bar.setValue(0)
 
-            cmd = f"EX{num};"
-            self.serial_conn.reset_input_buffer()
-            self.serial_conn.write(cmd.encode('ascii'))
-            response = b""
-            timeout = time.time() + 0.5
-            while time.time() < timeout:
-                part = self.serial_conn.read(1)
-                if part:
-                    response += part
-                    if part == b';':
-                        break
-            decoded = response.decode(errors='ignore').strip()
-
-            if decoded.startswith(f"EX{num}"):
-                val = decoded[5:]
-            else:
-                val = "----"
+        def done(values):
+            tree = ET.ElementTree(self._menu_dump_xml(values))
+            tree.write(filename, encoding="utf-8", xml_declaration=True)
+            self.text_display.append(f"📁 Settings saved to: {filename}\n")
+            self.status_label.setText("Radio settings saved to file")
 
-            ET.SubElement(menu, "MENU_VALUE").text = val
-            self.text_display.append(f"Read Menu {num} → {val} ({desc})")
-            self.progress_bar.setValue(int((idx + 1) / total * 100))
+        self._dump_menus(done)
 
-        tree = ET.ElementTree(root)
-        tree.write(filename, encoding="utf-8", xml_declaration=True)
-        self.text_display.append(f"📁 Settings saved to: {filename}\n")
-        self.status_label.setText("Radio settings saved to file")
 
     def _build_settings_tab(self):
         """Build the Settings tab with serial port configuration"""
@@ -2851,6 +4045,8 @@ class FT991AController(QWidget):
         serial_layout.addWidget(cat_label, 0, 0)
         
         self.settings_cat_combo = QComboBox()
+        # Editable so a port the OS doesn't list (a pty from cat_sim.py, /dev/ttyUSB0...) can be typed in
+        self.settings_cat_combo.setEditable(True)
         self._populate_com_ports(self.settings_cat_combo)
         serial_layout.addWidget(self.settings_cat_combo, 0, 1)
         
@@ -2884,12 +4080,77 @@ class FT991AController(QWidget):
         self.settings_dtr_combo.setCurrentText("Off")
         serial_layout.addWidget(self.settings_dtr_combo, 3, 1)
         
-        # Refresh ports button
+        # AI1 push mode
+        ai_label = QLabel("Auto-Info:")
+        ai_label.setStyleSheet("color: #a0c4ff;")
+        serial_layout.addWidget(ai_label, 4, 0)
+
+        self.settings_ai_check = QCheckBox("AI1 push (rig reports FA/IF/MD; only meters are polled)")
+        self.settings_ai_check.setChecked(False)
+        self.settings_ai_check.toggled.connect(self._apply_ai_mode)
+        serial_layout.addWidget(self.settings_ai_check, 4, 1)
+
+        # Discovery mode
+        find_label = QLabel("Auto-detect:")
+        find_label.setStyleSheet("color: #a0c4ff;")
+        serial_layout.addWidget(find_label, 5, 0)
+
+        self.settings_autodetect_check = QCheckBox("Find the radio on connect (ID; on every port and baud)")
+        self.settings_autodetect_check.setChecked(False)
+        serial_layout.addWidget(self.settings_autodetect_check, 5, 1)
+
+        # Reconnect in the background instead of a "Connection Lost" dialog
+        reconnect_label = QLabel("Reconnect:")
+        reconnect_label.setStyleSheet("color: #a0c4ff;")
+        serial_layout.addWidget(reconnect_label, 6, 0)
+
+        self.settings_reconnect_check = QCheckBox("Reopen the port automatically if the radio drops out")
+        self.settings_reconnect_check.setChecked(True)
+        serial_layout.addWidget(self.settings_reconnect_check, 6, 1)
+
+        # Refresh ports / find radio buttons
         refresh_btn = QPushButton("🔄 Refresh Ports")
         refresh_btn.clicked.connect(self._refresh_com_ports)
-        serial_layout.addWidget(refresh_btn, 4, 0, 1, 2)
+        serial_layout.addWidget(refresh_btn, 7, 0)
+
+        find_btn = QPushButton("🔍 Find Radio")
+        find_btn.clicked.connect(lambda: self.find_radio())
+        serial_layout.addWidget(find_btn, 7, 1)
         
         layout.addWidget(serial_group)
+
+        # Polling Group (periods are what you ask for; slow links stretch them)
+        poll_group = QGroupBox("⏱️ CAT Polling")
+        poll_group.setStyleSheet(serial_group.styleSheet())
+        poll_layout = QGridLayout(poll_group)
+        poll_layout.setSpacing(10)
+
+        self.settings_poll_spins = {}
+        for row, (name, text, default) in enumerate((
+                ("rig_state", "Frequency / channel (ms):", self.FREQ_POLL_MS),
+                ("meters", "S / PWR meters (ms):", self.METER_POLL_MS),
+                ("health", "Health check (ms):", self.HEALTH_POLL_MS))):
+            label = QLabel(text)
+            label.setStyleSheet("color: #a0c4ff;")
+            poll_layout.addWidget(label, row, 0)
+            spin = QSpinBox()
+            spin.setRange(100, 10000)
+            spin.setSingleStep(50)
+            spin.setValue(default)
+            spin.valueChanged.connect(self._apply_poll_settings)
+            poll_layout.addWidget(spin, row, 1)
+            self.settings_poll_spins[name] = spin
+
+        budget_label = QLabel("Bus budget for polls (%):")
+        budget_label.setStyleSheet("color: #a0c4ff;")
+        poll_layout.addWidget(budget_label, 3, 0)
+        self.settings_budget_spin = QSpinBox()
+        self.settings_budget_spin.setRange(10, 90)
+        self.settings_budget_spin.setValue(self.POLL_BUDGET_PCT)
+        self.settings_budget_spin.valueChanged.connect(self._apply_poll_settings)
+        poll_layout.addWidget(self.settings_budget_spin, 3, 1)
+
+        layout.addWidget(poll_group)
         
         # Default Preset Paths Group
         paths_group = QGroupBox("📂 Preset File Paths")
@@ -2958,10 +4219,13 @@ class FT991AController(QWidget):
     
     def _populate_com_ports(self, combo):
         """Populate a combo box with available COM ports"""
+        typed = combo.currentText()
         combo.clear()
         ports = [port.device for port in serial.tools.list_ports.comports()]
         combo.addItems(ports)
-        if "COM11" in ports:
+        if typed:
+            combo.setCurrentText(typed)   # keep a hand-typed port across refreshes
+        elif "COM11" in ports:
             combo.setCurrentText("COM11")
     
     def _refresh_com_ports(self):
@@ -3193,6 +4457,12 @@ class FT991AController(QWidget):
             "baud_rate": self.settings_baud_combo.currentText(),
             "rts_mode": self.settings_rts_combo.currentText(),
             "dtr_mode": self.settings_dtr_combo.currentText(),
+            "ai_push": self.settings_ai_check.isChecked(),
+            "auto_detect": self.settings_autodetect_check.isChecked(),
+            "auto_reconnect": self.settings_reconnect_check.isChecked(),
+            "record_traffic": self.cat_record_check.isChecked(),
+            "poll_ms": {name: spin.value() for name, spin in self.settings_poll_spins.items()},
+            "poll_budget_pct": self.settings_budget_spin.value(),
             "default_com": self.settings_default_com.text(),
         }
         try:
@@ -3221,6 +4491,8 @@ class FT991AController(QWidget):
                 idx = self.settings_cat_combo.findText(settings["cat_port"])
                 if idx >= 0:
                     self.settings_cat_combo.setCurrentIndex(idx)
+                elif settings["cat_port"]:
+                    self.settings_cat_combo.setCurrentText(settings["cat_port"])
             
             if "baud_rate" in settings:
                 self.settings_baud_combo.setCurrentText(settings["baud_rate"])
@@ -3231,6 +4503,25 @@ class FT991AController(QWidget):
             if "dtr_mode" in settings:
                 self.settings_dtr_combo.setCurrentText(settings["dtr_mode"])
             
+            if "ai_push" in settings:
+                self.settings_ai_check.setChecked(bool(settings["ai_push"]))
+
+            if "auto_detect" in settings:
+                self.settings_autodetect_check.setChecked(bool(settings["auto_detect"]))
+
+            if "auto_reconnect" in settings:
+                self.settings_reconnect_check.setChecked(bool(settings["auto_reconnect"]))
+
+            if "record_traffic" in settings:
+                self.cat_record_check.setChecked(bool(settings["record_traffic"]))
+
+            for name, ms in settings.get("poll_ms", {}).items():
+                if name in self.settings_poll_spins:
+                    self.settings_poll_spins[name].setValue(int(ms))
+
+            if "poll_budget_pct" in settings:
+                self.settings_budget_spin.setValue(int(settings["poll_budget_pct"]))
+
             if "default_com" in settings:
                 self.settings_default_com.setText(settings["default_com"])
             
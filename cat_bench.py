@@ -0,0 +1,327 @@
+"""
+End-to-end CAT benchmark: drives the real KAT window (offscreen) against the
+cat_sim.py FT-991A simulator and times what an operator does.
+
+Scenarios, in order:
+    connect          Connect until the first frequency is on screen
+    load_all_menus   Full 153-menu dump
+    preset:<name>    Every Mode Presets button (presets/operating_modes.json)
+    memory_walk      Memory ▶ through every programmed (sparse) channel
+    wheel_tuning     100 mouse-wheel notches on the 1 kHz digit
+    idle_polling     Connected and doing nothing (--idle-sec, default 60)
+
+For each: wall time, round trips (writes to the port; a pipelined batch is
+one), the commands inside them, '?;' replies and bytes. Poll traffic that
+runs alongside a scenario is counted separately. Results go to a JSON file
+tagged with the git commit, so runs can be compared:
+
+    python cat_bench.py                                   # → cat_bench.json
+    python cat_bench.py --out after.json --compare before.json
+    python cat_bench.py --idle-sec 10 --reply-ms 20 --baud 9600
+
+Linux only (the simulator needs a pty). Leaves kat_settings.json, kat_cache.json
+and the traffic trace alone.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+if not os.environ.get("DISPLAY"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QPoint, QPointF, Qt
+from PyQt5.QtGui import QWheelEvent
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+import KAT
+from cat_sim import FT991ASim
+
+WHEEL_NOTCHES = 100
+WHEEL_GAP_SEC = 0.01      # a brisk spin of the wheel
+SETTLE_SEC = 0.4          # unmeasured pause between operator actions
+
+
+class Traffic:
+    """Counts writes to the port (round trips), split into job and poll traffic."""
+
+    def __init__(self):
+        self.jobs = 0
+        self.polls = 0
+        write = KAT.CatLink.write
+        traffic = self
+
+        def counting_write(link, cmd):
+            if link.cause.startswith("poll:"):
+                traffic.polls += 1
+            else:
+                traffic.jobs += 1
+            return write(link, cmd)
+
+        KAT.CatLink.write = counting_write
+
+
+class Bench:
+    def __init__(self, app, sim, ctl):
+        self.app, self.sim, self.ctl = app, sim, ctl
+        self.traffic = Traffic()
+        self.results = []
+        self._futures = []
+        submit = ctl._cat_submit
+
+        def tracked_submit(*args, **kwargs):
+            fut = submit(*args, **kwargs)
+            if fut is not None:
+                self._futures.append(fut)
+            return fut
+
+        ctl._cat_submit = tracked_submit
+
+    # --- plumbing -------------------------------------------------------------
+
+    def spin(self, sec):
+        end = time.perf_counter() + sec
+        while time.perf_counter() < end:
+            self.app.processEvents()
+            time.sleep(0.002)
+
+    def wait_until(self, pred, timeout=30.0):
+        end = time.perf_counter() + timeout
+        while time.perf_counter() < end:
+            self.app.processEvents()
+            if pred():
+                return True
+            time.sleep(0.002)
+        return False
+
+    def busy(self):
+        return (any(not f.done() for f in self._futures)
+                or self.ctl.freq_display._tune_target is not None)
+
+    def wait_idle(self, timeout=30.0):
+        """Every job queued so far has finished and its callbacks have run."""
+        end = time.perf_counter() + timeout
+        quiet_since = None
+        while time.perf_counter() < end:
+            self.app.processEvents()
+            if self.busy():
+                quiet_since = None
+            elif quiet_since is None:
+                quiet_since = time.perf_counter()
+            elif time.perf_counter() - quiet_since > 0.02:
+                self._futures.clear()
+                return True
+            time.sleep(0.001)
+        return False
+
+    def _counters(self):
+        w = self.ctl.cat_worker
+        link = w.link if w is not None else None
+        return {
+            "jobs": self.traffic.jobs,
+            "polls": self.traffic.polls,
+            "commands": sum(self.sim.commands.values()),
+            "errors": self.sim.errors,
+            "traffic": link.traffic if link is not None else 0,
+            "saved": link.round_trips_saved if link is not None else 0,
+        }
+
+    def measure(self, name, steps, **extra):
+        """Run each step (action, wait) and total the measured windows."""
+        wall = 0.0
+        totals = dict.fromkeys(("jobs", "polls", "commands", "errors", "traffic", "saved"), 0)
+        ok = True
+        for i, (action, wait) in enumerate(steps):
+            if i:
+                self.spin(SETTLE_SEC)
+            before = self._counters()
+            t0 = time.perf_counter()
+            action()
+            ok = wait() and ok
+            wall += time.perf_counter() - t0
+            after = self._counters()
+            for key in totals:
+                totals[key] += after[key] - before[key]
+        result = {
+            "scenario": name,
+            "ok": ok,
+            "wall_s": round(wall, 4),
+            "round_trips": totals["jobs"],
+            "poll_round_trips": totals["polls"],
+            "commands": totals["commands"],
+            "errors": totals["errors"],
+            "bytes": totals["traffic"],
+            "round_trips_saved": totals["saved"],
+        }
+        result.update(extra)
+        self.results.append(result)
+        return result
+
+    @staticmethod
+    def show(result):
+        print(f"  {result['scenario']:<24} {'ok ' if result['ok'] else 'FAIL'} {result['wall_s'] * 1000:9.1f} ms  "
+              f"{result['round_trips']:5} round trips  {result['commands']:5} commands  "
+              f"{result['poll_round_trips']:4} polls")
+
+    # --- scenarios --------------------------------------------------------------
+
+    def connect(self):
+        ctl = self.ctl
+        self.show(self.measure("connect", [(ctl.connect_to_radio,
+                                            lambda: self.wait_until(lambda: ctl.rig_state.hz is not None))]))
+        # Let the background memory index finish before anything else is timed
+        self.wait_until(lambda: ctl._memory_index_ready, timeout=60)
+        self.wait_idle()
+
+    def load_all_menus(self):
+        self.show(self.measure("load_all_menus", [(self.ctl.load_all_menus, self.wait_idle)]))
+
+    def presets(self):
+        for name in self.ctl.operating_modes:
+            self.spin(SETTLE_SEC)
+            result = self.measure(f"preset:{name}",
+                                  [(lambda name=name: self.ctl.activate_preset(name), self.wait_idle)])
+            result["status"] = self.ctl.status_label.text()
+            self.show(result)
+
+    def memory_walk(self):
+        ctl = self.ctl
+        filled = sorted(ch for ch, e in ctl.memory_index.items() if e.filled)
+        if not filled:
+            return
+        visited = []
+        self.spin(SETTLE_SEC)
+        ctl.recall_memory_channel(filled[0])
+        self.wait_idle()
+        self.spin(SETTLE_SEC)       # the display's follow-up IF; read
+
+        def step():
+            ctl.change_memory_channel(1)
+
+        def settle():
+            ok = self.wait_idle()
+            visited.append(ctl.current_memory)
+            return ok
+
+        result = self.measure("memory_walk", [(step, settle)] * len(filled), channels=len(filled))
+        result["visited"] = visited
+        result["ok"] = result["ok"] and visited == filled[1:] + filled[:1]
+        self.show(result)
+
+    def wheel_tuning(self):
+        ctl = self.ctl
+        fd = ctl.freq_display
+        self.spin(SETTLE_SEC)
+        fd.active_digit_index = 5      # 1 kHz
+        # Where the display's digit arithmetic (no carry) should leave the rig
+        expected = ctl.rig_state.hz
+        for _ in range(WHEEL_NOTCHES if expected else 0):
+            s11 = f"{expected:011d}"
+            expected = ctl._clip_rig_range(int(s11[:2] + fd.adjust_specific_digit(s11[2:], 5, 1)))
+
+        def spin_wheel():
+            for _ in range(WHEEL_NOTCHES):
+                fd.wheelEvent(QWheelEvent(QPointF(5, 5), QPointF(5, 5), QPoint(0, 0), QPoint(0, 120),
+                                          Qt.NoButton, Qt.NoModifier, Qt.NoScrollPhase, False))
+                self.spin(WHEEL_GAP_SEC)
+
+        result = self.measure("wheel_tuning", [(spin_wheel, self.wait_idle)], notches=WHEEL_NOTCHES,
+                              expected_hz=expected)
+        result["rig_hz"] = self.sim.fa
+        result["ok"] = result["ok"] and self.sim.fa == expected
+        self.show(result)
+
+    def idle_polling(self, seconds):
+        self.spin(SETTLE_SEC)
+        result = self.measure("idle_polling", [(lambda: None, lambda: (self.spin(seconds), True)[1])])
+        result["poll_round_trips_per_s"] = round(result["poll_round_trips"] / seconds, 2) if seconds else None
+        self.show(result)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(results, old_path):
+    """Print wall time / round trips against an earlier run."""
+    try:
+        with open(old_path) as f:
+            old = {r["scenario"]: r for r in json.load(f)["scenarios"]}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Can't compare with {old_path}: {e}")
+        return
+    print(f"\nvs {old_path}:")
+    for r in results:
+        o = old.get(r["scenario"])
+        if o is None:
+            continue
+        dt = r["wall_s"] - o["wall_s"]
+        pct = f"{100 * dt / o['wall_s']:+.0f}%" if o["wall_s"] else ""
+        print(f"  {r['scenario']:<24} {dt * 1000:+9.1f} ms {pct:>6}  "
+              f"{r['round_trips'] - o['round_trips']:+5} round trips")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KAT's CAT operations against cat_sim.py.")
+    parser.add_argument("--out", default="cat_bench.json", help="results file (JSON)")
+    parser.add_argument("--compare", metavar="FILE", help="earlier results to compare with")
+    parser.add_argument("--idle-sec", type=float, default=60.0, help="length of idle_polling")
+    parser.add_argument("--baud", type=int, default=38400, help="simulated CAT RATE")
+    parser.add_argument("--reply-ms", type=float, default=5.0, help="simulated rig processing time")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    # Nobody is there to click dialogs
+    for name in ("warning", "critical", "information"):
+        setattr(QMessageBox, name, staticmethod(lambda *a, **k: print(f"  [dialog] {a[2] if len(a) > 2 else ''}")))
+    QMessageBox.question = staticmethod(lambda *a, **k: QMessageBox.No)
+
+    sim = FT991ASim(baud=args.baud, reply_ms=args.reply_ms)
+    port = sim.start()
+    ctl = KAT.FT991AController(persist=False)
+    ctl.settings_autodetect_check.setChecked(False)
+    ctl.settings_ai_check.setChecked(False)
+    ctl.settings_cat_combo.setCurrentText(port)
+    ctl.settings_baud_combo.setCurrentText(str(args.baud))
+
+    print(f"⏱️ KAT CAT benchmark on {port} ({args.baud} baud, {args.reply_ms:g} ms reply delay)")
+    bench = Bench(app, sim, ctl)
+    started = time.perf_counter()
+    try:
+        bench.connect()
+        bench.load_all_menus()
+        bench.presets()
+        bench.memory_walk()
+        bench.wheel_tuning()
+        bench.idle_polling(args.idle_sec)
+    finally:
+        ctl.close()
+        sim.stop()
+
+    report = {
+        "commit": git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sim": {"baud": args.baud, "reply_ms": args.reply_ms},
+        "total_s": round(time.perf_counter() - started, 2),
+        "scenarios": bench.results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved to {args.out}")
+    if args.compare:
+        compare(bench.results, args.compare)
+    return 0 if all(r["ok"] for r in bench.results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
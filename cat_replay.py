@@ -0,0 +1,207 @@
+"""
+Replay a recorded CAT trace (traces/cat_trace.jsonl, see "Record traffic" on
+the CAT Terminal tab) through KAT's own decode and display path, no radio needed.
+
+Every frame the rig sent ("<" lines) is fed as raw bytes to the same
+CatFrameReader/CatLink a live connection uses, then handed to the controller
+the way a reply or AI1 push would be (IF/FA/MD/MC/TX → _on_unsolicited, RM →
+meters, MT → memory tags). The window is built offscreen and never shown.
+
+    python cat_replay.py traces/cat_trace.jsonl.1 traces/cat_trace.jsonl
+    python cat_replay.py trace.jsonl --speed 1        # original timing
+    python cat_replay.py trace.jsonl --speed 10       # ten times faster
+    python cat_replay.py trace.jsonl --json replay.json
+
+--speed 0 (the default) replays as fast as possible. The same trace always
+produces the same frames, state changes and UI update counts; only the
+timings vary from run to run.
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+import types
+
+if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+import KAT
+
+
+def load_trace(paths):
+    """[(t, direction, cause, frame)] from one or more trace files, in the order given."""
+    frames = []
+    for path in paths:
+        with open(path, encoding="ascii") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash
+                if rec.get("d") in ("<", ">"):
+                    frames.append((rec["t"], rec["d"], rec.get("c", ""), rec["f"]))
+    return frames
+
+
+class ReplayPort:
+    """Just enough of a serial.Serial for CatLink: everything arrives via feed()."""
+    is_open = True
+    in_waiting = 0
+    baudrate = 38400
+    port = "replay"
+    timeout = 0
+
+    def read(self, n=1):
+        return b""
+
+    def write(self, data):
+        return len(data)
+
+
+def count_calls(counter, name, func):
+    """Wrap func so each call bumps counter[name]."""
+    def wrapper(*args, **kwargs):
+        counter[name] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def instrument_ui(ctl, counter):
+    """Count widget updates instead of timing paints (offscreen paints are ~free)."""
+    ctl.freq_display.setText = count_calls(counter, "frequency", ctl.freq_display.setText)
+    ctl._show_channel_info = count_calls(counter, "channel_info", ctl._show_channel_info)
+    ctl.s_meter.set_value = count_calls(counter, "s_meter", ctl.s_meter.set_value)
+    ctl.pwr_meter.set_value = count_calls(counter, "pwr_meter", ctl.pwr_meter.set_value)
+    ctl.tx_led.set_on = count_calls(counter, "tx_led", ctl.tx_led.set_on)
+
+
+def dispatch(ctl, frame):
+    """Hand a decoded frame to the controller. False if nothing consumes it."""
+    op = frame[:2]
+    if op in ("IF", "FA", "MD", "MC", "TX"):
+        ctl._on_unsolicited(frame)
+    elif frame.startswith("RM1"):
+        ctl._show_s_meter(frame)
+    elif frame.startswith("RM5"):
+        ctl._show_pwr_meter(frame)
+    elif op == "MT" and frame[2:5].isdigit():
+        tag = KAT.CatLink._parse_memory_tag(frame)
+        if tag is not None:
+            ctl._memory_tags[int(frame[2:5])] = tag
+    else:
+        return False
+    return True
+
+
+def replay(frames, speed=0.0, app=None):
+    """Run frames through CatLink + the controller. Returns the report dict."""
+    app = app or QApplication.instance() or QApplication(sys.argv)
+    ctl = KAT.FT991AController(persist=False)
+    ui = collections.Counter()
+    instrument_ui(ctl, ui)
+    link = KAT.CatLink(ReplayPort(), types.SimpleNamespace(listen=True))
+
+    rx = [(t, f) for t, d, c, f in frames if d == "<"]
+    by_cause = collections.Counter(c for t, d, c, f in frames)
+    by_op = collections.Counter()
+    decoded = consumed = rx_bytes = 0
+    decode_s = state_s = 0.0
+    first_t = rx[0][0] if rx else 0.0
+    started = time.perf_counter()
+
+    for t, raw in rx:
+        if speed > 0:
+            # Original spacing, scaled; let Qt run while we wait
+            wait = started + (t - first_t) / speed - time.perf_counter()
+            while wait > 0:
+                app.processEvents()
+                time.sleep(min(wait, 0.005))
+                wait = started + (t - first_t) / speed - time.perf_counter()
+        data = raw.encode("ascii", "replace")
+        rx_bytes += len(data)
+
+        t0 = time.perf_counter()
+        link.reader.feed(data)
+        batch = []
+        while link.reader.pending():
+            batch.append(link.read_frame(0))
+        t1 = time.perf_counter()
+        for frame in batch:
+            if dispatch(ctl, frame):
+                consumed += 1
+            by_op[frame[:2]] += 1
+        t2 = time.perf_counter()
+
+        decoded += len(batch)
+        decode_s += t1 - t0
+        state_s += t2 - t1
+        if speed > 0:
+            app.processEvents()
+
+    app.processEvents()
+    wall = time.perf_counter() - started
+    ctl.close()
+
+    st = ctl.rig_state
+    return {
+        "frames_rx": len(rx),
+        "frames_tx": len(frames) - len(rx),
+        "frames_decoded": decoded,
+        "frames_applied": consumed,
+        "bytes_rx": rx_bytes,
+        "trace_s": round(rx[-1][0] - first_t, 3) if rx else 0.0,
+        "speed": speed or "max",
+        "wall_s": round(wall, 4),
+        "decode_s": round(decode_s, 6),
+        "decode_frames_per_s": round(decoded / decode_s) if decode_s else None,
+        "decode_us_per_frame": round(1e6 * decode_s / decoded, 2) if decoded else None,
+        "state_s": round(state_s, 6),
+        "state_us_per_frame": round(1e6 * state_s / consumed, 2) if consumed else None,
+        "ui_updates": dict(sorted(ui.items())),
+        "frames_by_op": dict(by_op.most_common()),
+        "frames_by_cause": dict(by_cause.most_common()),
+        "final_state": {"hz": st.hz, "mode": st.mode, "channel": st.channel_info()[0],
+                        "tag": st.channel_info()[1], "menus": len(link.menus)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a KAT CAT trace without a radio.")
+    parser.add_argument("traces", nargs="+", help="trace file(s), oldest first")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="1 = original timing, 10 = ten times faster, 0 = as fast as possible")
+    parser.add_argument("--json", metavar="FILE", help="also write the report here")
+    args = parser.parse_args()
+
+    try:
+        frames = load_trace(args.traces)
+    except OSError as e:
+        print(f"❌ Can't read trace: {e}")
+        return 1
+    if not frames:
+        print("❌ No frames in trace")
+        return 1
+    print(f"🔁 Replaying {len(frames)} frames from {', '.join(args.traces)} ...")
+    report = replay(frames, args.speed)
+
+    print(f"  decoded   {report['frames_decoded']} frames, {report['bytes_rx']} bytes "
+          f"in {report['decode_s'] * 1000:.1f} ms ({report['decode_us_per_frame']} µs/frame, "
+          f"{report['decode_frames_per_s']} frames/s)")
+    print(f"  applied   {report['frames_applied']} frames in {report['state_s'] * 1000:.1f} ms "
+          f"({report['state_us_per_frame']} µs/frame)")
+    print("  ui        " + ", ".join(f"{k} {v}" for k, v in report["ui_updates"].items()))
+    print(f"  wall      {report['wall_s']:.3f} s for {report['trace_s']:.3f} s of trace")
+    print(f"  final     {report['final_state']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+"""
+FT-991A CAT simulator on a Linux pseudo-terminal.
+
+Opens a pty and answers the commands KAT uses (FA FB MD MC VM MT MR EX RM IF
+ID CO AI TX) from a realistic rig state: all 153 menus (defaults from
+presets/defaultv002.xml), 117 memory channels, VFO/memory mode. Point KAT's
+CAT Port (Settings, the box is editable) at the printed /dev/pts/N.
+
+Timing follows a real UART: every byte costs 10 bits at the CAT RATE (menu
+031, or --baud), the rig takes --reply-ms to start answering, and answers go
+out one after another. A command left half-sent for longer than CAT TIMEOUT
+(menu 032: 10/100/1000/3000 ms) is thrown away, like the radio does.
+
+    python cat_sim.py                       # prints the port, Ctrl+C to stop
+    python cat_sim.py --link /tmp/ft991a    # plus a stable symlink to it
+    python cat_sim.py --reply-ms 20 -v      # slower rig, print the traffic
+
+Also importable: FT991ASim().start() for benchmarks and tests; turn_dial()
+and select_memory() stand in for the front panel (pushed to KAT with AI1).
+"""
+import argparse
+import collections
+import os
+import pty
+import random
+import select
+import sys
+import threading
+import time
+import tty
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from KAT import CAT_MODE_NAMES, MEMORY_CHANNELS, MENU_WIDTHS, FT991A_ID
+
+DEFAULT_MENUS = Path(__file__).parent / "presets" / "defaultv002.xml"
+
+# Menu 031 CAT RATE and 032 CAT TIMEOUT settings
+CAT_RATES = {"0": 4800, "1": 9600, "2": 19200, "3": 38400}
+CAT_TIMEOUTS = {"0": 0.010, "1": 0.100, "2": 1.000, "3": 3.000}
+
+# A sparse memory bank: (channel, Hz, mode char, tag). Channels KAT's Mode
+# Presets use are filled; the rest of 1..117 is blank and answers "?;".
+DEFAULT_MEMORIES = [
+    (1, 145375000, "E", "WIRES-X"),
+    (2, 146520000, "4", "CALL 2M"),
+    (3, 146940000, "4", "RPT 94"),
+    (4, 147435000, "4", "DARN 3"),
+    (5, 446000000, "4", "CALL 70CM"),
+    (10, 7074000, "C", "FT8 40M"),
+    (20, 14074000, "C", "FT8 20M"),
+    (52, 144390000, "A", "APRS PIN"),
+    (53, 145050000, "A", "WINLINK"),
+    (59, 144390000, "A", "APRS"),
+    (60, 7200000, "1", "40M LSB"),
+    (61, 3873000, "1", "75M LSB"),
+    (99, 162550000, "B", "NOAA WX"),
+]
+
+
+def load_menu_defaults(path=DEFAULT_MENUS):
+    """{menu number: value} from a KAT/Yaesu menu XML; zero-filled for anything missing."""
+    menus = {num: "0" * width for num, width in MENU_WIDTHS.items()}
+    try:
+        for item in ET.parse(path).getroot():
+            num, value = item.findtext("MENU_NUMBER"), item.findtext("MENU_VALUE")
+            if num in menus and value:
+                menus[num] = value
+    except (OSError, ET.ParseError) as e:
+        print(f"⚠️ Menu defaults not loaded ({e}); using zeros")
+    return menus
+
+
+class Memory:
+    __slots__ = ("hz", "mode", "tag")
+
+    def __init__(self, hz, mode, tag=""):
+        self.hz, self.mode, self.tag = hz, mode, tag
+
+
+class FT991ASim:
+    """The rig: state, a command interpreter, and a pty served by one thread."""
+
+    def __init__(self, baud=None, reply_ms=5.0, menus=None, memories=None, seed=0, verbose=False):
+        self.menus = dict(menus) if menus is not None else load_menu_defaults()
+        if baud is not None:
+            rate = {v: k for k, v in CAT_RATES.items()}.get(baud)
+            if rate is None:
+                raise ValueError(f"CAT RATE must be one of {sorted(CAT_RATES.values())}")
+            self.menus["031"] = rate
+        self.reply_delay = reply_ms / 1000.0
+        self.memories = {ch: Memory(hz, mode, tag)
+                         for ch, hz, mode, tag in (DEFAULT_MEMORIES if memories is None else memories)}
+        self.verbose = verbose
+        self._rand = random.Random(seed)
+
+        self.fa = 14074000
+        self.fb = 7074000
+        self.mode = "2"
+        self.in_memory = False
+        self.channel = 1
+        self.ai = False
+        self.tx = False
+        self.contour = {"0": "0000", "1": "0000", "2": "0000", "3": "0000"}
+        self.s_meter = 40
+
+        # Counters for benchmarks/tests
+        self.commands = collections.Counter()
+        self.errors = 0
+        self.discarded = 0
+
+        self._master = self._slave = None
+        self.port = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._tx_free_at = 0.0
+
+    # --- timing -------------------------------------------------------------
+
+    @property
+    def baud(self):
+        return CAT_RATES.get(self.menus.get("031"), 38400)
+
+    @property
+    def cat_timeout(self):
+        return CAT_TIMEOUTS.get(self.menus.get("032"), 0.010)
+
+    def byte_time(self):
+        return 10.0 / self.baud
+
+    # --- pty ------------------------------------------------------------------
+
+    def start(self):
+        """Open the pty and start answering. Returns the port path."""
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._serve, name="FT991ASim", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except (OSError, TypeError):
+                pass
+        self._master = self._slave = None
+
+    def _serve(self):
+        buf = bytearray()
+        rx_at = 0.0           # when the last received byte finished arriving on the "wire"
+        while not self._stop.is_set():
+            wait = self.cat_timeout if buf else 0.2
+            try:
+                ready, _, _ = select.select([self._master], [], [], wait)
+                data = os.read(self._master, 1024) if ready else b""
+            except OSError:
+                return   # pty closed
+            now = time.monotonic()
+            if not data:
+                # CAT TIMEOUT: a half-received command is dropped
+                if buf and now - rx_at >= self.cat_timeout:
+                    self.discarded += 1
+                    self._log(f"[timeout] dropped {bytes(buf)!r}")
+                    del buf[:]
+                continue
+            bt = self.byte_time()
+            for b in data:
+                rx_at = max(now, rx_at) + bt
+                if b == 0x3B:  # ';'
+                    cmd = buf.decode("ascii", "replace").strip()
+                    del buf[:]
+                    if cmd:
+                        self._answer(cmd, rx_at)
+                elif b not in (0x0A, 0x0D):
+                    buf.append(b)
+
+    def _answer(self, cmd, received_at):
+        with self._lock:
+            reply = self.handle(cmd)
+        self._log(f">> {cmd};" + (f"   << {reply}" if reply else ""))
+        if reply:
+            self._send(reply, received_at + self.reply_delay)
+
+    def _send(self, frame, not_before=0.0):
+        """Write frame once it has had time to go out at the CAT rate."""
+        data = frame.encode("ascii")
+        start = max(not_before, self._tx_free_at, time.monotonic())
+        done = start + len(data) * self.byte_time()
+        self._tx_free_at = done
+        delay = done - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            os.write(self._master, data)
+        except OSError:
+            pass
+
+    def _log(self, text):
+        if self.verbose:
+            print(text, flush=True)
+
+    # --- front panel (AI1 pushes) --------------------------------------------
+
+    def turn_dial(self, hz):
+        """Someone turned the VFO knob."""
+        with self._lock:
+            self.in_memory = False
+            self.fa = int(hz)
+            frame = self._if()
+        if self.ai:
+            self._send(frame)
+
+    def select_memory(self, channel):
+        """Someone picked a memory channel on the rig."""
+        with self._lock:
+            ok = self._recall(channel)
+            frame = self._if()
+        if ok and self.ai:
+            self._send(frame)
+        return ok
+
+    # --- command interpreter ---------------------------------------------------
+
+    def handle(self, cmd):
+        """Apply one command (without ';'). Returns the reply frame or None."""
+        op, p = cmd[:2], cmd[2:]
+        self.commands[op] += 1
+        handler = getattr(self, f"_cmd_{op}", None)
+        reply = handler(p) if handler else "?;"
+        if reply == "?;":
+            self.errors += 1
+        return reply
+
+    def _vfo_hz(self):
+        if self.in_memory and self.channel in self.memories:
+            return self.memories[self.channel].hz
+        return self.fa
+
+    def _recall(self, channel):
+        mem = self.memories.get(channel)
+        if mem is None:
+            return False
+        self.channel = channel
+        self.in_memory = True
+        self.mode = mem.mode
+        return True
+
+    def _block(self, ch, hz, mode, in_memory=True):
+        """The 26-character MR/MT body (IF uses the first 25):
+        ch(3) freq(9) clar(5) rx-clar tx-clar mode vfo/mem ctcss 00 shift 0."""
+        return f"{ch:03d}{hz:09d}+000000{mode}{1 if in_memory else 0}00000"
+
+    def _if(self):
+        return f"IF{self._block(self.channel, self._vfo_hz(), self.mode, self.in_memory)[:25]};"
+
+    def _cmd_ID(self, p):
+        return f"ID{FT991A_ID};" if not p else "?;"
+
+    def _cmd_IF(self, p):
+        return self._if() if not p else "?;"
+
+    @staticmethod
+    def _freq_ok(p):
+        # 9 digits per the manual; KAT writes 11 with leading zeros, which the rig takes
+        return len(p) in (9, 11) and p.isdigit() and int(p) < 10 ** 9
+
+    def _cmd_FA(self, p):
+        if not p:
+            return f"FA{self._vfo_hz():09d};"
+        if not self._freq_ok(p):
+            return "?;"
+        if self.in_memory:
+            return "?;"      # the rig ignores VFO writes on a memory channel
+        self.fa = int(p)
+        return None
+
+    def _cmd_FB(self, p):
+        if not p:
+            return f"FB{self.fb:09d};"
+        if not self._freq_ok(p):
+            return "?;"
+        self.fb = int(p)
+        return None
+
+    def _cmd_MD(self, p):
+        if p in ("", "0"):
+            return f"MD0{self.mode};"
+        if len(p) == 2 and p[0] == "0" and p[1] in CAT_MODE_NAMES:
+            self.mode = p[1]
+            return None
+        return "?;"
+
+    def _cmd_MC(self, p):
+        if not p:
+            return f"MC{self.channel if self.in_memory else 0:03d};"
+        if len(p) != 3 or not p.isdigit() or int(p) not in MEMORY_CHANNELS:
+            return "?;"
+        return None if self._recall(int(p)) else "?;"
+
+    def _cmd_VM(self, p):
+        if p == "0":
+            self.in_memory = False
+            return None
+        if p == "1":
+            return None if self._recall(self.channel) or self._recall(min(self.memories, default=0)) else "?;"
+        return "?;"
+
+    def _cmd_MR(self, p):
+        if len(p) != 3 or not p.isdigit():
+            return "?;"
+        mem = self.memories.get(int(p))
+        return f"MR{self._block(int(p), mem.hz, mem.mode)};" if mem else "?;"
+
+    def _cmd_MT(self, p):
+        if len(p) < 3 or not p[:3].isdigit() or int(p[:3]) not in MEMORY_CHANNELS:
+            return "?;"
+        ch = int(p[:3])
+        if len(p) == 3:
+            mem = self.memories.get(ch)
+            return f"MT{self._block(ch, mem.hz, mem.mode)}{mem.tag:<12};" if mem else "?;"
+        # Write: same layout as the reply, tag optional
+        body = p[3:]
+        if len(body) < 23 or not body[:9].isdigit() or body[16] not in CAT_MODE_NAMES:
+            return "?;"
+        self.memories[ch] = Memory(int(body[:9]), body[16], body[23:35].rstrip())
+        return None
+
+    def _cmd_EX(self, p):
+        num, value = p[:3], p[3:]
+        if num not in self.menus:
+            return "?;"
+        if not value:
+            return f"EX{num}{self.menus[num]};"
+        if len(value) != MENU_WIDTHS[num]:
+            return "?;"
+        self.menus[num] = value
+        return None
+
+    def _cmd_RM(self, p):
+        if p == "1":
+            # S-meter wanders a little around S5
+            self.s_meter = max(0, min(255, self.s_meter + self._rand.randint(-6, 6)))
+            return f"RM1{self.s_meter:03d};"
+        if p == "5":
+            return f"RM5{200 if self.tx else 0:03d};"
+        if len(p) == 1 and p.isdigit():
+            return f"RM{p}000;"
+        return "?;"
+
+    def _cmd_CO(self, p):
+        if len(p) == 2 and p[0] == "0" and p[1] in self.contour:
+            return f"CO0{p[1]}{self.contour[p[1]]};"
+        if len(p) == 6 and p[0] == "0" and p[1] in self.contour and p[2:].isdigit():
+            self.contour[p[1]] = p[2:]
+            return None
+        return "?;"
+
+    def _cmd_AI(self, p):
+        if not p:
+            return f"AI{int(self.ai)};"
+        if p in ("0", "1"):
+            self.ai = p == "1"
+            return None
+        return "?;"
+
+    def _cmd_TX(self, p):
+        if not p:
+            return f"TX{int(self.tx)};"
+        if p in ("0", "1", "2"):
+            self.tx = p != "0"
+            return None
+        return "?;"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FT-991A CAT simulator on a pseudo-terminal.")
+    parser.add_argument("--baud", type=int, help="CAT RATE (menu 031); default from the menu file")
+    parser.add_argument("--reply-ms", type=float, default=5.0, help="rig processing time per reply")
+    parser.add_argument("--menus", default=str(DEFAULT_MENUS), help="menu XML to start from")
+    parser.add_argument("--link", help="also make this symlink to the pty (e.g. /tmp/ft991a)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every command")
+    args = parser.parse_args()
+
+    sim = FT991ASim(baud=args.baud, reply_ms=args.reply_ms,
+                    menus=load_menu_defaults(args.menus), verbose=args.verbose)
+    port = sim.start()
+    if args.link:
+        try:
+            os.remove(args.link)
+        except FileNotFoundError:
+            pass
+        os.symlink(port, args.link)
+    print(f"📻 FT-991A simulator on {args.link or port} ({sim.baud} baud, "
+          f"CAT TIMEOUT {sim.cat_timeout * 1000:.0f} ms). Set KAT's CAT Port to it; Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+        if args.link:
+            try:
+                os.remove(args.link)
+            except OSError:
+                pass
+        print(f"💤 Closed. {sum(sim.commands.values())} commands, {sim.errors} '?;', "
+              f"{sim.discarded} dropped by CAT TIMEOUT.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
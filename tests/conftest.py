@@ -0,0 +1,32 @@
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def ctl(qapp):
+    """The main window, built offscreen without touching the user's files."""
+    import KAT
+    ctl = KAT.FT991AController(persist=False)
+    yield ctl
+    ctl.close()
+
+
+def wait_for(qapp, pred, timeout=3.0):
+    """Run the Qt event loop until pred() holds; False on timeout."""
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        qapp.processEvents()
+        if pred():
+            return True
+        time.sleep(0.005)
+    return False
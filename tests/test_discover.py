@@ -0,0 +1,46 @@
+"""discover_rig()/probe_port(): finding the FT-991A on whichever port answers."""
+import sys
+
+import pytest
+
+import KAT
+
+
+def test_ft991a_wins_over_another_rig(monkeypatch):
+    table = {("COM3", 9600): "ID0650;", ("COM5", 4800): f"ID{KAT.FT991A_ID};"}
+    monkeypatch.setattr(KAT, "probe_port", lambda port, baud, dtr=False, rts=True: table.get((port, baud), ""))
+    assert KAT.discover_rig(["COM3", "COM4", "COM5"]) == ("COM5", 4800, f"ID{KAT.FT991A_ID};")
+
+
+def test_other_rig_is_returned_if_no_ft991a(monkeypatch):
+    monkeypatch.setattr(KAT, "probe_port",
+                        lambda port, baud, dtr=False, rts=True: "ID0650;" if (port, baud) == ("COM3", 9600) else "")
+    assert KAT.discover_rig(["COM3", "COM4"]) == ("COM3", 9600, "ID0650;")
+
+
+def test_bauds_are_tried_in_the_order_given(monkeypatch):
+    tried = []
+
+    def probe(port, baud, dtr=False, rts=True):
+        tried.append(baud)
+        return f"ID{KAT.FT991A_ID};" if baud == 9600 else ""
+
+    monkeypatch.setattr(KAT, "probe_port", probe)
+    assert KAT.discover_rig(["COM5"], bauds=(4800, 9600, 38400)) == ("COM5", 9600, f"ID{KAT.FT991A_ID};")
+    assert tried == [4800, 9600]
+
+
+def test_nothing_answers(monkeypatch):
+    monkeypatch.setattr(KAT, "probe_port", lambda *a, **k: "")
+    assert KAT.discover_rig(["COM3", "COM4"]) is None
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="cat_sim needs a pty")
+def test_probe_port_against_the_simulator():
+    from cat_sim import FT991ASim
+    sim = FT991ASim(menus={})
+    port = sim.start()
+    try:
+        assert KAT.probe_port(port, 38400) == f"ID{KAT.FT991A_ID};"
+    finally:
+        sim.stop()
@@ -0,0 +1,47 @@
+"""MENU_SCHEMA / encode_menu_value(): preset values checked and encoded for EX."""
+import pytest
+
+import KAT
+
+
+def test_every_menu_has_a_checkable_schema():
+    assert set(KAT.MENU_SCHEMA) == set(KAT.MENU_DESCRIPTIONS)
+    # Only 087 ("set this at the radio") is free text
+    assert [s.num for s in KAT.MENU_SCHEMA.values() if s.kind == "text"] == ["087"]
+
+
+def test_range_text_compiles_to_kinds():
+    assert KAT.MENU_SCHEMA["001"][3:6] == ("int", 20, 4000)
+    assert KAT.MENU_SCHEMA["132"][3:6] == ("signed", -20, 10)
+    assert KAT.MENU_SCHEMA["031"].choices == frozenset({0, 1, 2, 3})
+    # "6:2000Hz-18:3200Hz" spans every code in between
+    assert KAT.MENU_SCHEMA["134"].choices == frozenset(range(19))
+
+
+@pytest.mark.parametrize("num, value, encoded", [
+    ("001", "300", "0300"),
+    (1, 4000, "4000"),
+    ("132", "-5", "-05"),
+    ("132", "7", "+07"),
+    ("027", "-500", "-0500"),
+    ("031", " 3 ", "3"),
+    ("134", "18", "18"),
+    ("087", "ABC", "ABC"),
+])
+def test_values_are_padded_for_the_rig(num, value, encoded):
+    assert KAT.encode_menu_value(num, value) == encoded
+
+
+@pytest.mark.parametrize("num, value, error", [
+    ("001", "19", "outside 20..4000"),
+    ("001", "4001", "outside 20..4000"),
+    ("132", "-21", "outside -20..10"),
+    ("031", "4", "not one of"),
+    ("001", "fast", "not a number"),
+    ("087", "A;B", "bad text"),
+    ("087", "", "bad text"),
+    ("154", "1", "unknown menu"),
+])
+def test_bad_values_are_refused(num, value, error):
+    with pytest.raises(ValueError, match=error):
+        KAT.encode_menu_value(num, value)
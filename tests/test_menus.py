@@ -0,0 +1,55 @@
+"""Menu snapshots: apply_menus() against a stale one, and the kat_cache.json rows."""
+import types
+
+import KAT
+from cat_sim import FT991ASim
+from conftest import wait_for
+from test_transact import ScriptedPort
+
+
+def menu_rig(menus):
+    """Answers EX reads from menus and applies EX writes to it."""
+    def answer(cmd):
+        if cmd.startswith("EX") and len(cmd) == 5:
+            return f"{cmd}{menus[cmd[2:]]};" if cmd[2:] in menus else "?;"
+        if cmd.startswith("EX"):
+            menus[cmd[2:5]] = cmd[5:]
+        return None
+    return answer
+
+
+def make_link(menus):
+    ignore = types.SimpleNamespace(emit=lambda *a: None)
+    worker = types.SimpleNamespace(listen=False, log_line=ignore, activity_line=ignore, progress=ignore)
+    return KAT.CatLink(ScriptedPort(menu_rig(menus)), worker)
+
+
+def test_front_panel_change_is_rewritten():
+    rig = {"001": "0300", "002": "1"}
+    link = make_link(rig)
+    link.menus.update(rig)
+    rig["001"] = "0500"          # turned by hand since the snapshot
+    assert link.apply_menus([("001", "0300"), ("002", "1")], pace=0) == [("001", "0300")]
+    assert rig["001"] == "0300" and link.menus["001"] == "0300"
+
+
+def test_matching_menus_are_not_written():
+    rig = {"001": "0300"}
+    link = make_link(rig)
+    assert link.apply_menus([("001", "0300")], pace=0) == []
+    assert link.ser.sent == ["EX001;"]
+
+
+def test_cached_menus_are_trusted_only_if_the_spot_check_matches(qapp, ctl):
+    sim = FT991ASim()
+    ctl.radio_cache.put_menus(KAT.RadioCache.key(f"ID{KAT.FT991A_ID};", "sim"), sim.menus)
+    ctl._start_cat_worker(ScriptedPort(sim.handle))
+    ctl._warm_from_cache("sim")
+    assert wait_for(qapp, lambda: ctl._cache_key)
+    assert ctl._known_menus == sim.menus
+
+    sim.menus[min(sim.menus)] = "9999"       # changed on the front panel since
+    ctl._start_cat_worker(ScriptedPort(sim.handle))
+    ctl._warm_from_cache("sim")
+    assert wait_for(qapp, lambda: ctl._cache_key)
+    assert ctl._known_menus == {}
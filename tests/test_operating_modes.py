@@ -0,0 +1,40 @@
+"""load_operating_modes(): the Mode Presets buttons from operating_modes.json."""
+import json
+
+import pytest
+
+import KAT
+
+
+def load(tmp_path, *modes):
+    path = tmp_path / "operating_modes.json"
+    path.write_text(json.dumps({"modes": list(modes)}))
+    return KAT.load_operating_modes(path)
+
+
+def test_shipped_modes_load_and_their_presets_lint(qapp):
+    modes = KAT.load_operating_modes()
+    assert modes and len({m.name for m in modes}) == len(modes)
+    presets = KAT.PresetCache()
+    for mode in modes:
+        if mode.menus:
+            presets.get(KAT.PRESETS_DIR / mode.menus)
+
+
+def test_defaults_and_mode_chars(tmp_path):
+    mem, vfo = load(tmp_path, {"name": "a", "memory": 4},
+                    {"name": "b", "label": "B", "vfo": True, "memory": 9, "mode": "USB"})
+    assert (mem.label, mem.title, mem.memory, mem.mode, mem.row, mem.width) == ("a", "a", 4, None, 1, 80)
+    assert (vfo.title, vfo.memory, vfo.mode) == ("B", None, "2")
+
+
+@pytest.mark.parametrize("modes, error", [
+    ([{"memory": 4}], "missing or duplicate"),
+    ([{"name": "a", "memory": 4}, {"name": "a", "memory": 5}], "missing or duplicate"),
+    ([{"name": "a"}], "needs \"memory\""),
+    ([{"name": "a", "memory": 118}], "needs \"memory\""),
+    ([{"name": "a", "vfo": True, "mode": "SSB"}], "unknown mode 'SSB'"),
+])
+def test_bad_entries_are_refused(tmp_path, modes, error):
+    with pytest.raises(ValueError, match=error):
+        load(tmp_path, *modes)
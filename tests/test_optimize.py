@@ -0,0 +1,64 @@
+"""CatLink.optimize(): which commands of a batch actually go on the wire."""
+import types
+
+import pytest
+
+import KAT
+
+
+@pytest.fixture
+def link():
+    ser = types.SimpleNamespace(baudrate=38400, timeout=None, is_open=True)
+    return KAT.CatLink(ser, types.SimpleNamespace(listen=False))
+
+
+def test_single_value_set_overridden_before_read(link):
+    plan, slots = link.optimize(["FA014074000;", "FA007074000;", "FA;"])
+    assert plan == ["FA007074000;", "FA;"]
+    assert slots == {1: 0, 2: 1}
+
+
+def test_read_between_sets_keeps_both(link):
+    plan, _ = link.optimize(["MD02;", "MD0;", "MD0C;"])
+    assert plan == ["MD02;", "MD0;", "MD0C;"]
+
+
+def test_ex_sets_keyed_per_menu(link):
+    plan, _ = link.optimize(["EX0311;", "EX0322;", "EX0313;"])
+    assert plan == ["EX0322;", "EX0313;"]
+
+
+def test_ex_set_matching_snapshot_dropped(link):
+    link.menus["031"] = "3"
+    plan, _ = link.optimize(["EX0313;", "EX0321;"])
+    assert plan == ["EX0321;"]
+
+
+def test_contour_selectors_are_separate_settings(link):
+    plan, _ = link.optimize(["CO000300;", "CO010050;"])
+    assert plan == ["CO000300;", "CO010050;"]
+
+
+def test_tag_writes_to_different_channels_kept(link):
+    cmds = ["MT007145375000+000000E100000WIRES-X     ;",
+            "MT008146520000+000000410000 0CALL 2M     ;"]
+    plan, _ = link.optimize(cmds)
+    assert plan == cmds
+
+
+def test_repeated_write_to_same_address_kept(link):
+    # Not a known single-value set: never collapsed, even when identical
+    plan, _ = link.optimize(["CO000300;", "CO000400;"])
+    assert plan == ["CO000300;", "CO000400;"]
+
+
+def test_duplicate_reads_merged(link):
+    plan, slots = link.optimize(["MC;", "IF;", "MC;"])
+    assert plan == ["MC;", "IF;"]
+    assert slots == {0: 0, 1: 1, 2: 0}
+
+
+def test_fresh_vfo_drops_vm0(link):
+    link._note_vfo(True)
+    plan, _ = link.optimize(["VM0;", "MC;"])
+    assert plan == ["MC;"]
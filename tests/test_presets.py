@@ -0,0 +1,97 @@
+"""PresetCache: presets/*.xml parsed, linted and encoded once per version of the file."""
+import os
+import threading
+
+import pytest
+
+import KAT
+from conftest import wait_for
+
+
+def write_preset(path, rows):
+    body = "".join(f"<YaesuFT991A_MenuItems><MENU_NUMBER>{num}</MENU_NUMBER>"
+                   f"<MENU_VALUE>{val}</MENU_VALUE></YaesuFT991A_MenuItems>" for num, val in rows)
+    path.write_text(f"<YaesuMenuItems.xml>{body}</YaesuMenuItems.xml>")
+
+
+def bump_mtime(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def cache(qapp, tmp_path):
+    return KAT.PresetCache(tmp_path)
+
+
+def test_preset_is_encoded_for_the_rig(cache, tmp_path):
+    write_preset(tmp_path / "a.xml", [("1", "300"), ("027", "-500"), ("031", "3")])
+    preset = cache.get(tmp_path / "a.xml")
+    assert preset.items == (("001", "0300"), ("027", "-0500"), ("031", "3"))
+    assert preset.commands == (b"EX0010300;", b"EX027-0500;", b"EX0313;")
+
+
+def test_unchanged_file_is_not_parsed_again(cache, tmp_path, monkeypatch):
+    write_preset(tmp_path / "a.xml", [("001", "0300")])
+    first = cache.get(tmp_path / "a.xml")
+    monkeypatch.setattr(KAT.PresetCache, "parse", staticmethod(lambda *a: pytest.fail("re-parsed")))
+    assert cache.get(tmp_path / "a.xml") is first
+
+
+def test_edited_file_is_parsed_again(cache, tmp_path):
+    path = tmp_path / "a.xml"
+    write_preset(path, [("001", "0300")])
+    cache.get(path)
+    write_preset(path, [("001", "0500")])
+    bump_mtime(path)
+    assert cache.get(path).items == (("001", "0500"),)
+
+
+def test_one_bad_entry_rejects_the_preset(cache, tmp_path):
+    path = tmp_path / "bad.xml"
+    write_preset(path, [("001", "0300"), ("001", "9999"), ("031", "7")])
+    with pytest.raises(ValueError, match="bad.xml: menu 001.*; menu 031"):
+        cache.get(path)
+
+
+def test_preload_reports_bad_files_and_keeps_good_ones(cache, tmp_path):
+    write_preset(tmp_path / "good.xml", [("001", "0300")])
+    write_preset(tmp_path / "bad.xml", [("031", "x")])
+    errors = cache.preload()
+    assert list(errors) == ["bad.xml"] and "not a number" in errors["bad.xml"]
+    assert cache.get(tmp_path / "good.xml").items == (("001", "0300"),)
+
+
+def test_shipped_presets_all_lint_clean(qapp):
+    assert KAT.PresetCache().preload() == {}
+
+
+def test_watched_edit_is_parsed_off_the_gui_thread(cache, tmp_path, monkeypatch, qapp):
+    path = (tmp_path / "a.xml").resolve()
+    write_preset(path, [("001", "0300")])
+    cache.get(path)
+    threads = []
+    parse = KAT.PresetCache.parse
+
+    def recording_parse(*args):
+        threads.append(threading.current_thread())
+        return parse(*args)
+
+    monkeypatch.setattr(KAT.PresetCache, "parse", staticmethod(recording_parse))
+    write_preset(path, [("001", "0500")])
+    bump_mtime(path)
+    cache._file_changed(str(path))
+    assert wait_for(qapp, lambda: cache._presets[path].items == (("001", "0500"),))
+    assert threads and threading.main_thread() not in threads
+
+
+def test_watched_file_that_breaks_is_dropped(cache, tmp_path, qapp):
+    path = (tmp_path / "a.xml").resolve()
+    write_preset(path, [("001", "0300")])
+    cache.get(path)
+    write_preset(path, [("001", "1")])
+    bump_mtime(path)
+    cache._file_changed(str(path))
+    assert wait_for(qapp, lambda: path not in cache._presets)
+    with pytest.raises(ValueError, match="outside"):
+        cache.get(path)
@@ -0,0 +1,46 @@
+"""RadioCache: kat_cache.json rows per radio."""
+import json
+
+import KAT
+
+ENTRY = KAT.MemoryEntry(145375000, "FM", "TAG", True)
+BLANK = KAT.MemoryEntry(None, None, "", False)
+
+
+def test_rows_survive_a_save_and_load(tmp_path):
+    path = tmp_path / "kat_cache.json"
+    cache = KAT.RadioCache(path)
+    key = KAT.RadioCache.key("ID0570;", "COM5")
+    cache.put_memories(key, {4: ENTRY, 5: BLANK}, ts=100.0)
+    cache.put_menus(key, {"001": "0300"}, ts=200.0)
+    cache.save()
+    assert not path.with_suffix(".tmp").exists()
+
+    again = KAT.RadioCache(path)
+    assert again.memories(key) == {4: (ENTRY, 100.0), 5: (BLANK, 100.0)}
+    assert again.menus(key) == {"001": ("0300", 200.0)}
+
+
+def test_radios_never_share_rows(tmp_path):
+    cache = KAT.RadioCache(tmp_path / "kat_cache.json")
+    cache.put_menus(KAT.RadioCache.key("ID0570;", "COM5"), {"001": "0300"})
+    assert KAT.RadioCache.key("ID0570;", "COM5") == "ID0570@COM5"
+    assert cache.menus(KAT.RadioCache.key("ID0570;", "COM6")) == {}
+
+
+def test_unreadable_or_old_file_starts_cold(tmp_path):
+    path = tmp_path / "kat_cache.json"
+    path.write_text("{not json")
+    assert KAT.RadioCache(path).memories("ID0570@COM5") == {}
+    path.write_text(json.dumps({"version": KAT.RadioCache.VERSION + 1,
+                                "radios": {"ID0570@COM5": {"menus": {"001": ["0300", 1.0]}}}}))
+    assert KAT.RadioCache(path).menus("ID0570@COM5") == {}
+
+
+def test_no_path_keeps_rows_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = KAT.RadioCache(None)
+    cache.put_menus("ID0570@COM5", {"001": "0300"}, ts=1.0)
+    cache.save()
+    assert cache.menus("ID0570@COM5") == {"001": ("0300", 1.0)}
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,57 @@
+"""CatFrameReader: splitting, garbage, partial frames and resync."""
+import KAT
+from test_transact import ScriptedPort, make_link
+
+
+def reader_with(data=b""):
+    port = ScriptedPort(lambda cmd: None)
+    port._rx += data
+    return port, KAT.CatFrameReader(port)
+
+
+def read_all(reader):
+    frames = []
+    frame = reader.read_frame(0)
+    while frame:
+        frames.append(frame)
+        frame = reader.read_frame(0)
+    return frames
+
+
+def test_batch_with_a_reject_in_it():
+    _, reader = reader_with(b"FA014074000;?;MD02;")
+    assert read_all(reader) == ["FA014074000;", "?;", "MD02;"]
+
+
+def test_garbage_in_front_of_a_frame_is_skipped():
+    _, reader = reader_with(b"\x00\x13\xfe;\x00FA014074000;")
+    assert read_all(reader) == ["FA014074000;"]
+
+
+def test_partial_frame_waits_for_the_rest():
+    port, reader = reader_with(b"FA0140")
+    assert reader.read_frame(0) == ""
+    port._rx += b"74000;MD0"
+    assert reader.read_frame(0) == "FA014074000;"
+    assert reader.read_frame(0) == ""
+    port._rx += b"2;"
+    assert reader.read_frame(0) == "MD02;"
+
+
+def test_control_bytes_inside_a_frame_drop_it():
+    _, reader = reader_with(b"FA01\x004074000;MD02;")
+    assert read_all(reader) == ["MD02;"]
+
+
+def test_runaway_noise_is_dropped_and_the_reader_resyncs():
+    port, reader = reader_with(b"A" * (KAT.CatFrameReader.MAX_FRAME + 1))
+    assert reader.read_frame(0) == ""
+    port._rx += b"ID0570;"
+    assert reader.read_frame(0) == "ID0570;"
+
+
+def test_transact_reads_through_noise(monkeypatch):
+    monkeypatch.setattr(KAT.CatLink, "note", lambda self, text: None)
+    answers = {"FA": "~~FA014074000;", "MD0": "MD02;"}
+    link = make_link(lambda cmd: answers.get(cmd, "?;"))
+    assert link.transact(["FA;", "MT050;", "MD0;"]) == ["FA014074000;", "?;", "MD02;"]
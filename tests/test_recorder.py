@@ -0,0 +1,21 @@
+"""CatRecorder: a trace file that can't be written is reported, not printed."""
+import KAT
+
+
+def test_unwritable_path_sets_error(tmp_path):
+    blocker = tmp_path / "traces"
+    blocker.write_text("not a directory")
+    recorder = KAT.CatRecorder(blocker / "cat_trace.jsonl")
+    recorder.record(">", "test", b"FA;")
+    recorder.close()
+    assert recorder.error and "cat_trace.jsonl" in recorder.error
+    assert recorder.frames == 0
+
+
+def test_frames_are_written(tmp_path):
+    recorder = KAT.CatRecorder(tmp_path / "cat_trace.jsonl")
+    recorder.record(">", "test", b"FA;MD0;")
+    recorder.close()
+    assert recorder.error is None
+    assert recorder.frames == 2
+    assert len((tmp_path / "cat_trace.jsonl").read_text().splitlines()) == 3
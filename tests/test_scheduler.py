@@ -0,0 +1,81 @@
+"""CatScheduler: the token bucket, its debt cap, unmetered polls and stretching."""
+import types
+
+import pytest
+
+import KAT
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(KAT, "time", types.SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def live_polls(sched):
+    """The controller's polls: IF, meters and the unmetered health check."""
+    sched.add("rig_state", None, period=0.5, priority=3, cost=31)
+    sched.add("meters", None, period=0.4, priority=2, cost=22)
+    sched.add("health", None, period=0.5, priority=4, cost=10, metered=False)
+
+
+def test_debt_is_capped_at_one_burst(clock):
+    sched = KAT.CatScheduler(38400, 0.5)
+    live_polls(sched)
+    sched.account(1_000_000)             # a long job: far more than the bucket holds
+    assert sched._tokens == -sched._burst
+    # Paying back one burst plus the poll's cost is enough to poll again
+    clock.now += (sched._burst + 31) / sched._rate + 0.01
+    sched.account(1_000_000)
+    assert sched.take_due().name == "health"
+    assert sched.take_due().name == "rig_state"
+
+
+def test_unmetered_poll_runs_with_the_bucket_empty(clock):
+    sched = KAT.CatScheduler(38400, 0.5)
+    live_polls(sched)
+    sched.account(1_000_000)
+    assert sched.take_due().name == "health"
+    assert sched.take_due() is None      # the metered polls wait for tokens
+    clock.now += 0.5
+    sched.account(1_000_000)
+    assert sched.wait_time() == 0.0      # health is due again
+    assert sched.take_due().name == "health"
+
+
+def test_polls_stretch_lowest_priority_first_on_a_slow_link(clock):
+    sched = KAT.CatScheduler(4800, 0.25)     # 120 B/s for ~137 B/s of polls
+    live_polls(sched)
+    plan = {name: eff / req for name, req, eff in sched.plan()}
+    assert plan["meters"] > 1.0
+    assert plan["rig_state"] == plan["health"] == 1.0
+    demand = sum(cost / eff for (_, _, eff), cost in zip(sched.plan(), (10, 31, 22)))
+    assert demand == pytest.approx(sched._rate)
+
+
+def test_no_stretch_when_the_link_has_room(clock):
+    sched = KAT.CatScheduler(9600, 0.5)
+    live_polls(sched)
+    assert all(eff == req for _, req, eff in sched.plan())
+
+
+def test_stretch_is_capped(clock):
+    sched = KAT.CatScheduler(4800, 0.01)     # 4.8 B/s: nothing fits
+    live_polls(sched)
+    assert all(eff == pytest.approx(req * KAT.CatScheduler.MAX_STRETCH) for _, req, eff in sched.plan())
+
+
+def test_background_polls_never_stretch_the_others(clock):
+    sched = KAT.CatScheduler(9600, 0.5)
+    live_polls(sched)
+    sched.add("memory_index", None, period=0.05, priority=0, cost=8 * (6 + 41), background=True)
+    assert all(eff == req for _, req, eff in sched.plan())
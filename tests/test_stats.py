@@ -0,0 +1,16 @@
+"""CatStats.snapshot(): bus utilisation on a full-duplex line."""
+import KAT
+
+
+def test_utilisation_is_per_direction():
+    stats = KAT.CatStats(baud=9600)
+    stats.started -= 1.0            # one second of traffic
+    stats.sent("FA", 480)           # half of what 9600 8N1 carries in a second
+    stats.received("FA", 480)
+    snap = stats.snapshot()
+    assert 45 < snap["utilisation_out_pct"] <= 50
+    assert 45 < snap["utilisation_in_pct"] <= 50
+    # Both directions half busy is a half busy line, not a full one
+    assert snap["utilisation_pct"] == max(snap["utilisation_out_pct"], snap["utilisation_in_pct"])
+    assert snap["utilisation_recent_pct"] == max(snap["utilisation_recent_out_pct"],
+                                                 snap["utilisation_recent_in_pct"])
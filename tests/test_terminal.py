@@ -0,0 +1,40 @@
+"""CAT Terminal: every reply is shown, and none is left for the next query."""
+import pytest
+
+from cat_sim import FT991ASim
+from conftest import wait_for
+from test_transact import ScriptedPort
+
+
+@pytest.fixture
+def terminal(qapp, ctl):
+    sim = FT991ASim(menus={})
+    ctl._start_cat_worker(ScriptedPort(sim.handle))
+
+    def send(cmd):
+        before = ctl.cat_response_display.toPlainText().count(">>")
+        ctl.cat_input.setText(cmd)
+        ctl.send_cat_command()
+        assert wait_for(qapp, lambda: ctl.cat_response_display.toPlainText().count(">>") > before)
+        return ctl.cat_response_display.toPlainText().rsplit("<< ", 1)[1]
+
+    return sim, send
+
+
+def test_several_commands_show_every_reply(terminal):
+    sim, send = terminal
+    assert send("FA;MD0;") == f"FA{sim.fa:09d};MD02;"
+
+
+def test_unknown_opcode_is_read(terminal):
+    _, send = terminal
+    assert send("SM0;") == "?;"
+
+
+def test_rejected_set_is_shown_and_not_left_behind(qapp, ctl, terminal):
+    sim, send = terminal
+    assert send("MC050;") == "?;"           # a blank channel
+    reply = []
+    ctl._cat_submit(lambda link: link.query("FA;"), on_done=reply.append)
+    assert wait_for(qapp, lambda: reply)
+    assert reply == [f"FA{sim.fa:09d};"]
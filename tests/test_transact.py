@@ -0,0 +1,113 @@
+"""CatLink.transact()/run(): which command a '?;' in a pipelined batch belongs to."""
+import types
+
+import pytest
+
+import KAT
+
+
+class ScriptedPort:
+    """Serial stand-in: answers each command written with answer(cmd) at once."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.baudrate = 38400
+        self.timeout = None
+        self.is_open = True
+        self.sent = []
+        self._rx = bytearray()
+
+    @property
+    def in_waiting(self):
+        return len(self._rx)
+
+    def write(self, data):
+        for cmd in data.decode("ascii").split(";")[:-1]:
+            self.sent.append(cmd + ";")
+            reply = self.answer(cmd)
+            if reply:
+                self._rx += reply.encode("ascii")
+        return len(data)
+
+    def read(self, n=1):
+        chunk = bytes(self._rx[:n])
+        del self._rx[:n]
+        return chunk
+
+    def close(self):
+        self.is_open = False
+
+
+def rig(blank=(), current=4):
+    """Answers like an FT-991A whose memories in `blank` are empty."""
+    state = {"mc": current}
+
+    def answer(cmd):
+        if cmd == "MC":
+            return f"MC{state['mc']:03d};"
+        if cmd.startswith("MC"):
+            if int(cmd[2:]) in blank:
+                return "?;"
+            state["mc"] = int(cmd[2:])
+            return None
+        if cmd.startswith("MT") and len(cmd) == 5:
+            return "?;" if int(cmd[2:]) in blank else f"MT{cmd[2:]}145375000+000000E100000TAG         ;"
+        if cmd == "MD0":
+            return "MD04;"
+        if cmd in ("VM0", "VM1"):
+            return None
+        return "?;"
+
+    return answer
+
+
+def make_link(answer):
+    return KAT.CatLink(ScriptedPort(answer), types.SimpleNamespace(listen=False, log_line=None))
+
+
+@pytest.fixture(autouse=True)
+def quiet(monkeypatch):
+    monkeypatch.setattr(KAT.CatLink, "note", lambda self, text: None)
+
+
+def test_rejected_set_between_reads_is_its_own():
+    link = make_link(rig(blank={1}))
+    assert link.transact(["MC;", "MC001;", "MC;"]) == ["MC004;", "?;", "MC004;"]
+
+
+def test_two_sets_one_reject_is_unattributed():
+    link = make_link(rig(blank={1}))
+    replies = link.transact(["VM1;", "MC001;", "MC;"])
+    assert replies == [KAT.CAT_MAYBE_REJECTED, KAT.CAT_MAYBE_REJECTED, "MC004;"]
+
+
+def test_accepted_sets_report_none():
+    link = make_link(rig())
+    assert link.transact(["VM1;", "MC002;", "MC;"]) == [None, None, "MC002;"]
+
+
+def test_rejected_read_is_the_reads():
+    link = make_link(rig(blank={7}))
+    assert link.transact(["MT007;", "MD0;"]) == ["?;", "MD04;"]
+
+
+def test_trailing_rejected_read_after_sets():
+    link = make_link(rig(blank={7}))
+    assert link.transact(["VM1;", "MC002;", "MD0;", "MT007;"]) == [None, None, "MD04;", "?;"]
+
+
+def test_run_surfaces_set_rejection():
+    link = make_link(rig(blank={1}))
+    replies = link.run(["MC;", "MC001;", "MC;", "MT001;"])
+    assert replies[1] == "?;"
+    assert replies[3] == "?;"
+
+
+def test_vm0_write_not_trusted_until_a_reply_confirms():
+    link = make_link(rig())            # a rig that ignores VM0 and stays on memory 4
+    link._note_vfo(True)
+    link.write("VM0;")
+    assert not link.vfo_fresh()
+    link.query("MC;")
+    assert link.vfo_fresh(in_vfo=False)
+    assert not link.ensure_vfo(attempts=1, check_delay=0.02)
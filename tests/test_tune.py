@@ -0,0 +1,30 @@
+"""Wheel tuning across a disconnect: a dropped FA job must not wedge the wheel."""
+import threading
+
+from cat_sim import FT991ASim
+from conftest import wait_for
+from test_transact import ScriptedPort
+
+
+def test_disconnect_with_tune_queued_frees_the_wheel(qapp, ctl):
+    sim = FT991ASim(menus={})
+    fd = ctl.freq_display
+    ctl._start_cat_worker(ScriptedPort(sim.handle))
+    gate = threading.Event()
+    ctl._cat_submit(lambda link: gate.wait(0.5))     # keeps the FA job queued
+    ctl.rig_state.hz = sim.fa
+    fd._tune_target = 14_075_000
+    fd._send_tune()
+    assert fd._tune_busy
+
+    ctl._stop_cat_worker()
+    assert not fd._tune_busy and fd._tune_target is None and not fd._tune_timer.isActive()
+
+    # Reconnected, the next notch reaches the rig and the display follows it
+    ctl._start_cat_worker(ScriptedPort(sim.handle))
+    sim.fa = 7_100_000
+    assert wait_for(qapp, lambda: ctl.rig_state.hz == 7_100_000)
+    fd._tune_target = 7_101_000
+    fd._send_tune()
+    assert wait_for(qapp, lambda: not fd._tune_busy)
+    assert sim.fa == 7_101_000 and fd._tune_target is None
@@ -0,0 +1,62 @@
+"""Stopping the CatWorker never blocks the GUI thread."""
+import threading
+import time
+
+import KAT
+from cat_sim import FT991ASim
+from conftest import wait_for
+from test_transact import ScriptedPort
+
+
+def start(ctl):
+    port = ScriptedPort(FT991ASim(menus={}).handle)
+    ctl._start_cat_worker(port)
+    return port
+
+
+def test_stop_returns_while_a_job_is_running(qapp, ctl):
+    port = start(ctl)
+    running = threading.Event()
+    ctl._cat_submit(lambda link: (running.set(), time.sleep(0.5)))
+    assert running.wait(1.0)
+
+    t0 = time.monotonic()
+    ctl._stop_cat_worker()
+    assert time.monotonic() - t0 < 0.1
+    assert port.is_open and not ctl._connected()
+
+    closed = []
+    ctl._when_port_closed(lambda: closed.append(port.is_open))
+    assert wait_for(qapp, lambda: closed)
+    assert closed == [False] and ctl._closing_workers == []
+
+
+def test_stuck_job_gets_its_port_closed(qapp, ctl, monkeypatch):
+    monkeypatch.setattr(KAT.CatWorker, "STOP_GRACE_MS", 50)
+    port = start(ctl)
+    running = threading.Event()
+
+    def stuck(link):
+        running.set()
+        while link.is_open:      # like a read that only a closed port ends
+            time.sleep(0.01)
+
+    ctl._cat_submit(stuck)
+    assert running.wait(1.0)
+    ctl._stop_cat_worker()
+    assert wait_for(qapp, lambda: not ctl._closing_workers)
+    assert not port.is_open
+
+
+def test_connect_waits_for_the_old_port(qapp, ctl):
+    start(ctl)
+    ctl._cat_submit(lambda link: time.sleep(0.2))
+    ctl._stop_cat_worker()
+    calls = []
+    ctl._open_radio = lambda port, baud, warm=False: calls.append(port)
+    ctl.settings_autodetect_check.setChecked(False)
+    ctl.settings_cat_combo.setCurrentText("sim")
+    ctl.connect_to_radio()
+    assert calls == []
+    assert wait_for(qapp, lambda: calls)
+    assert calls == ["sim"]